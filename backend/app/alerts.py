@@ -0,0 +1,57 @@
+"""Alert engine — threshold evaluation for changed bins and archival of old alerts.
+
+A bin gets an alert when its fill reaches ``ALERT_THRESHOLD`` and it has
+none active (``BinState.alerted`` mirrors the active-alert-by-bin index).
+The alert clears by itself once a reading falls below
+``ALERT_CLEAR_THRESHOLD``; between the two thresholds nothing changes, so
+noisy readings around 80% do not raise and resolve alerts in a loop.
+Evaluation looks only at the rows a tick or ingest batch changed, plus
+bins whose alert was resolved since (``BinState.recheck``): one resolved
+without a collection stays full, and its fill may never change again.
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from .bin_state import ALERT_CLEAR_THRESHOLD, ALERT_THRESHOLD, OVERFLOW_THRESHOLD
+from .config import ALERT_ARCHIVE_AFTER_HOURS
+from .data_store import store
+
+
+def evaluate_alerts(rows: np.ndarray) -> dict:
+    """Raise and clear alerts for the given ``store.bins`` rows after a fill change.
+
+    Caller must hold ``store.write("bins")``. Returns the raised and cleared
+    row indices; bins another worker alerted first are not counted as raised.
+    """
+    state = store.bin_state
+    if state.recheck:
+        rows = np.union1d(rows, np.fromiter(state.recheck, dtype=np.int64, count=len(state.recheck)))
+        state.recheck.clear()
+    fill, alerted = state.fill[rows], state.alerted[rows]
+    raised = rows[(fill >= ALERT_THRESHOLD) & ~alerted]
+    cleared = rows[(fill < ALERT_CLEAR_THRESHOLD) & alerted]
+    now = datetime.now().isoformat()
+    added = np.zeros(len(raised), dtype=bool)
+    for n, i in enumerate(raised.tolist()):
+        b = store.bins[i]
+        added[n] = store.add_alert({
+            "binId": b["id"],
+            "location": b["location"],
+            "area": b["area"],
+            "fillLevel": b["fillLevel"],
+            "type": "overflow" if b["fillLevel"] >= OVERFLOW_THRESHOLD else "high_fill",
+            "status": "active",
+            "createdAt": now,
+        }) is not None
+    for bin_id in state.ids[cleared].tolist():
+        store.resolve_alert(store.active_alert_for_bin(bin_id))
+    return {"raised": raised[added], "cleared": cleared}
+
+
+def archive_resolved_alerts() -> int:
+    """Move alerts resolved more than ``ALERT_ARCHIVE_AFTER_HOURS`` ago to cold storage."""
+    before = (datetime.now() - timedelta(hours=ALERT_ARCHIVE_AFTER_HOURS)).isoformat()
+    with store.write("bins"):
+        return store.archive_alerts(before)
@@ -0,0 +1,144 @@
+"""Collection analytics — per-day aggregates over the append-only collection log.
+
+The log records two kinds of entries (plain dicts, as journaled):
+
+* ``collection`` — a bin emptied (``binId``, ``area``, and ``alertId`` /
+  ``responseSeconds`` when an alert was open) or a task completed
+  (``taskId``, ``complaintId``); both with ``workerId`` / ``workerName``
+  when a worker did it.
+* ``complaint_resolved`` — ``complaintId`` and ``resolutionSeconds`` since
+  the complaint was filed.
+
+Entries are folded into the bucket of the day they happened as they are
+appended, so a query only merges the day buckets in its range and past
+days are never recomputed. ``state()`` is a JSON image of the buckets:
+the store folds archived entries into one, so their totals outlive the
+raw entries (app/retention.py).
+"""
+
+import threading
+from collections import Counter
+from datetime import date, timedelta
+
+
+class _Day:
+    """Totals for one calendar day."""
+
+    def __init__(self):
+        self.collections = 0
+        self.by_area = Counter()
+        self.by_worker = Counter()
+        self.response_s = 0.0
+        self.responses = 0
+        self.resolution_s = 0.0
+        self.resolutions = 0
+
+
+def _mean(total: float, n: int, unit_s: int):
+    return round(total / n / unit_s, 1) if n else None
+
+
+class CollectionLog:
+    """Day buckets of the collection log; safe to append from any lock group."""
+
+    def __init__(self, entries=(), state: dict | None = None):
+        self._days = {}
+        self._worker_names = {}
+        self.size = 0  # entries folded in
+        self._lock = threading.Lock()
+        if state:
+            self._restore(state)
+        for entry in entries:
+            self.add(entry)
+
+    def state(self) -> dict:
+        """The folded totals as JSON; ``CollectionLog(state=...)`` restores them."""
+        with self._lock:
+            return {
+                "size": self.size,
+                "days": {key: [d.collections, dict(d.by_area), list(d.by_worker.items()),
+                               d.response_s, d.responses, d.resolution_s, d.resolutions]
+                         for key, d in self._days.items()},
+                "workerNames": list(self._worker_names.items()),
+            }
+
+    def _restore(self, state: dict):
+        self.size = state["size"]
+        for key, (collections, by_area, by_worker, response_s, responses, resolution_s, resolutions) \
+                in state["days"].items():
+            d = self._days[key] = _Day()
+            d.collections, d.response_s, d.responses = collections, response_s, responses
+            d.resolution_s, d.resolutions = resolution_s, resolutions
+            d.by_area.update(by_area)
+            d.by_worker.update(dict(by_worker))
+        self._worker_names.update(dict(state["workerNames"]))
+
+    def add(self, entry: dict):
+        with self._lock:
+            self.size += 1
+            day = self._days.get(entry["at"][:10])
+            if day is None:
+                day = self._days[entry["at"][:10]] = _Day()
+            if entry["type"] == "collection":
+                day.collections += 1
+                if entry.get("area"):
+                    day.by_area[entry["area"]] += 1
+                if entry.get("workerId") is not None:
+                    day.by_worker[entry["workerId"]] += 1
+                    self._worker_names[entry["workerId"]] = entry.get("workerName")
+                if entry.get("responseSeconds") is not None:
+                    day.response_s += entry["responseSeconds"]
+                    day.responses += 1
+            elif entry["type"] == "complaint_resolved":
+                day.resolution_s += entry["resolutionSeconds"]
+                day.resolutions += 1
+
+    def summary(self, start: date, end: date) -> dict:
+        """Per-day series and range totals for ``start``..``end`` inclusive."""
+        days = []
+        by_area, by_worker = Counter(), Counter()
+        response_s = resolution_s = 0.0
+        responses = resolutions = collections = 0
+        empty = _Day()
+        with self._lock:
+            current = start
+            while current <= end:
+                key = current.isoformat()
+                d = self._days.get(key, empty)
+                days.append({
+                    "date": key,
+                    "day": current.strftime("%a"),
+                    "collections": d.collections,
+                    "avgResponseMinutes": _mean(d.response_s, d.responses, 60),
+                    "avgResolutionHours": _mean(d.resolution_s, d.resolutions, 3600),
+                })
+                collections += d.collections
+                by_area.update(d.by_area)
+                by_worker.update(d.by_worker)
+                response_s += d.response_s
+                responses += d.responses
+                resolution_s += d.resolution_s
+                resolutions += d.resolutions
+                current += timedelta(days=1)
+            names = dict(self._worker_names)
+        return {
+            "from": start.isoformat(),
+            "to": end.isoformat(),
+            "collections": collections,
+            "days": days,
+            "byArea": dict(by_area.most_common()),
+            "byWorker": [{"workerId": w, "workerName": names.get(w), "collections": n}
+                         for w, n in by_worker.most_common()],
+            "responseTime": {"alerts": responses, "avgMinutes": _mean(response_s, responses, 60)},
+            "resolutionTime": {"complaints": resolutions, "avgHours": _mean(resolution_s, resolutions, 3600)},
+        }
+
+    def daily_counts(self, end: date, days: int = 7) -> list:
+        """``[{"day": "Mon", "collections": n}, ...]`` for the ``days`` days up to ``end``."""
+        with self._lock:
+            out = []
+            for k in range(days - 1, -1, -1):
+                d = end - timedelta(days=k)
+                bucket = self._days.get(d.isoformat())
+                out.append({"day": d.strftime("%a"), "collections": bucket.collections if bucket else 0})
+            return out
@@ -0,0 +1,116 @@
+"""Cold storage — records moved out of the hot store into gzip segments.
+
+Records are appended as JSON lines to ``<kind>-<YYYY-MM>.jsonl.gz`` under
+``ARCHIVE_DIR``, by the month of their key field (e.g. an alert's
+``createdAt``). Each append adds one gzip member — concatenated members
+read back as a single stream — so a segment is never rewritten. Reads only
+open the months that overlap the requested range, and the decoded, sorted
+records of the last few months read are cached until their file grows.
+"""
+
+import gzip
+import json
+import os
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+
+from .config import ARCHIVE_DIR
+
+CACHED_MONTHS = 4
+_MAX_ID = float("inf")
+
+
+class Archive:
+    """Append-only, month-partitioned record segments on disk."""
+
+    def __init__(self, root: str = ARCHIVE_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+        # (kind, month, key_field) -> (file size, keys, records), ascending
+        self._cache = OrderedDict()
+
+    def _path(self, kind: str, month: str) -> str:
+        return os.path.join(self.root, f"{kind}-{month}.jsonl.gz")
+
+    def append(self, kind: str, records: list, key_field: str):
+        """Durably add ``records``; returns once they are fsynced."""
+        by_month = {}
+        for r in records:
+            by_month.setdefault(r[key_field][:7], []).append(r)
+        with self._lock:
+            os.makedirs(self.root, exist_ok=True)
+            for month, rows in by_month.items():
+                data = "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in rows)
+                with open(self._path(kind, month), "ab") as f:
+                    f.write(gzip.compress(data.encode(), compresslevel=6))
+                    f.flush()
+                    os.fsync(f.fileno())
+
+    def months(self, kind: str) -> list:
+        prefix, suffix = f"{kind}-", ".jsonl.gz"
+        try:
+            names = os.listdir(self.root)
+        except FileNotFoundError:
+            return []
+        return sorted(n[len(prefix):-len(suffix)] for n in names if n.startswith(prefix) and n.endswith(suffix))
+
+    def read_month(self, kind: str, month: str, key_field: str) -> tuple:
+        """``(keys, records)`` of one segment in ascending ``(key_field, id)`` order."""
+        path = self._path(kind, month)
+        # Under the lock so a reader never sees a half-written member
+        with self._lock:
+            size = os.path.getsize(path)
+            cached = self._cache.get((kind, month, key_field))
+            if cached and cached[0] == size:
+                self._cache.move_to_end((kind, month, key_field))
+                return cached[1:]
+            with gzip.open(path, "rt") as f:
+                records = [json.loads(line) for line in f]
+            records.sort(key=lambda r: (r[key_field], r["id"]))
+            keys = [(r[key_field], r["id"]) for r in records]
+            self._cache[(kind, month, key_field)] = (size, keys, records)
+            if len(self._cache) > CACHED_MONTHS:
+                self._cache.popitem(last=False)
+            return keys, records
+
+    def index(self, kind: str, key_field: str) -> "ArchiveIndex":
+        return ArchiveIndex(self, kind, key_field)
+
+
+class ArchiveIndex:
+    """Read-only view of one archived kind with the ``SortedIndex.scan`` interface."""
+
+    def __init__(self, archive: Archive, kind: str, key_field: str):
+        self.archive = archive
+        self.kind = kind
+        self.key_field = key_field
+
+    def key_of(self, record: dict) -> tuple:
+        return (record[self.key_field], record["id"])
+
+    def scan(self, after: tuple | None = None, lo=None, hi=None, descending: bool = True):
+        months = self.archive.months(self.kind)
+        if lo is not None:
+            months = [m for m in months if m >= lo[:7]]
+        if hi is not None:
+            months = [m for m in months if m <= hi[:7]]
+        if after is not None:
+            # Months wholly before the cursor were already paged through
+            months = [m for m in months if (m <= after[0][:7] if descending else m >= after[0][:7])]
+        if descending:
+            months.reverse()
+        for month in months:
+            keys, records = self.archive.read_month(self.kind, month, self.key_field)
+            start = bisect_left(keys, (lo,)) if lo is not None else 0
+            stop = bisect_right(keys, (hi, _MAX_ID)) if hi is not None else len(keys)
+            if descending:
+                if after is not None:
+                    stop = min(stop, bisect_left(keys, after))
+                rows = range(stop - 1, start - 1, -1)
+            else:
+                if after is not None:
+                    start = max(start, bisect_right(keys, after))
+                rows = range(start, stop)
+            for i in rows:
+                yield keys[i], records[i]
@@ -1,15 +1,70 @@
 """Authentication utilities — JWT token creation & validation."""
 
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from jose import jwt, JWTError
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from .config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from .config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, TOKEN_CACHE_SIZE
 from .data_store import store
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
+class TokenCache:
+    """Bounded LRU of verified tokens -> user id, honouring each token's ``exp``."""
+
+    def __init__(self, maxsize: int = TOKEN_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # token -> (user_id, exp)
+        self._by_user = {}  # user_id -> set of cached tokens
+        self._lock = threading.Lock()
+
+    def get(self, token: str):
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                self._drop(token)
+                return None
+            self._entries.move_to_end(token)
+            return entry[0]
+
+    def put(self, token: str, user_id: int, exp: float):
+        with self._lock:
+            if token in self._entries:
+                self._drop(token)
+            self._entries[token] = (user_id, exp)
+            self._by_user.setdefault(user_id, set()).add(token)
+            while len(self._entries) > self.maxsize:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: int):
+        """Forget every cached token of a user (e.g. after deletion)."""
+        with self._lock:
+            for token in list(self._by_user.get(user_id, ())):
+                self._drop(token)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def _drop(self, token: str):
+        user_id, _ = self._entries.pop(token)
+        tokens = self._by_user.get(user_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._by_user[user_id]
+
+
+token_cache = TokenCache()
+
+
 def verify_password(plain: str, stored: str) -> bool:
     """Compare plain-text password with stored value (demo only)."""
     return plain == stored
@@ -23,11 +78,24 @@ def create_access_token(data: dict) -> str:
 
 
 def get_current_user(token: str = Depends(oauth2_scheme)):
+    return user_from_token(token)
+
+
+def user_from_token(token: str) -> dict:
+    """Resolve a bearer token to its user, or raise 401."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Invalid authentication credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    user_id = token_cache.get(token)
+    if user_id is not None:
+        with store.read("users"):
+            user = store.get_user(user_id)
+        if user is None:
+            raise credentials_exception
+        return user
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
@@ -36,8 +104,10 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
     except JWTError:
         raise credentials_exception
 
-    with store.lock:
-        user = next((u for u in store.users if u["email"] == email), None)
+    with store.read("users"):
+        user = store.get_user_by_email(email)
     if user is None:
         raise credentials_exception
+    if "exp" in payload:
+        token_cache.put(token, user["id"], float(payload["exp"]))
     return user
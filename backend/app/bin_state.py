@@ -0,0 +1,55 @@
+"""Array-backed bin sensor state — NumPy columns aligned with ``store.bins``."""
+
+from bisect import bisect_right
+
+import numpy as np
+
+# Status labels indexed by status code, and the fill level at which each
+# label after the first starts (empty < 40 <= half < 75 <= full < 90 <= overflow).
+STATUS_NAMES = ("empty", "half", "full", "overflow")
+STATUS_THRESHOLDS = np.array([40, 75, 90], dtype=np.int16)
+_THRESHOLDS = tuple(STATUS_THRESHOLDS.tolist())
+FULL_CODE = STATUS_NAMES.index("full")
+
+ALERT_THRESHOLD = 80
+# An active alert clears on its own once a reading drops below this; the gap
+# to ALERT_THRESHOLD keeps a bin hovering near 80% from flapping
+ALERT_CLEAR_THRESHOLD = 60
+OVERFLOW_THRESHOLD = 90
+
+
+def bin_status(fill: int) -> str:
+    """Derive a single bin's status label from its fill level."""
+    return STATUS_NAMES[bisect_right(_THRESHOLDS, fill)]
+
+
+def status_codes(fill: np.ndarray) -> np.ndarray:
+    """Vectorized status derivation — one code per fill level."""
+    return np.searchsorted(STATUS_THRESHOLDS, fill, side="right").astype(np.uint8)
+
+
+class BinState:
+    """Fill level, battery, status code, alert flag and reading time per bin.
+
+    Row ``i`` describes ``store.bins[i]``; the bin dicts stay the wire format
+    and are written back by ``DataStore`` whenever a row changes.
+    """
+
+    def __init__(self, bins: list):
+        self.ids = np.array([b["id"] for b in bins], dtype=np.int64)
+        self.fill = np.array([b["fillLevel"] for b in bins], dtype=np.int16)
+        self.battery = np.array([b["sensorBattery"] for b in bins], dtype=np.int16)
+        self.status = status_codes(self.fill)
+        self.alerted = np.zeros(len(bins), dtype=bool)
+        # Coordinates are static; NaN for a bin without them
+        self.lat = np.array([b.get("latitude") for b in bins], dtype=float)
+        self.lng = np.array([b.get("longitude") for b in bins], dtype=float)
+        # Epoch seconds of the newest sensor reading applied to each bin
+        self.last_reading = np.full(len(bins), -np.inf)
+        # Rows whose alert was resolved since the last evaluation; a bin
+        # left full must be alerted again even if its fill never changes
+        self.recheck = set()
+        self.index = {bin_id: i for i, bin_id in enumerate(self.ids.tolist())}
+
+    def __len__(self) -> int:
+        return len(self.ids)
@@ -0,0 +1,101 @@
+"""Change feed — bounded, sequence-numbered log of DataStore mutations.
+
+Mutators publish small delta events; live-update subscribers (the SSE
+endpoint) read everything after the last sequence number they saw.
+"""
+
+import asyncio
+import threading
+from collections import deque
+from itertools import islice
+
+FEED_SIZE = 4096
+
+
+class ChangeFeed:
+    """Thread-safe ring buffer of change events with async wake-ups."""
+
+    def __init__(self, size: int = FEED_SIZE):
+        self._events = deque(maxlen=size)
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._waiters = set()
+        self._listeners = []
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    def publish(self, type_: str, data, roles: tuple = (), user_id: int | None = None,
+                origin: str | None = None):
+        """Append an event visible to ``roles`` and to the user ``user_id``.
+
+        Events with no roles and no user are internal (e.g. user records for
+        the journal) and never reach live-update clients. ``origin`` names
+        the worker an event was replicated from (app/cluster.py); it is None
+        for changes made by this process.
+        """
+        with self._lock:
+            self._seq += 1
+            event = {
+                "seq": self._seq,
+                "type": type_,
+                "data": data,
+                "roles": roles,
+                "userId": user_id,
+                "origin": origin,
+            }
+            self._events.append(event)
+            # Listeners run under the feed lock so they see events in seq order
+            for listener in self._listeners:
+                listener(event)
+            waiters = list(self._waiters)
+        for loop, event in waiters:
+            loop.call_soon_threadsafe(event.set)
+
+    def add_listener(self, listener):
+        """Call ``listener(event)`` synchronously for every published event."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def reset(self, seq: int):
+        """Continue numbering after ``seq`` (used after journal recovery)."""
+        with self._lock:
+            self._events.clear()
+            self._seq = seq
+
+    def since(self, seq: int):
+        """Return ``(events, complete)`` for every event after ``seq``.
+
+        ``complete`` is False when older events were already evicted from the
+        ring, in which case the subscriber must resync from the REST API.
+        """
+        with self._lock:
+            if not self._events or seq >= self._seq:
+                return [], True
+            complete = seq >= self._events[0]["seq"] - 1
+            # Sequence numbers are contiguous, so the newest k events are the tail
+            k = min(self._seq - seq, len(self._events))
+            events = list(islice(reversed(self._events), k))
+        events.reverse()
+        return events, complete
+
+    def subscribe(self) -> tuple:
+        """Register the running event loop for wake-ups; pass the result to ``unsubscribe``."""
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._lock:
+            self._waiters.add(waiter)
+        return waiter
+
+    def unsubscribe(self, waiter: tuple):
+        with self._lock:
+            self._waiters.discard(waiter)
+
+
+def visible_to(event: dict, user: dict) -> bool:
+    return user["role"] in event["roles"] or event["userId"] == user["id"]
@@ -0,0 +1,214 @@
+"""Multi-worker mode — several API processes sharing one SQLite database.
+
+Enabled with ``CLEANIFY_CLUSTER=1`` and ``CLEANIFY_STORAGE=sqlite``, e.g.
+``uvicorn app.main:app --workers 4``. Records are already shared through
+the database, and ids come from its ``id_counters`` table. What each worker
+keeps in memory (bin columns, counters, active alerts, spatial indexes, the
+linked-task and token caches) is kept in step by a shared change log:
+
+* every event a worker publishes on its change feed is appended to the
+  ``cluster_changes`` table, tagged with the worker's id;
+* a follower thread reads the other workers' events every
+  ``CLUSTER_POLL_MS``, applies them with ``SQLiteDataStore.apply_remote``
+  and republishes them on the local feed, so SSE clients of any worker see
+  every change;
+* the worker holding the ``scheduler`` lease runs the singleton jobs
+  (simulator, alert archival) wrapped with ``leader_only``. A leader that
+  stops renewing loses the lease after ``CLUSTER_LEASE_SECONDS`` and
+  another worker takes over.
+
+The leader prunes log rows older than ``CLUSTER_LOG_RETENTION_SECONDS``; a
+worker that falls further behind reloads its state from the database.
+Counters are recounted every ``CLUSTER_RECOUNT_SECONDS``, which also
+absorbs changes that raced a reload. Change-feed sequence numbers stay per
+worker: SSE clients should reconnect to the same worker (sticky sessions)
+or refetch after reconnecting elsewhere.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from functools import wraps
+
+from .auth import token_cache
+from .config import CLUSTER_LEASE_SECONDS, CLUSTER_LOG_RETENTION_SECONDS, CLUSTER_POLL_MS, CLUSTER_RECOUNT_SECONDS
+from .data_store import LOCK_ORDER
+from .sqlite_store import ConnectionPool
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cluster_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    origin TEXT NOT NULL,
+    type TEXT NOT NULL,
+    data TEXT NOT NULL,
+    roles TEXT NOT NULL,
+    userId INTEGER,
+    at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cluster_changes_at ON cluster_changes (at);
+
+CREATE TABLE IF NOT EXISTS cluster_leases (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires REAL NOT NULL
+);
+"""
+
+SCHEDULER_LEASE = "scheduler"
+
+# Lock group whose in-memory state each kind of event changes
+_EVENT_GROUPS = {
+    "user": "users",
+    "assignments": "users",
+    "bins": "bins",
+    "alert": "bins",
+    "alerts": "bins",
+    "complaint": "complaints",
+    "complaints": "complaints",
+    "task": "tasks",
+    "tasks": "tasks",
+}
+
+
+class Cluster:
+    """This worker's side of the change log and the scheduler lease."""
+
+    def __init__(self, store, poll_ms: int = CLUSTER_POLL_MS, lease_seconds: float = CLUSTER_LEASE_SECONDS):
+        self.store = store
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.poll_interval = poll_ms / 1000
+        self.lease_seconds = lease_seconds
+        self._pool = ConnectionPool(store.path, size=2)
+        self._last_seq = 0
+        self._leader_until = 0.0
+        self._stopped = threading.Event()
+        self._follower = None
+
+    # ── Lifecycle ──
+
+    def start(self):
+        """Catch up with the database, then log local changes and follow remote ones."""
+        with self._pool.connection() as conn:
+            conn.executescript(SCHEMA)
+        with self.store.write(*LOCK_ORDER):
+            self._resync()
+            # Under the locks, so no local change slips in unlogged
+            self.store.changes.add_listener(self._append)
+        self._renew_lease()
+        self._follower = threading.Thread(target=self._follow, name="cluster-follower", daemon=True)
+        self._follower.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._follower:
+            self._follower.join()
+        self.store.changes.remove_listener(self._append)
+        if self.is_leader:
+            # Hand over now rather than when the lease expires
+            with self._pool.connection() as conn:
+                conn.execute("DELETE FROM cluster_leases WHERE name = ? AND owner = ?",
+                             (SCHEDULER_LEASE, self.worker_id))
+            self._leader_until = 0.0
+        self._pool.close()
+
+    # ── Scheduler lease ──
+
+    @property
+    def is_leader(self) -> bool:
+        return time.time() < self._leader_until
+
+    def leader_only(self, job):
+        """Wrap a scheduled job so that only the lease holder runs it."""
+        @wraps(job)
+        def run(*args, **kwargs):
+            if self.is_leader:
+                return job(*args, **kwargs)
+        return run
+
+    def _renew_lease(self):
+        now = time.time()
+        with self._pool.connection() as conn:
+            conn.execute(
+                "INSERT INTO cluster_leases VALUES (?, ?, ?) ON CONFLICT (name) DO UPDATE"
+                " SET owner = excluded.owner, expires = excluded.expires"
+                " WHERE owner = excluded.owner OR expires < ?",
+                (SCHEDULER_LEASE, self.worker_id, now + self.lease_seconds, now))
+            owner, = conn.execute("SELECT owner FROM cluster_leases WHERE name = ?", (SCHEDULER_LEASE,)).fetchone()
+        # Step down a third of a lease early, so two leaders never overlap
+        # even if renewal stalls
+        self._leader_until = now + self.lease_seconds * 2 / 3 if owner == self.worker_id else 0.0
+
+    # ── Change log ──
+
+    def _append(self, event: dict):
+        # Called by ChangeFeed.publish under the feed lock, in seq order
+        if event["origin"] is not None:
+            return
+        with self._pool.connection() as conn:
+            conn.execute(
+                "INSERT INTO cluster_changes (origin, type, data, roles, userId, at) VALUES (?, ?, ?, ?, ?, ?)",
+                (self.worker_id, event["type"], json.dumps(event["data"], separators=(",", ":")),
+                 json.dumps(list(event["roles"])), event["userId"], time.time()))
+
+    def _resync(self):
+        """Reload this worker's state from the database; requires all write locks."""
+        with self._pool.connection() as conn:
+            self._last_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM cluster_changes").fetchone()[0]
+        self.store.reload()
+
+    def poll(self) -> int:
+        """Apply the other workers' changes logged since the last poll; returns how many."""
+        with self._pool.connection() as conn:
+            rows = conn.execute(
+                # This worker's own payloads are not read back
+                "SELECT seq, origin, type, CASE WHEN origin = ? THEN NULL ELSE data END, roles, userId"
+                " FROM cluster_changes WHERE seq > ? ORDER BY seq",
+                (self.worker_id, self._last_seq)).fetchall()
+        if not rows:
+            return 0
+        if rows[0][0] != self._last_seq + 1:
+            # The rows in between were pruned before this worker read them
+            with self.store.write(*LOCK_ORDER):
+                self._resync()
+            return 0
+        events = [
+            {"type": type_, "data": json.loads(data), "roles": tuple(json.loads(roles)), "userId": user_id,
+             "origin": origin}
+            for _, origin, type_, data, roles, user_id in rows if origin != self.worker_id
+        ]
+        self._last_seq = rows[-1][0]
+        groups = {_EVENT_GROUPS[e["type"].partition(".")[0]] for e in events
+                  if e["type"].partition(".")[0] in _EVENT_GROUPS}
+        with self.store.write(*groups):
+            self.store.apply_remote(events)
+            for e in events:
+                self.store.changes.publish(e["type"], e["data"], e["roles"], e["userId"], origin=e["origin"])
+        for e in events:
+            if e["type"] == "user.removed":
+                token_cache.invalidate_user(e["data"]["id"])
+        return len(events)
+
+    def _follow(self):
+        next_renewal = time.monotonic()
+        next_recount = next_renewal + CLUSTER_RECOUNT_SECONDS
+        while not self._stopped.wait(self.poll_interval):
+            try:
+                now = time.monotonic()
+                if now >= next_renewal:
+                    self._renew_lease()
+                    if self.is_leader:
+                        with self._pool.connection() as conn:
+                            conn.execute("DELETE FROM cluster_changes WHERE at < ?",
+                                         (time.time() - CLUSTER_LOG_RETENTION_SECONDS,))
+                    next_renewal = now + self.lease_seconds / 3
+                self.poll()
+                if now >= next_recount:
+                    with self.store.write(*LOCK_ORDER):
+                        self.store.recount()
+                    next_recount = now + CLUSTER_RECOUNT_SECONDS
+            except sqlite3.Error as e:
+                # e.g. the database stayed locked past busy_timeout; retry next round
+                print(f"Cluster follower {self.worker_id}: {e}")
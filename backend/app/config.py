@@ -1,5 +1,74 @@
+import os
+
 # ── JWT Configuration ──
 SECRET_KEY = "cleanify-smart-waste-mgmt-2026-secret"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 1440  # 24 hours
+TOKEN_CACHE_SIZE = 10000  # verified tokens kept in the auth LRU
+RESPONSE_CACHE_MAX_BYTES = 64 * 1024 * 1024  # serialized GET responses kept (app/response_cache.py)
+RESPONSE_COMPRESS_MIN_BYTES = 1024  # JSON bodies at least this large are gzip/brotli compressed
 APP_VERSION = "1.0.1"
+
+# ── Persistence ──
+# Set CLEANIFY_DATA_DIR to journal every change and recover on restart;
+# unset keeps the original in-memory demo store.
+DATA_DIR = os.environ.get("CLEANIFY_DATA_DIR")
+WAL_FSYNC_INTERVAL_MS = 20  # group-commit window for journal fsyncs
+SNAPSHOT_INTERVAL_SECONDS = 300
+# Cold storage for archived records (app/archive.py)
+ARCHIVE_DIR = os.environ.get("CLEANIFY_ARCHIVE_DIR") or os.path.join(
+    DATA_DIR or os.path.dirname(os.path.abspath(__file__)), "archive")
+
+# ── Storage engine ──
+# "memory" (default) keeps every collection in process; "sqlite" stores
+# users, alerts, complaints, tasks and rewards in SQLITE_PATH (WAL mode).
+STORAGE_BACKEND = os.environ.get("CLEANIFY_STORAGE", "memory")
+SQLITE_PATH = os.environ.get("CLEANIFY_SQLITE_PATH", "cleanify.db")
+SQLITE_POOL_SIZE = 8  # idle connections kept for reuse
+
+# ── Multi-worker mode ──
+# CLEANIFY_CLUSTER=1 lets several API processes (uvicorn --workers N) share
+# one SQLite database; see app/cluster.py. Requires CLEANIFY_STORAGE=sqlite.
+CLUSTER = os.environ.get("CLEANIFY_CLUSTER") == "1"
+CLUSTER_POLL_MS = 100  # how often a worker applies the other workers' changes
+CLUSTER_LEASE_SECONDS = 10  # the scheduler leader must renew within this long
+CLUSTER_LOG_RETENTION_SECONDS = 300  # a worker further behind reloads from the database
+CLUSTER_RECOUNT_SECONDS = 60  # counters are reconciled with the database this often
+
+# ── Uploads ──
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024  # photos and short videos
+UPLOAD_CHUNK_BYTES = 1024 * 1024  # read/hash/write granularity
+MEDIA_CACHE_SIZE = 4096  # uploaded files whose stat/ETag is kept in memory
+
+# ── Route optimizer ──
+DEPOT_LOCATION = (18.1513, 74.5771)  # where routes start and end unless a worker's start is given
+ROUTE_CAPACITY = 60.0  # full bins' worth of waste one vehicle carries per round
+ROUTE_TIME_BUDGET_MS = 2000  # improvement time per plan, default and upper bound
+
+# ── Forecasting ──
+# A reading's weight in the smoothed fill level / fill rate halves over this long
+FORECAST_LEVEL_HALF_LIFE_HOURS = 1.0
+FORECAST_RATE_HALF_LIFE_HOURS = 4.0
+
+# ── Fill history ──
+# Retention per resolution; memory per bin-day is listed in app/history.py
+HISTORY_RAW_READINGS = 64  # newest readings kept as-is per bin
+HISTORY_MINUTE_RETENTION_HOURS = 24
+HISTORY_HOUR_RETENTION_DAYS = 30
+HISTORY_DAY_RETENTION_DAYS = 365
+
+# ── Alerts ──
+ALERT_ARCHIVE_AFTER_HOURS = 24  # resolved alerts move to the archive after this long
+ALERT_ARCHIVE_INTERVAL_MINUTES = 10
+
+# ── Retention ──
+# Closed complaints (resolved, every linked task closed) and tasks (completed
+# and approved) move to the archive this long after closing, and collection-log
+# entries this long after they were logged; see app/retention.py
+RECORD_ARCHIVE_AFTER_DAYS = 90
+REWARD_HISTORY_LIMIT = 100  # newest reward entries kept per citizen; older ones are archived
+RETENTION_INTERVAL_MINUTES = 60
+
+# ── Thumbnails ──
+THUMBNAIL_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))  # image-resize processes
+THUMBNAIL_QUEUE_SIZE = 256  # uploads waiting for variants before new ones are dropped
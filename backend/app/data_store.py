@@ -1,16 +1,137 @@
 """In-memory data store — singleton pattern with thread-safe access."""
 
 import threading
+import time
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime
 
+import numpy as np
+
+from .analytics import CollectionLog
+from .archive import Archive
+from .change_feed import ChangeFeed
+from .forecast import FillForecaster
+from .history import FillHistory
+from .config import SQLITE_PATH, STORAGE_BACKEND
+from .paging import SortedIndex
+from .spatial import SpatialIndex
+from .bin_state import BinState, FULL_CODE, STATUS_NAMES, bin_status, status_codes
+
+# Collection lock groups, in the order they must be acquired.
+#   users      — users list + id/email indexes
+#   tasks      — tasks list + id/complaint/worker indexes
+#   complaints — complaints list + rewards (their histories are newest-first deques)
+#   bins       — bins + alerts (the simulator writes both together)
+# A thread holding several groups must take them in this order; the
+# ``read``/``write`` helpers sort for you, and nested ``with`` blocks must
+# follow it by hand (e.g. ``read("users")`` before ``write("tasks")``).
+LOCK_ORDER = ("users", "tasks", "complaints", "bins")
+
+# Number of entries kept in the dashboard "recent" lists
+RECENT_LIMIT = 5
+
+FULL_STATUSES = ("full", "overflow")
+
+# Change-feed audiences
+STAFF_ROLES = ("admin", "worker")
+ADMIN_ROLES = ("admin",)
+ACTIVE_TASK_STATUSES = ("pending", "in_progress")
+
+# Collection whose version each kind of change-feed event bumps
+EVENT_COLLECTIONS = {
+    "user": "users",
+    "assignments": "assignments",
+    "bins": "bins",
+    "alert": "alerts",
+    "alerts": "alerts",
+    "complaint": "complaints",
+    "task": "tasks",
+    "collection": "collections",
+    "collections": "collections",
+    "reward": "rewards",
+    "rewards": "rewards",
+    "complaints": "complaints",
+    "tasks": "tasks",
+}
+
+
+def _task_closed(task: dict) -> bool:
+    """Whether ``task`` is done with: completed and approved."""
+    return task["status"] == "completed" and task.get("approved") is True
+
+
+def _event_copy(record: dict) -> dict:
+    """Copy of a record to publish on the change feed.
+
+    Each SSE stream serializes an event when it gets to it, by which time
+    the record may have been edited in place again. List fields
+    (``mediaUrls``, ``completionPhotos``) are copied too, so the event keeps
+    the state it was published with.
+    """
+    return {k: list(v) if isinstance(v, list) else v for k, v in record.items()}
+
+
+def _push_recent(recent: list, record: dict, key: str):
+    """Insert ``record`` into a newest-first list capped at RECENT_LIMIT."""
+    value = record[key]
+    if len(recent) >= RECENT_LIMIT and value <= recent[-1][key]:
+        return
+    # Ties keep insertion order, like a stable reverse sort
+    i = 0
+    while i < len(recent) and recent[i][key] >= value:
+        i += 1
+    recent.insert(i, record)
+    del recent[RECENT_LIMIT:]
+
+
+class RWLock:
+    """Writer-preferring reader/writer lock (not reentrant)."""
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    def acquire_read(self):
+        with self._cond:
+            while self._writer or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+
+    def release_read(self):
+        with self._cond:
+            self._readers -= 1
+            if not self._readers:
+                self._cond.notify_all()
+
+    def acquire_write(self):
+        with self._cond:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+
+    def release_write(self):
+        with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+
 
 class DataStore:
-    """Thread-safe in-memory data store — no database required."""
+    """Thread-safe in-memory data store — no database required.
+
+    Each collection group in ``LOCK_ORDER`` has its own reader/writer lock,
+    so GETs run concurrently and writers only block their own group.
+    """
 
     _instance = None
 
-    def __new__(cls):
-        if cls._instance is None:
+    def __new__(cls, *args, **kwargs):
+        # One instance per engine class
+        if cls.__dict__.get("_instance") is None:
             cls._instance = super().__new__(cls)
             cls._instance._initialized = False
         return cls._instance
@@ -19,8 +140,66 @@ class DataStore:
         if self._initialized:
             return
         self._initialized = True
-        self.lock = threading.Lock()
+        self._locks = {name: RWLock() for name in LOCK_ORDER}
+        self.changes = ChangeFeed()
+        self._versions = {}
+        self.changes.add_listener(self._bump_version)
+        self.archive = Archive()
+        self._load()
+
+    def _load(self):
         self._seed()
+        self._build_indexes()
+
+    def version(self, *collections: str) -> tuple:
+        """Versions of the named collections ("bins", "alerts", ...; see ``EVENT_COLLECTIONS``).
+
+        A collection's version grows with every change to it, so responses
+        built from it can be cached until it moves. Read it under the same
+        locks as the data.
+        """
+        return tuple(self._versions.get(c, 0) for c in collections)
+
+    def _bump_version(self, event: dict):
+        # Change-feed listener: every mutator publishes, so every change is seen
+        collection = EVENT_COLLECTIONS.get(event["type"].partition(".")[0])
+        if collection:
+            self._versions[collection] = self._versions.get(collection, 0) + 1
+
+    def _bump_all_versions(self):
+        # After a rebuild nothing cached before it can be trusted
+        for collection in set(EVENT_COLLECTIONS.values()):
+            self._versions[collection] = self._versions.get(collection, 0) + 1
+
+    def _ordered_locks(self, names):
+        unknown = set(names) - set(LOCK_ORDER)
+        if unknown:
+            raise KeyError(f"Unknown lock group(s): {sorted(unknown)}")
+        return [self._locks[n] for n in LOCK_ORDER if n in names]
+
+    @contextmanager
+    def read(self, *names: str):
+        """Hold shared locks on the named collection groups."""
+        locks = self._ordered_locks(names)
+        for lock in locks:
+            lock.acquire_read()
+        try:
+            yield self
+        finally:
+            for lock in reversed(locks):
+                lock.release_read()
+
+    @contextmanager
+    def write(self, *names: str):
+        """Hold exclusive locks on the named collection groups."""
+        locks = self._ordered_locks(names)
+        for lock in locks:
+            lock.acquire_write()
+        try:
+            yield self
+        finally:
+            for lock in reversed(locks):
+                lock.release_write()
 
     def _seed(self):
         # Demo users
@@ -35,43 +214,37 @@ class DataStore:
         # Baramati city areas
         areas = ["Central", "South", "East", "West", "North"]
         locations = [
-            ("Baramati Bus Stand", "Central"),
-            ("Bhigwan Road Chowk", "South"),
-            ("Nira River Bridge", "East"),
-            ("Katewadi Phata", "West"),
-            ("Jalochi Road", "North"),
-            ("Market Yard Baramati", "Central"),
-            ("Shivaji Chowk", "South"),
-            ("Phaltan Road", "West"),
-            ("Indapur Highway Junction", "East"),
-            ("Baramati Krishi Vidyapeeth", "North"),
-            ("Malegaon Chowk", "Central"),
-            ("Supe Road", "South"),
-            ("Morgaon Road", "East"),
-            ("Station Road Baramati", "West"),
-            ("Karhati Phata", "North"),
+            ("Baramati Bus Stand", "Central", 18.1527, 74.5781),
+            ("Bhigwan Road Chowk", "South", 18.1450, 74.5695),
+            ("Nira River Bridge", "East", 18.1603, 74.5838),
+            ("Katewadi Phata", "West", 18.1402, 74.5412),
+            ("Jalochi Road", "North", 18.1716, 74.5742),
+            ("Market Yard Baramati", "Central", 18.1519, 74.5815),
+            ("Shivaji Chowk", "South", 18.1489, 74.5768),
+            ("Phaltan Road", "West", 18.1365, 74.5890),
+            ("Indapur Highway Junction", "East", 18.1441, 74.5512),
+            ("Baramati Krishi Vidyapeeth", "North", 18.1658, 74.5620),
+            ("Malegaon Chowk", "Central", 18.1547, 74.5736),
+            ("Supe Road", "South", 18.1555, 74.5773),
+            ("Morgaon Road", "East", 18.1498, 74.5987),
+            ("Station Road Baramati", "West", 18.1541, 74.5812),
+            ("Karhati Phata", "North", 18.1792, 74.5903),
         ]
 
         import random
         random.seed(42)
 
         self.bins = []
-        for i, (loc, area) in enumerate(locations, 1):
+        for i, (loc, area, lat, lng) in enumerate(locations, 1):
             fill = random.randint(5, 95)
-            if fill >= 90:
-                status = "overflow"
-            elif fill >= 75:
-                status = "full"
-            elif fill >= 40:
-                status = "half"
-            else:
-                status = "empty"
             self.bins.append({
                 "id": i,
                 "location": loc,
                 "area": area,
+                "latitude": lat,
+                "longitude": lng,
                 "fillLevel": fill,
-                "status": status,
+                "status": bin_status(fill),
                 "lastCollected": "2026-02-16T08:30:00",
                 "sensorBattery": random.randint(40, 100),
             })
@@ -96,12 +269,15 @@ class DataStore:
         # Complaints
         self.complaints = [
             {"id": 1, "userId": 4, "userName": "Amit Patel", "location": "Supe Road",
+             "latitude": 18.1555, "longitude": 74.5773,
              "description": "Garbage overflow since 2 days", "status": "pending",
              "createdAt": "2026-02-15T10:30:00"},
             {"id": 2, "userId": 4, "userName": "Amit Patel", "location": "Market Yard Baramati",
+             "latitude": 18.1519, "longitude": 74.5815,
              "description": "Stray dogs tearing garbage bags", "status": "in_progress",
              "createdAt": "2026-02-14T14:20:00"},
             {"id": 3, "userId": 4, "userName": "Amit Patel", "location": "Shivaji Chowk",
+             "latitude": 18.1489, "longitude": 74.5768,
              "description": "Bin is damaged and leaking", "status": "resolved",
              "createdAt": "2026-02-13T09:15:00"},
         ]
@@ -109,11 +285,11 @@ class DataStore:
 
         # Rewards — points earned per citizen
         self.rewards = {
-            4: {"points": 150, "level": "Silver", "history": [
+            4: {"points": 150, "level": "Silver", "history": deque([
                 {"action": "Complaint submitted", "points": 50, "date": "2026-02-15T10:30:00"},
                 {"action": "Complaint submitted", "points": 50, "date": "2026-02-14T14:20:00"},
                 {"action": "Complaint resolved", "points": 50, "date": "2026-02-13T09:15:00"},
-            ]}
+            ])}
         }
 
         # Worker assignments
@@ -151,16 +327,969 @@ class DataStore:
         ]
         self._task_id = 2
 
-        # Collection history
-        self.collections = [
-            {"day": "Mon", "collections": 12},
-            {"day": "Tue", "collections": 18},
-            {"day": "Wed", "collections": 15},
-            {"day": "Thu", "collections": 22},
-            {"day": "Fri", "collections": 19},
-            {"day": "Sat", "collections": 25},
-            {"day": "Sun", "collections": 8},
-        ]
+        # Append-only log of collections and complaint resolutions (app/analytics.py);
+        # entries past the retention window are archived and folded into the summary
+        self.collection_events = []
+        self.collection_summary = None
+
+    # ── Secondary indexes & aggregates ──
+    # Callers must hold the matching group lock (see LOCK_ORDER) for every
+    # accessor and mutator below. Status fields must only be changed through
+    # the ``set_*`` mutators so the counters used by /api/stats stay exact.
+
+    def _build_indexes(self):
+        """Rebuild every secondary index and aggregate from the primary lists."""
+        self._users_by_id = {}
+        self._users_by_email = {}
+        self._user_id = 0
+        self._workers = {}
+        for u in self.users:
+            self._index_user(u)
+            self._count_user(u)
+
+        self._index_bins()
+        self._alerts_by_id = {}
+        self._active_alert_by_bin = {}
+        self._active_alerts = 0
+        self.alerts_sorted = SortedIndex("createdAt")
+        for a in self.alerts:
+            self._index_alert(a)
+            self._count_alert(a)
+
+        self._complaints_by_id = {}
+        self._complaint_status_counts = {}
+        self._area_complaints = {}
+        self._recent_complaints = []
+        self.complaint_locations = SpatialIndex()
+        self.complaints_sorted = SortedIndex("createdAt")
+        self._complaints_by_user = {}
+        for c in self.complaints:
+            self._index_complaint(c)
+            self._count_complaint(c)
+
+        self._tasks_by_id = {}
+        self._tasks_by_complaint = {}
+        # complaintId -> cached "linkedTask" projection; filled lazily by
+        # readers and dropped whenever that complaint or its task changes
+        self._linked_task_views = {}
+        self._tasks_by_worker = {}
+        self._task_status_counts = {}
+        self._worker_task_counts = {}
+        self._recent_tasks = []
+        self.task_locations = SpatialIndex()
+        self.tasks_sorted = SortedIndex("assignedAt")
+        for t in self.tasks:
+            self._index_task(t)
+            self._count_task(t)
+
+        self.collection_log = CollectionLog(self.collection_events, self.collection_summary)
+        self._bump_all_versions()
+
+    def _index_bins(self):
+        # Bins stay in memory with every engine — the simulator and bulk
+        # ingest work on the NumPy columns
+        self._bins_by_id = {b["id"]: b for b in self.bins}
+        self.bins_sorted = SortedIndex("id")
+        self.bin_locations = SpatialIndex()
+        for b in self.bins:
+            self.bins_sorted.add(b)
+            self.bin_locations.add(b["id"], b.get("latitude"), b.get("longitude"))
+        self.bin_state = BinState(self.bins)
+        self.forecast = FillForecaster(len(self.bins))
+        self.fill_history = FillHistory(len(self.bins))
+        self._fill_total = sum(b["fillLevel"] for b in self.bins)
+        self._full_bins = sum(1 for b in self.bins if b["status"] in FULL_STATUSES)
+
+    # ``_index_*`` maintain the lookup structures of the in-memory engine;
+    # ``_count_*`` maintain the aggregates and spatial indexes every engine
+    # keeps in memory.
+
+    def _index_user(self, user: dict):
+        self._users_by_id[user["id"]] = user
+        self._users_by_email[user["email"]] = user
+
+    def _count_user(self, user: dict):
+        self._user_id = max(self._user_id, user["id"])
+        if user["role"] == "worker":
+            self._workers[user["id"]] = user
+
+    def _index_alert(self, alert: dict):
+        self._alerts_by_id[alert["id"]] = alert
+        self.alerts_sorted.add(alert)
+
+    def _count_alert(self, alert: dict):
+        if alert["status"] == "active":
+            self._active_alerts += 1
+            self._active_alert_by_bin.setdefault(alert["binId"], alert)
+            self.bin_state.alerted[self.bin_state.index[alert["binId"]]] = True
+
+    def _index_complaint(self, complaint: dict):
+        self._complaints_by_id[complaint["id"]] = complaint
+        self.complaints_sorted.add(complaint)
+        self._complaints_by_user.setdefault(complaint["userId"], SortedIndex("createdAt")).add(complaint)
+        _push_recent(self._recent_complaints, complaint, "createdAt")
+
+    def _count_complaint(self, complaint: dict):
+        status = complaint["status"]
+        self._complaint_status_counts[status] = self._complaint_status_counts.get(status, 0) + 1
+        loc = complaint["location"]
+        self._area_complaints[loc] = self._area_complaints.get(loc, 0) + 1
+        self.complaint_locations.add(complaint["id"], complaint.get("latitude"), complaint.get("longitude"))
+
+    def _uncount_complaint(self, complaint: dict):
+        self._complaint_status_counts[complaint["status"]] -= 1
+        loc = complaint["location"]
+        self._area_complaints[loc] -= 1
+        if not self._area_complaints[loc]:
+            del self._area_complaints[loc]
+        self.complaint_locations.remove(complaint["id"])
+
+    def _index_task(self, task: dict):
+        self._tasks_by_id[task["id"]] = task
+        self.tasks_sorted.add(task)
+        if task.get("complaintId"):
+            self._tasks_by_complaint.setdefault(task["complaintId"], []).append(task)
+        self._tasks_by_worker.setdefault(task["workerId"], SortedIndex("assignedAt")).add(task)
+        _push_recent(self._recent_tasks, task, "assignedAt")
+
+    def _count_task(self, task: dict):
+        counts = self._worker_task_counts.setdefault(
+            task["workerId"], {"total": 0, "completed": 0, "active": 0}
+        )
+        counts["total"] += 1
+        self._count_task_status(task, task["status"], 1)
+        self.task_locations.add(task["id"], task.get("latitude"), task.get("longitude"))
+
+    def _uncount_task(self, task: dict):
+        self._worker_task_counts[task["workerId"]]["total"] -= 1
+        self._count_task_status(task, task["status"], -1)
+        self.task_locations.remove(task["id"])
+
+    def _count_task_status(self, task: dict, status: str, delta: int):
+        self._task_status_counts[status] = self._task_status_counts.get(status, 0) + delta
+        counts = self._worker_task_counts[task["workerId"]]
+        if status == "completed":
+            counts["completed"] += delta
+        elif status in ACTIVE_TASK_STATUSES:
+            counts["active"] += delta
+
+    # ── Users ──
+
+    def get_user(self, user_id: int):
+        return self._users_by_id.get(user_id)
+
+    def get_user_by_email(self, email: str):
+        return self._users_by_email.get(email)
+
+    def next_user_id(self) -> int:
+        # Monotonic, so a deleted user's id (and any token cached for it) is never reused
+        return self._user_id + 1
+
+    def next_id(self, kind: str) -> int:
+        """Allocate the id of a new "alert", "complaint" or "task"; hold that group's write lock."""
+        counter = f"_{kind}_id"
+        value = getattr(self, counter) + 1
+        setattr(self, counter, value)
+        return value
+
+    def add_user(self, user: dict) -> dict:
+        self._insert_user(user)
+        self._count_user(user)
+        self.changes.publish("user.created", _event_copy(user))
+        return user
+
+    def remove_user(self, user_id: int):
+        """Remove a user and return the removed record (or None)."""
+        user = self._delete_user(user_id)
+        if user is None:
+            return None
+        self._workers.pop(user_id, None)
+        self.changes.publish("user.removed", {"id": user_id})
+        return user
+
+    def workers(self) -> list:
+        return list(self._workers.values())
+
+    def set_assignments(self, assignments: list):
+        """Replace the worker bin assignments (guarded by the users lock)."""
+        self.assignments = assignments
+        self._save_assignments(assignments)
+        self.changes.publish("assignments.updated", assignments, STAFF_ROLES)
+
+    # ── Bins & alerts ──
+
+    def get_bin(self, bin_id: int):
+        return self._bins_by_id.get(bin_id)
+
+    def set_bin_fill(self, b: dict, fill: int):
+        """Update a bin's fill level and derived status."""
+        status = bin_status(fill)
+        self._fill_total += fill - b["fillLevel"]
+        self._full_bins += (status in FULL_STATUSES) - (b["status"] in FULL_STATUSES)
+        b["fillLevel"] = fill
+        b["status"] = status
+        i = self.bin_state.index[b["id"]]
+        self.bin_state.fill[i] = fill
+        self.bin_state.status[i] = STATUS_NAMES.index(status)
+        now = time.time()
+        self.forecast.observe([i], [fill], now)
+        self.fill_history.record([i], [fill], now, now)
+        self._save_bins([i])
+        self.changes.publish("bins.fill", {"ids": [b["id"]], "fillLevel": [fill], "status": [status]}, STAFF_ROLES)
+
+    def apply_fill_levels(self, fill: np.ndarray, read_rows: np.ndarray | None = None,
+                          read_at=None) -> np.ndarray:
+        """Replace every bin's fill level in one vectorized step.
+
+        ``fill`` is aligned with ``self.bins``. Counters are adjusted with array
+        reductions and only the rows that changed are written back to the bin
+        dicts. ``read_rows`` (default: every row) were read by a sensor at
+        ``read_at`` (epoch seconds, scalar or per row; default: now) and feed
+        the fill-rate forecast and history. Returns the indices of the changed rows.
+        """
+        changed, codes = self._update_fill(fill, read_rows, read_at)
+        if len(changed):
+            self._save_bins(changed.tolist())
+            self.changes.publish("bins.fill", {
+                "ids": self.bin_state.ids[changed].tolist(),
+                "fillLevel": fill[changed].tolist(),
+                "status": [STATUS_NAMES[code] for code in codes[changed].tolist()],
+            }, STAFF_ROLES)
+        return changed
+
+    def _update_fill(self, fill: np.ndarray, read_rows: np.ndarray | None, read_at) -> tuple:
+        """In-memory part of ``apply_fill_levels``: ``(changed rows, status codes)``."""
+        state = self.bin_state
+        if read_rows is None:
+            read_rows = np.arange(len(state))
+        now = time.time()
+        read_at = now if read_at is None else read_at
+        self.forecast.observe(read_rows, fill[read_rows], read_at)
+        self.fill_history.record(read_rows, fill[read_rows], read_at, now)
+        codes = status_codes(fill)
+        changed = np.flatnonzero(fill != state.fill)
+        self._fill_total += int(fill.sum(dtype=np.int64) - state.fill.sum(dtype=np.int64))
+        self._full_bins += int(np.count_nonzero(codes >= FULL_CODE) - np.count_nonzero(state.status >= FULL_CODE))
+        state.fill = fill.astype(np.int16, copy=False)
+        state.status = codes
+
+        bins = self.bins
+        for i, f, code in zip(changed.tolist(), fill[changed].tolist(), codes[changed].tolist()):
+            b = bins[i]
+            b["fillLevel"] = f
+            b["status"] = STATUS_NAMES[code]
+        return changed, codes
+
+    def apply_battery_levels(self, rows: np.ndarray, battery: np.ndarray):
+        """Set ``sensorBattery`` for the given ``self.bins`` row indices."""
+        self._update_battery(rows, battery)
+        self._save_bins(rows.tolist())
+        self.changes.publish("bins.battery", {
+            "ids": self.bin_state.ids[rows].tolist(),
+            "sensorBattery": battery.tolist(),
+        }, STAFF_ROLES)
+
+    def _update_battery(self, rows: np.ndarray, battery: np.ndarray):
+        self.bin_state.battery[rows] = battery
+        bins = self.bins
+        for i, level in zip(rows.tolist(), battery.tolist()):
+            bins[i]["sensorBattery"] = level
+
+    def get_alert(self, alert_id: int):
+        return self._alerts_by_id.get(alert_id)
+
+    def active_alert_for_bin(self, bin_id: int):
+        return self._active_alert_by_bin.get(bin_id)
+
+    def add_alert(self, alert: dict):
+        """Raise an alert, given without an ``id``; returns None if the bin already has an active one.
+
+        The id is allocated only once the alert is stored, so a refused alert
+        does not use one up. With several workers (app/cluster.py) the
+        active alert may be another worker's; its ``alert.created`` event
+        counts it here once applied.
+        """
+        if not self._insert_alert(alert):
+            return None
+        self._count_alert(alert)
+        self.changes.publish("alert.created", _event_copy(alert), STAFF_ROLES)
+        return alert
+
+    def resolve_alert(self, alert: dict):
+        """Mark an alert resolved — a bin has at most one active alert at a time."""
+        if alert["status"] == "active":
+            self._active_alerts -= 1
+        alert["status"] = "resolved"
+        alert["resolvedAt"] = datetime.now().isoformat()
+        self._save_alert(alert)
+        active = self._active_alert_by_bin.get(alert["binId"])
+        if active is not None and active["id"] == alert["id"]:
+            del self._active_alert_by_bin[alert["binId"]]
+            row = self.bin_state.index[alert["binId"]]
+            self.bin_state.alerted[row] = False
+            # A bin resolved without being emptied is evaluated again
+            self.bin_state.recheck.add(row)
+        self.changes.publish("alert.resolved", {"id": alert["id"], "binId": alert["binId"],
+                                                "resolvedAt": alert["resolvedAt"]}, STAFF_ROLES)
+
+    def archive_alerts(self, before: str) -> int:
+        """Move alerts resolved before ``before`` (ISO time) to the archive.
+
+        They are written to cold storage first, so a crash in between can
+        only leave an alert in both places, never in neither. Returns how
+        many were moved.
+        """
+        alerts = self._resolved_alerts_before(before)
+        if alerts:
+            self.archive.append("alerts", alerts, "createdAt")
+            self._delete_alerts(alerts)
+            self.changes.publish("alerts.archived", {"ids": [a["id"] for a in alerts]})
+        return len(alerts)
+
+    def collect_bin(self, b: dict, user: dict, alert: dict | None = None):
+        """Empty a bin and log the collection.
+
+        ``alert`` is the alert the collection answers, already resolved by
+        the caller; by default the bin's active alert is resolved here. The
+        collection is credited to ``user`` if they are a worker, else to the
+        worker whose assignment includes the bin.
+        """
+        now = datetime.now()
+        entry = {"type": "collection", "at": now.isoformat(), "binId": b["id"], "area": b["area"]}
+        if user["role"] == "worker":
+            entry["workerId"], entry["workerName"] = user["id"], user["name"]
+        else:
+            assigned = next((a for a in self.assignments if b["id"] in a["binIds"]), None)
+            if assigned:
+                entry["workerId"], entry["workerName"] = assigned["workerId"], assigned["workerName"]
+        self.set_bin_fill(b, 0)
+        if alert is None:
+            alert = self.active_alert_for_bin(b["id"])
+            if alert:
+                self.resolve_alert(alert)
+        if alert:
+            entry["alertId"] = alert["id"]
+            entry["responseSeconds"] = (now - datetime.fromisoformat(alert["createdAt"])).total_seconds()
+        self.log_collection_event(entry)
+
+    # ── Complaints ──
+
+    def get_complaint(self, complaint_id: int):
+        return self._complaints_by_id.get(complaint_id)
+
+    def complaint_index(self, user_id: int | None = None) -> SortedIndex:
+        """Complaints ordered by ``createdAt`` — all of them, or one citizen's."""
+        if user_id is None:
+            return self.complaints_sorted
+        return self._complaints_by_user.get(user_id) or SortedIndex("createdAt")
+
+    def add_complaint(self, complaint: dict) -> dict:
+        self._insert_complaint(complaint)
+        self._count_complaint(complaint)
+        self.changes.publish("complaint.created", _event_copy(complaint), STAFF_ROLES, complaint["userId"])
+        return complaint
+
+    def set_complaint_status(self, complaint: dict, status: str):
+        """Change a complaint's status; set any other fields before calling."""
+        counts = self._complaint_status_counts
+        counts[complaint["status"]] -= 1
+        counts[status] = counts.get(status, 0) + 1
+        resolved = status == "resolved" and complaint["status"] != "resolved"
+        complaint["status"] = status
+        if resolved:
+            now = datetime.now()
+            complaint["resolvedAt"] = now.isoformat()
+        self.complaint_changed(complaint)
+        if resolved:
+            self.log_collection_event({
+                "type": "complaint_resolved",
+                "at": complaint["resolvedAt"],
+                "complaintId": complaint["id"],
+                "resolutionSeconds": (now - datetime.fromisoformat(complaint["createdAt"])).total_seconds(),
+            })
+
+    def complaint_changed(self, complaint: dict):
+        """Save and publish a complaint whose fields were edited in place."""
+        self._save_complaint(complaint)
+        self._linked_task_views.pop(complaint["id"], None)
+        self.changes.publish("complaint.updated", _event_copy(complaint), STAFF_ROLES, complaint["userId"])
+
+    # ── Tasks ──
+
+    def get_task(self, task_id: int):
+        return self._tasks_by_id.get(task_id)
+
+    def task_for_complaint(self, complaint_id: int):
+        """The first task linked to a complaint (or None)."""
+        tasks = self._tasks_by_complaint.get(complaint_id)
+        return tasks[0] if tasks else None
+
+    def tasks_for_complaint(self, complaint_id: int) -> list:
+        """Every task linked to a complaint, oldest first."""
+        return list(self._tasks_by_complaint.get(complaint_id, ()))
+
+    def task_index(self, worker_id: int | None = None) -> SortedIndex:
+        """Tasks ordered by ``assignedAt`` — all of them, or one worker's."""
+        if worker_id is None:
+            return self.tasks_sorted
+        return self._tasks_by_worker.get(worker_id) or SortedIndex("assignedAt")
+
+    def linked_task_view(self, complaint_id: int):
+        """Citizen-facing summary of the task linked to a complaint (or None).
+
+        Requires read locks on tasks and complaints. Completion evidence is
+        only exposed once the admin has approved the task.
+        """
+        try:
+            return self._linked_task_views[complaint_id]
+        except KeyError:
+            pass
+        task = self.task_for_complaint(complaint_id)
+        view = None
+        if task:
+            approved = task.get("approved")
+            view = {
+                "id": task["id"],
+                "workerName": task["workerName"],
+                "status": task["status"],
+                "approved": approved,
+                "completionPhotos": list(task.get("completionPhotos", [])) if approved else [],
+                "completionNote": task.get("completionNote") if approved else None,
+                "completedAt": task.get("completedAt"),
+            }
+        # Concurrent readers may both fill this slot; they compute the same view
+        self._linked_task_views[complaint_id] = view
+        return view
+
+    def add_task(self, task: dict) -> dict:
+        """Requires write locks on tasks and read locks on complaints."""
+        self._insert_task(task)
+        self._count_task(task)
+        self.changes.publish("task.created", _event_copy(task), ADMIN_ROLES, task["workerId"])
+        if task.get("complaintId"):
+            self._linked_task_changed(task["complaintId"])
+        return task
+
+    def set_task_status(self, task: dict, status: str):
+        """Change a task's status; set any other fields before calling."""
+        self._count_task_status(task, task["status"], -1)
+        self._count_task_status(task, status, 1)
+        task["status"] = status
+        self.task_changed(task)
+
+    def task_changed(self, task: dict):
+        """Save and publish a task whose fields were edited in place.
+
+        Requires write locks on tasks and read locks on complaints.
+        """
+        self._save_task(task)
+        self.changes.publish("task.updated", _event_copy(task), ADMIN_ROLES, task["workerId"])
+        if task.get("complaintId"):
+            self._linked_task_changed(task["complaintId"])
+
+    def _linked_task_changed(self, complaint_id: int):
+        # Citizens never see task events; send the complaint's owner the
+        # refreshed citizen-facing view instead
+        self._linked_task_views.pop(complaint_id, None)
+        complaint = self.get_complaint(complaint_id)
+        if complaint:
+            self.changes.publish("complaint.task", {"id": complaint_id, "linkedTask": self.linked_task_view(complaint_id)},
+                                 user_id=complaint["userId"])
+
+    # ── Retention ──
+
+    def archive_closed(self, before: str) -> dict:
+        """Move complaints and tasks closed before ``before`` (ISO time) to the archive.
+
+        A complaint is closed once resolved and every task linked to it is
+        closed; a task once completed and approved. A task is kept while its
+        complaint is still in the store, so ``linkedTask`` never dangles.
+        Records are written to cold storage before they are deleted, like
+        ``archive_alerts``. Requires write locks on tasks and complaints;
+        returns how many of each were moved.
+        """
+        complaints = [c for c in self._resolved_complaints_before(before)
+                      if all(map(_task_closed, self.tasks_for_complaint(c["id"])))]
+        archived = {c["id"] for c in complaints}
+        tasks = [t for t in self._closed_tasks_before(before)
+                 if not t.get("complaintId") or t["complaintId"] in archived
+                 or self.get_complaint(t["complaintId"]) is None]
+        if complaints:
+            self.archive.append("complaints", complaints, "createdAt")
+        if tasks:
+            self.archive.append("tasks", tasks, "assignedAt")
+        if complaints:
+            self._delete_complaints(complaints)
+            for c in complaints:
+                self._uncount_complaint(c)
+                self._linked_task_views.pop(c["id"], None)
+            self.changes.publish("complaints.archived", {"ids": sorted(archived)})
+        if tasks:
+            self._delete_tasks(tasks)
+            for t in tasks:
+                self._uncount_task(t)
+            self.changes.publish("tasks.archived", {"ids": [t["id"] for t in tasks]})
+        return {"complaints": len(complaints), "tasks": len(tasks)}
+
+    def archive_collection_events(self, before: str) -> int:
+        """Move collection-log entries logged before ``before`` (ISO time) to the archive.
+
+        Their totals are folded into the collection summary (the analytics
+        day buckets of every archived entry) in the same step, so analytics
+        are unchanged and survive restarts. Archived entries get an ordinal
+        ``id``. Requires write locks on tasks, complaints and bins — every
+        group that logs. Returns how many entries were moved.
+        """
+        events = self._collection_events_before(before)
+        if events:
+            folded = CollectionLog(state=self._collection_summary())
+            start = folded.size
+            self.archive.append("collections", [{"id": start + i, **e} for i, e in enumerate(events, 1)], "at")
+            for e in events:
+                folded.add(e)
+            self._delete_collection_events(before, folded.state())
+            self.changes.publish("collections.archived", {"before": before})
+        return len(events)
+
+    # ── Locations ──
+    # ``collection`` is "bins", "complaints" or "tasks"; hold its group lock.
+
+    def _spatial(self, collection: str):
+        index = {"bins": self.bin_locations, "complaints": self.complaint_locations,
+                 "tasks": self.task_locations}[collection]
+        get = {"bins": self.get_bin, "complaints": self.get_complaint, "tasks": self.get_task}[collection]
+        return index, get
+
+    def nearby(self, collection: str, lat: float, lng: float, radius_m: float,
+               limit: int | None = None, predicate=None) -> list:
+        """``(record, meters)`` pairs within ``radius_m`` of a point, nearest first."""
+        index, get = self._spatial(collection)
+        ids, meters = index.within_radius(lat, lng, radius_m, None if predicate else limit)
+        found = [(r, m) for r, m in zip(map(get, ids), meters) if predicate is None or predicate(r)]
+        return found[:limit]
+
+    def nearest(self, collection: str, lat: float, lng: float, k: int) -> list:
+        """The ``k`` closest ``(record, meters)`` pairs to a point."""
+        index, get = self._spatial(collection)
+        ids, meters = index.nearest(lat, lng, k)
+        return list(zip(map(get, ids), meters))
+
+    def within(self, collection: str, south: float, west: float, north: float, east: float,
+               limit: int | None = None, predicate=None) -> list:
+        """Records inside a bounding box, oldest first."""
+        index, get = self._spatial(collection)
+        found = [r for r in map(get, index.within_bbox(south, west, north, east, None if predicate else limit))
+                 if predicate is None or predicate(r)]
+        return found[:limit]
+
+    # ── Collection log ──
+
+    def log_collection_event(self, entry: dict):
+        """Append to the collection log; callers hold the lock of whatever they changed."""
+        self._insert_collection_event(entry)
+        self.collection_log.add(entry)
+        self.changes.publish("collection.logged", entry)
+
+    # ── Rewards ──
+
+    def get_rewards(self, user_id: int):
+        return self.rewards.get(user_id)
+
+    def init_rewards(self, user_id: int):
+        self._save_rewards(user_id, {"points": 0, "level": "Bronze", "history": deque()})
+
+    def award_points(self, user_id: int, action: str, points: int):
+        """Award reward points to a citizen."""
+        r = self.get_rewards(user_id) or {"points": 0, "level": "Bronze", "history": deque()}
+        r["points"] += points
+        entry = {"action": action, "points": points, "date": datetime.now().isoformat()}
+        r["history"].appendleft(entry)
+        # Update level
+        if r["points"] >= 500:
+            r["level"] = "Platinum"
+        elif r["points"] >= 300:
+            r["level"] = "Gold"
+        elif r["points"] >= 100:
+            r["level"] = "Silver"
+        else:
+            r["level"] = "Bronze"
+        self._save_rewards(user_id, r)
+        self.changes.publish("reward.updated", {"points": r["points"], "level": r["level"], "entry": entry}, user_id=user_id)
+
+    def archive_reward_history(self, keep: int) -> int:
+        """Move all but the newest ``keep`` history entries of each citizen to the archive.
+
+        Archived entries get a per-citizen ordinal ``id`` (1 = oldest) and
+        ``r["archived"]`` counts them. Requires the complaints write lock;
+        returns how many entries were moved.
+        """
+        over = self._rewards_over(keep)
+        entries = []
+        for user_id, r in over:
+            start = r.get("archived", 0)
+            oldest_first = reversed(list(r["history"])[keep:])
+            entries.extend({"id": start + i, "userId": user_id, **e} for i, e in enumerate(oldest_first, 1))
+        if entries:
+            self.archive.append("rewards", entries, "date")
+            for user_id, r in over:
+                history = r["history"]
+                r["archived"] = r.get("archived", 0) + len(history) - keep
+                while len(history) > keep:
+                    history.pop()
+                self._save_rewards(user_id, r)
+            self.changes.publish("rewards.archived", {"userIds": [uid for uid, _ in over], "kept": keep})
+        return len(entries)
+
+    # ── Storage hooks ──
+    # Where records live. The in-memory engine keeps them in the primary
+    # lists and edits them in place, so the ``_save_*`` hooks are no-ops;
+    # app/sqlite_store.py overrides these (and the getters) to use SQLite.
+
+    def close(self):
+        """Release engine resources (nothing to do in memory)."""
+
+    def _insert_user(self, user: dict):
+        self.users.append(user)
+        self._index_user(user)
+
+    def _delete_user(self, user_id: int):
+        user = self._users_by_id.pop(user_id, None)
+        if user is not None:
+            self._users_by_email.pop(user["email"], None)
+            self.users = [u for u in self.users if u["id"] != user_id]
+        return user
+
+    def _save_bins(self, rows: list):
+        pass
+
+    def _insert_alert(self, alert: dict) -> bool:
+        if alert["binId"] in self._active_alert_by_bin:
+            return False
+        alert["id"] = self.next_id("alert")
+        self.alerts.append(alert)
+        self._index_alert(alert)
+        return True
+
+    def _save_alert(self, alert: dict):
+        pass
+
+    def _resolved_alerts_before(self, before: str) -> list:
+        return [a for a in self.alerts
+                if a["status"] == "resolved" and a.get("resolvedAt", a["createdAt"]) < before]
+
+    def _delete_alerts(self, alerts: list):
+        ids = {a["id"] for a in alerts}
+        for a in alerts:
+            del self._alerts_by_id[a["id"]]
+            self.alerts_sorted.remove(a)
+        self.alerts = [a for a in self.alerts if a["id"] not in ids]
+
+    def _insert_complaint(self, complaint: dict):
+        self.complaints.append(complaint)
+        self._index_complaint(complaint)
+
+    def _save_complaint(self, complaint: dict):
+        pass
+
+    def _resolved_complaints_before(self, before: str) -> list:
+        return [c for c in self.complaints
+                if c["status"] == "resolved" and (c.get("resolvedAt") or c["createdAt"]) < before]
+
+    def _delete_complaints(self, complaints: list):
+        ids = {c["id"] for c in complaints}
+        for c in complaints:
+            del self._complaints_by_id[c["id"]]
+            self.complaints_sorted.remove(c)
+            self._complaints_by_user[c["userId"]].remove(c)
+        self.complaints = [c for c in self.complaints if c["id"] not in ids]
+        self._recent_complaints = []
+        for c in self.complaints:
+            _push_recent(self._recent_complaints, c, "createdAt")
+
+    def _insert_task(self, task: dict):
+        self.tasks.append(task)
+        self._index_task(task)
+
+    def _save_task(self, task: dict):
+        pass
+
+    def _closed_tasks_before(self, before: str) -> list:
+        return [t for t in self.tasks
+                if _task_closed(t) and (t.get("approvedAt") or t.get("completedAt") or t["assignedAt"]) < before]
+
+    def _delete_tasks(self, tasks: list):
+        ids = {t["id"] for t in tasks}
+        for t in tasks:
+            del self._tasks_by_id[t["id"]]
+            self.tasks_sorted.remove(t)
+            self._tasks_by_worker[t["workerId"]].remove(t)
+            linked = self._tasks_by_complaint.get(t.get("complaintId"))
+            if linked:
+                linked[:] = [other for other in linked if other is not t]
+                if not linked:
+                    del self._tasks_by_complaint[t["complaintId"]]
+        self.tasks = [t for t in self.tasks if t["id"] not in ids]
+        self._recent_tasks = []
+        for t in self.tasks:
+            _push_recent(self._recent_tasks, t, "assignedAt")
+
+    def _save_rewards(self, user_id: int, rewards: dict):
+        self.rewards[user_id] = rewards
+
+    def _rewards_over(self, keep: int) -> list:
+        """``(user id, rewards)`` of citizens with more than ``keep`` history entries."""
+        return [(uid, r) for uid, r in self.rewards.items() if len(r["history"]) > keep]
+
+    def _save_assignments(self, assignments: list):
+        pass
+
+    def _insert_collection_event(self, entry: dict):
+        self.collection_events.append(entry)
+
+    def _collection_events_before(self, before: str) -> list:
+        return [e for e in self.collection_events if e["at"] < before]
+
+    def _collection_summary(self):
+        return self.collection_summary
+
+    def _delete_collection_events(self, before: str, summary: dict):
+        self.collection_events = [e for e in self.collection_events if e["at"] >= before]
+        self.collection_summary = summary
+
+    # ── Persistence ──
+    # The journal (app/persistence.py) snapshots ``dump_state()`` and logs
+    # every change-feed event; recovery is ``load_state()`` + ``replay()``.
+
+    def dump_state(self) -> dict:
+        """Primary collections and id counters. Requires read locks on all groups."""
+        return {
+            "users": self.users,
+            "bins": self.bins,
+            "alerts": self.alerts,
+            "complaints": self.complaints,
+            "tasks": self.tasks,
+            "rewards": [[uid, {**r, "history": list(r["history"])}] for uid, r in self.rewards.items()],
+            "assignments": self.assignments,
+            "collectionEvents": self.collection_events,
+            "collectionSummary": self.collection_summary,
+            "counters": {
+                "user": self._user_id,
+                "alert": self._alert_id,
+                "complaint": self._complaint_id,
+                "task": self._task_id,
+            },
+        }
+
+    def load_state(self, state: dict, reindex: bool = True):
+        """Replace all collections with a ``dump_state()`` image.
+
+        Pass ``reindex=False`` when ``replay()`` (which reindexes) follows.
+        Requires write locks on all groups.
+        """
+        self.users = state["users"]
+        self.bins = state["bins"]
+        self.alerts = state["alerts"]
+        self.complaints = state["complaints"]
+        self.tasks = state["tasks"]
+        self.rewards = {uid: {**r, "history": deque(r["history"])} for uid, r in state["rewards"]}
+        self.assignments = state["assignments"]
+        self.collection_events = state.get("collectionEvents", [])
+        self.collection_summary = state.get("collectionSummary")
+        if reindex:
+            self._build_indexes()
+        counters = state["counters"]
+        self._user_id = max(self._user_id, counters["user"])
+        self._alert_id = counters["alert"]
+        self._complaint_id = counters["complaint"]
+        self._task_id = counters["task"]
+
+    def replay(self, events):
+        """Re-apply journaled change-feed events, then reindex once.
+
+        Writes go straight to the primary lists — nothing is re-published.
+        Requires write locks on all groups.
+        """
+        collections = {
+            "user": (self.users, {u["id"]: u for u in self.users}),
+            "alert": (self.alerts, {a["id"]: a for a in self.alerts}),
+            "complaint": (self.complaints, {c["id"]: c for c in self.complaints}),
+            "task": (self.tasks, {t["id"]: t for t in self.tasks}),
+        }
+        users_by_id = collections["user"][1]
+        alerts_by_id = collections["alert"][1]
+        bins_by_id = {b["id"]: b for b in self.bins}
+        removed_users = set()
+        archived_alerts, archived_complaints, archived_tasks = set(), set(), set()
+        for e in events:
+            kind, _, action = e["type"].partition(".")
+            data = e["data"]
+            if kind in collections and action in ("created", "updated"):
+                records, by_id = collections[kind]
+                existing = by_id.get(data["id"])
+                if existing is None:
+                    records.append(data)
+                    by_id[data["id"]] = data
+                else:
+                    existing.clear()
+                    existing.update(data)
+            elif e["type"] == "alert.resolved":
+                alert = alerts_by_id.get(data["id"])
+                if alert:
+                    alert["status"] = "resolved"
+                    if "resolvedAt" in data:
+                        alert["resolvedAt"] = data["resolvedAt"]
+            elif e["type"] == "alerts.archived":
+                archived_alerts.update(data["ids"])
+            elif e["type"] == "complaints.archived":
+                archived_complaints.update(data["ids"])
+            elif e["type"] == "tasks.archived":
+                archived_tasks.update(data["ids"])
+            elif e["type"] == "user.removed":
+                removed_users.add(data["id"])
+            elif e["type"] == "bins.fill":
+                for bin_id, fill, status in zip(data["ids"], data["fillLevel"], data["status"]):
+                    b = bins_by_id.get(bin_id)
+                    if b:
+                        b["fillLevel"] = fill
+                        b["status"] = status
+            elif e["type"] == "bins.battery":
+                for bin_id, level in zip(data["ids"], data["sensorBattery"]):
+                    b = bins_by_id.get(bin_id)
+                    if b:
+                        b["sensorBattery"] = level
+            elif e["type"] == "assignments.updated":
+                self.assignments = data
+            elif e["type"] == "collection.logged":
+                self.collection_events.append(data)
+            elif e["type"] == "collections.archived":
+                archived = [c for c in self.collection_events if c["at"] < data["before"]]
+                self.collection_summary = CollectionLog(archived, self.collection_summary).state()
+                self.collection_events = [c for c in self.collection_events if c["at"] >= data["before"]]
+            elif e["type"] == "reward.updated":
+                r = self.rewards.setdefault(e["userId"], {"points": 0, "level": "Bronze", "history": deque()})
+                r["points"] = data["points"]
+                r["level"] = data["level"]
+                r["history"].appendleft(data["entry"])
+            elif e["type"] == "rewards.archived":
+                # The entries themselves are in the archive already
+                for user_id in data["userIds"]:
+                    r = self.rewards[user_id]
+                    history = r["history"]
+                    r["archived"] = r.get("archived", 0) + max(0, len(history) - data["kept"])
+                    while len(history) > data["kept"]:
+                        history.pop()
+        if removed_users:
+            self.users = [u for u in self.users if u["id"] not in removed_users]
+        if archived_alerts:
+            self.alerts = [a for a in self.alerts if a["id"] not in archived_alerts]
+        if archived_complaints:
+            self.complaints = [c for c in self.complaints if c["id"] not in archived_complaints]
+        if archived_tasks:
+            self.tasks = [t for t in self.tasks if t["id"] not in archived_tasks]
+        last_user_id = max([self._user_id] + list(users_by_id))
+        self._build_indexes()
+        self._user_id = last_user_id
+        self._alert_id = max([self._alert_id] + [a["id"] for a in self.alerts])
+        self._complaint_id = max([self._complaint_id] + list(collections["complaint"][1]))
+        self._task_id = max([self._task_id] + list(collections["task"][1]))
+
+    # ── Dashboard aggregates ──
+
+    def stats_summary(self) -> dict:
+        """O(workers) snapshot of the maintained dashboard counters.
+
+        Requires read locks on all four groups.
+        """
+        complaint_counts = self._complaint_status_counts
+        task_counts = self._task_status_counts
+        worker_stats = []
+        for w in self._workers.values():
+            counts = self._worker_task_counts.get(w["id"], {"total": 0, "completed": 0, "active": 0})
+            worker_stats.append({
+                "id": w["id"],
+                "name": w["name"],
+                "totalTasks": counts["total"],
+                "completedTasks": counts["completed"],
+                "activeTasks": counts["active"],
+            })
+        return {
+            "totalBins": len(self.bins),
+            "fullBins": self._full_bins,
+            "fillTotal": self._fill_total,
+            "pendingAlerts": self._active_alerts,
+            "pendingComplaints": complaint_counts.get("pending", 0),
+            "inProgressComplaints": complaint_counts.get("in_progress", 0),
+            "resolvedComplaints": complaint_counts.get("resolved", 0),
+            "totalComplaints": sum(complaint_counts.values()),
+            "activeWorkers": len(self._workers),
+            "totalTasks": sum(task_counts.values()),
+            "pendingTasks": task_counts.get("pending", 0),
+            "inProgressTasks": task_counts.get("in_progress", 0),
+            "completedTasks": task_counts.get("completed", 0),
+            "recentComplaints": self.recent_complaints(),
+            "recentTasks": self.recent_tasks(),
+            "workerStats": worker_stats,
+            "areaComplaints": dict(self._area_complaints),
+        }
+
+    def recent_complaints(self) -> list:
+        return list(self._recent_complaints)
+
+    def recent_tasks(self) -> list:
+        return list(self._recent_tasks)
+
+    def recompute_stats(self) -> dict:
+        """Recompute ``stats_summary()`` from scratch with full scans."""
+        bins, complaints, tasks = self.bins, self.complaints, self.tasks
+        workers = [u for u in self.users if u["role"] == "worker"]
+        area_complaints = {}
+        for c in complaints:
+            area_complaints[c["location"]] = area_complaints.get(c["location"], 0) + 1
+        worker_stats = []
+        for w in workers:
+            w_tasks = [t for t in tasks if t["workerId"] == w["id"]]
+            worker_stats.append({
+                "id": w["id"],
+                "name": w["name"],
+                "totalTasks": len(w_tasks),
+                "completedTasks": sum(1 for t in w_tasks if t["status"] == "completed"),
+                "activeTasks": sum(1 for t in w_tasks if t["status"] in ACTIVE_TASK_STATUSES),
+            })
+        return {
+            "totalBins": len(bins),
+            "fullBins": sum(1 for b in bins if b["status"] in FULL_STATUSES),
+            "fillTotal": sum(b["fillLevel"] for b in bins),
+            "pendingAlerts": sum(1 for a in self.alerts if a["status"] == "active"),
+            "pendingComplaints": sum(1 for c in complaints if c["status"] == "pending"),
+            "inProgressComplaints": sum(1 for c in complaints if c["status"] == "in_progress"),
+            "resolvedComplaints": sum(1 for c in complaints if c["status"] == "resolved"),
+            "totalComplaints": len(complaints),
+            "activeWorkers": len(workers),
+            "totalTasks": len(tasks),
+            "pendingTasks": sum(1 for t in tasks if t["status"] == "pending"),
+            "inProgressTasks": sum(1 for t in tasks if t["status"] == "in_progress"),
+            "completedTasks": sum(1 for t in tasks if t["status"] == "completed"),
+            "recentComplaints": sorted(complaints, key=lambda c: c["createdAt"], reverse=True)[:RECENT_LIMIT],
+            "recentTasks": sorted(tasks, key=lambda t: t["assignedAt"], reverse=True)[:RECENT_LIMIT],
+            "workerStats": worker_stats,
+            "areaComplaints": area_complaints,
+        }
+
+    def verify_aggregates(self) -> list:
+        """Return the names of maintained aggregates that drifted from a full recompute."""
+        maintained = self.stats_summary()
+        expected = self.recompute_stats()
+        return [k for k in expected if maintained[k] != expected[k]]
+
+
+def create_store() -> DataStore:
+    """Build the storage engine selected by ``STORAGE_BACKEND``."""
+    if STORAGE_BACKEND == "sqlite":
+        from .sqlite_store import SQLiteDataStore
+        return SQLiteDataStore(SQLITE_PATH)
+    if STORAGE_BACKEND != "memory":
+        raise ValueError(f"Unknown storage backend: {STORAGE_BACKEND!r}")
+    return DataStore()
 
 
-store = DataStore()
+store = create_store()
@@ -0,0 +1,87 @@
+"""Fill-rate forecasting — exponentially weighted level and rate per bin.
+
+Every reading updates its bin incrementally (no refit over past readings)
+with Holt's linear smoothing adapted to irregular intervals: the smoothed
+level moves toward the reading, and the smoothed rate toward the level's
+change since the previous reading. A weight of ``1 - 0.5 ** (dt / half_life)``
+means a reading after a long gap counts for more than one a few seconds
+later, and smoothing the level as well keeps sensor noise from turning
+into rate noise. A drop of more than ``EMPTIED_DROP`` points means the bin
+was emptied; it restarts the level and keeps the learned rate. The rate
+average is bias-corrected (divided by the total weight so far), so the
+first few readings give a usable estimate instead of one biased to zero.
+
+State is four float columns aligned with ``BinState`` rows and lives in
+memory only; after a restart rates are re-learned from new readings.
+"""
+
+import numpy as np
+
+from .config import FORECAST_LEVEL_HALF_LIFE_HOURS, FORECAST_RATE_HALF_LIFE_HOURS
+
+FULL_LEVEL = 100
+EMPTIED_DROP = 15
+
+
+class FillForecaster:
+    """Fill level and rate (percent per hour) per bin row; NaN until known."""
+
+    def __init__(self, n: int, level_half_life_hours: float = FORECAST_LEVEL_HALF_LIFE_HOURS,
+                 rate_half_life_hours: float = FORECAST_RATE_HALF_LIFE_HOURS):
+        self.level_half_life = level_half_life_hours * 3600
+        self.rate_half_life = rate_half_life_hours * 3600
+        self.level = np.full(n, np.nan)
+        self.last_time = np.full(n, np.nan)  # epoch seconds
+        # Rate = trend / weight: dividing by the total weight so far keeps the
+        # first few samples from being pulled toward zero (bias correction)
+        self._trend = np.zeros(n)
+        self._weight = np.zeros(n)
+
+    @property
+    def rate(self) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self._trend / self._weight
+
+    def observe(self, rows: np.ndarray, fill: np.ndarray, at):
+        """Fold in one reading per row (rows must be unique); ``at`` is epoch seconds."""
+        rows = np.asarray(rows, dtype=np.int64)
+        fill = np.asarray(fill, dtype=float)
+        at = np.broadcast_to(np.asarray(at, dtype=float), rows.shape)
+        level, trend, weight = self.level[rows], self._trend[rows], self._weight[rows]
+        dt = at - self.last_time[rows]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # NaN comparisons are False: a first reading only sets the level
+            newer = ~(dt <= 0)
+            ahead = dt > 0
+            rate = np.where(weight > 0, trend / weight, 0.0)
+            expected = level + rate * dt / 3600
+            emptied = ahead & (fill < expected - EMPTIED_DROP)
+            alpha = np.where(weight > 0, 1 - 0.5 ** (dt / self.level_half_life), 1.0)
+            beta = 1 - 0.5 ** (dt / self.rate_half_life)
+            smoothed = expected + alpha * (fill - expected)
+            sample = (smoothed - level) / dt * 3600
+        learning = ahead & ~emptied
+        r = rows[learning]
+        self._trend[r] = trend[learning] + beta[learning] * (sample[learning] - trend[learning])
+        self._weight[r] = weight[learning] + beta[learning] * (1 - weight[learning])
+        self.level[rows[newer]] = np.where(learning, smoothed, fill)[newer]
+        self.last_time[rows[newer]] = at[newer]
+
+    def hours_until(self, fill: np.ndarray, level: float, now: float) -> np.ndarray:
+        """Hours from ``now`` (epoch seconds) until each bin reaches ``level``.
+
+        0 when already there, inf when not filling, NaN when the rate is unknown.
+        """
+        current = np.where(np.isnan(self.level), fill, self.level)
+        remaining = level - current
+        with np.errstate(divide="ignore", invalid="ignore"):
+            hours = np.where(self.rate > 0, remaining / self.rate, np.inf)
+        hours = np.maximum(hours - (now - self.last_time) / 3600, 0)
+        hours[np.isnan(self.rate)] = np.nan
+        hours[(remaining <= 0) | (np.asarray(fill) >= level)] = 0.0
+        return hours
+
+    def predict(self, at: float) -> np.ndarray:
+        """Expected fill level at epoch ``at``, capped at full; NaN when unknown."""
+        elapsed = np.maximum(at - self.last_time, 0) / 3600
+        return np.minimum(self.level + self.rate * elapsed, FULL_LEVEL)
@@ -0,0 +1,185 @@
+"""Fill-level history — per-bin ring buffers with 1m / 1h / 1d rollups.
+
+Every sensor reading goes into four fixed-size tiers at once:
+
+* ``raw`` — the last ``HISTORY_RAW_READINGS`` readings of each bin
+  (uint32 epoch seconds + uint8 fill), a ring per bin.
+* ``1m`` / ``1h`` / ``1d`` — one bucket per bin per minute / hour / day
+  holding the reading count, sum, min and max. Buckets are time-aligned
+  rings shared by all bins: slot ``bucket % slots`` of a tier belongs to
+  the same bucket for every bin, and a tier's head moves with the newest
+  reading, clearing the slots it wraps onto.
+
+Columns are stored slot-major (``[slot, bin row]``), so recording a batch
+is a handful of fancy-indexed writes and an area or city-wide series is a
+sum over contiguous rows. Memory is allocated up front but zero-filled
+pages are only committed once a slot is first written.
+
+Bytes per bin, per day of history kept (fixed for ``raw``)::
+
+    raw   5 B per reading, 64 readings      320 B per bin
+    1m    5 B per bucket x 1440         7,200 B per bin-day
+    1h    8 B per bucket x 24             192 B per bin-day
+    1d    8 B per bucket                    8 B per bin-day
+
+With the default retention (1 day of minutes, 30 of hours, 365 of days)
+that is about 16 KB per bin — 16 MB per thousand bins. Readings count
+towards at most 255 per bin-minute and 65,535 per bin-hour/day; min and
+max always update. History lives in memory only and starts empty after
+a restart. Benchmark: benchmarks/bench_history.py.
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+from .config import (
+    HISTORY_DAY_RETENTION_DAYS,
+    HISTORY_HOUR_RETENTION_DAYS,
+    HISTORY_MINUTE_RETENTION_HOURS,
+    HISTORY_RAW_READINGS,
+)
+
+MAX_POINTS = 500
+# Readings stamped further ahead than this are kept out of the rollups, so
+# one sensor with a wrong clock cannot advance (and wipe) a whole tier
+MAX_CLOCK_SKEW_S = 300
+
+
+class _Tier:
+    """Count / sum / min / max per bin for fixed-width time buckets."""
+
+    def __init__(self, name: str, width_s: int, slots: int, n: int, count_dtype, sum_dtype):
+        self.name = name
+        self.width = width_s
+        self.slots = slots
+        self.count = np.zeros((slots, n), dtype=count_dtype)
+        self.sum = np.zeros((slots, n), dtype=sum_dtype)
+        self.min = np.zeros((slots, n), dtype=np.uint8)
+        self.max = np.zeros((slots, n), dtype=np.uint8)
+        self.max_count = np.iinfo(count_dtype).max
+        self.head = None  # newest bucket number written
+
+    @property
+    def nbytes(self) -> int:
+        return self.count.nbytes + self.sum.nbytes + self.min.nbytes + self.max.nbytes
+
+    def oldest(self) -> int | None:
+        """First bucket still retained."""
+        return None if self.head is None else self.head - self.slots + 1
+
+    def _advance(self, bucket: int):
+        if self.head is not None and bucket <= self.head:
+            return
+        if self.head is None or bucket - self.head >= self.slots:
+            self.count[:] = 0
+        else:
+            stale = np.arange(self.head + 1, bucket + 1) % self.slots
+            self.count[stale] = 0
+        self.head = bucket
+
+    def record(self, rows: np.ndarray, fill: np.ndarray, at: np.ndarray):
+        bucket = (at // self.width).astype(np.int64)
+        self._advance(int(bucket.max()))
+        kept = bucket > self.head - self.slots
+        rows, fill, slot = rows[kept], fill[kept], bucket[kept] % self.slots
+        count = self.count[slot, rows]
+        first = count == 0
+        self.min[slot, rows] = np.where(first, fill, np.minimum(self.min[slot, rows], fill))
+        self.max[slot, rows] = np.where(first, fill, np.maximum(self.max[slot, rows], fill))
+        room = count < self.max_count
+        slot, rows, fill = slot[room], rows[room], fill[room]
+        self.sum[slot, rows] = np.where(first[room], 0, self.sum[slot, rows]) + fill
+        self.count[slot, rows] = count[room] + 1
+
+    def series(self, rows, start_bucket: int, end_bucket: int) -> list:
+        """Buckets with data in ``[start, end]``, combined over ``rows`` (a slice or index array)."""
+        if self.head is None:
+            return []
+        start_bucket = max(start_bucket, self.oldest())
+        end_bucket = min(end_bucket, self.head)
+        if start_bucket > end_bucket:
+            return []
+        buckets = np.arange(start_bucket, end_bucket + 1)
+        slot = buckets % self.slots
+        index = (slot, rows) if isinstance(rows, slice) else np.ix_(slot, rows)
+        count = self.count[index].astype(np.int64)
+        has = count > 0
+        total = count.sum(axis=1)
+        sums = np.where(has, self.sum[index], 0).sum(axis=1, dtype=np.float64)
+        lows = np.where(has, self.min[index], 255).min(axis=1)
+        highs = np.where(has, self.max[index], 0).max(axis=1)
+        points = []
+        for k in np.flatnonzero(total).tolist():
+            points.append({
+                "time": datetime.fromtimestamp(int(buckets[k]) * self.width).isoformat(),
+                "avg": round(float(sums[k] / total[k]), 1),
+                "min": int(lows[k]),
+                "max": int(highs[k]),
+                "readings": int(total[k]),
+            })
+        return points
+
+
+class FillHistory:
+    """Raw readings and rollups for every bin row (rows as in ``BinState``)."""
+
+    def __init__(self, n: int, raw_readings: int = HISTORY_RAW_READINGS,
+                 minute_hours: float = HISTORY_MINUTE_RETENTION_HOURS,
+                 hour_days: float = HISTORY_HOUR_RETENTION_DAYS,
+                 day_days: int = HISTORY_DAY_RETENTION_DAYS):
+        self.raw_time = np.zeros((raw_readings, n), dtype=np.uint32)
+        self.raw_fill = np.zeros((raw_readings, n), dtype=np.uint8)
+        self.raw_next = np.zeros(n, dtype=np.int64)  # readings recorded per bin
+        # Finest first; the query planner relies on the order
+        self.tiers = (
+            _Tier("1m", 60, int(minute_hours * 60), n, np.uint8, np.uint16),
+            _Tier("1h", 3600, int(hour_days * 24), n, np.uint16, np.uint32),
+            _Tier("1d", 86400, int(day_days), n, np.uint16, np.uint32),
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return (self.raw_time.nbytes + self.raw_fill.nbytes + self.raw_next.nbytes
+                + sum(t.nbytes for t in self.tiers))
+
+    def record(self, rows, fill, at, now: float):
+        """Add one reading per row (rows must be unique); ``at`` is epoch seconds."""
+        rows = np.asarray(rows, dtype=np.int64)
+        fill = np.asarray(fill).astype(np.uint8)
+        at = np.broadcast_to(np.asarray(at, dtype=float), rows.shape)
+        sane = (at > 0) & (at <= now + MAX_CLOCK_SKEW_S)
+        if not sane.all():
+            rows, fill, at = rows[sane], fill[sane], at[sane]
+        if not len(rows):
+            return
+        slot = self.raw_next[rows] % len(self.raw_time)
+        self.raw_time[slot, rows] = at
+        self.raw_fill[slot, rows] = fill
+        self.raw_next[rows] += 1
+        for tier in self.tiers:
+            tier.record(rows, fill, at)
+
+    def raw(self, row: int, start: float, end: float) -> list:
+        """Raw readings of one bin within ``[start, end]``, oldest first."""
+        times, fills = self.raw_time[:, row], self.raw_fill[:, row]
+        kept = np.flatnonzero((times > 0) & (times >= start) & (times <= end))
+        kept = kept[np.argsort(times[kept], kind="stable")]
+        return [{"time": datetime.fromtimestamp(t).isoformat(), "fillLevel": f}
+                for t, f in zip(times[kept].tolist(), fills[kept].tolist())]
+
+    def pick(self, start: float, end: float, max_points: int = MAX_POINTS) -> str:
+        """Finest rollup that still holds ``start`` and fits the window in ``max_points``."""
+        for tier in self.tiers:
+            oldest = tier.oldest()
+            fits = (end - start) / tier.width < max_points
+            if fits and (oldest is None or start // tier.width >= oldest):
+                return tier.name
+        return self.tiers[-1].name
+
+    def series(self, rows, start: float, end: float, resolution: str) -> list:
+        """Points for ``rows`` (one row, a slice or an index array) at ``resolution``."""
+        tier = next(t for t in self.tiers if t.name == resolution)
+        if isinstance(rows, int):
+            rows = [rows]
+        return tier.series(rows, int(start // tier.width), int(end // tier.width))
@@ -0,0 +1,131 @@
+"""Bulk sensor-reading ingestion — parse, deduplicate and apply in one batch."""
+
+import json
+import time
+from datetime import datetime
+
+import numpy as np
+
+from .data_store import store
+from .alerts import evaluate_alerts
+from .history import MAX_CLOCK_SKEW_S
+
+MAX_READINGS_PER_BATCH = 50_000
+
+
+class ReadingsError(ValueError):
+    """Raised when a readings payload cannot be parsed."""
+
+
+def _epoch(ts, default: float) -> float:
+    if ts is None:
+        return default
+    if isinstance(ts, (int, float)):
+        return float(ts)
+    try:
+        return datetime.fromisoformat(ts).timestamp()
+    except (TypeError, ValueError):
+        raise ReadingsError(f"Invalid timestamp: {ts!r}")
+
+
+def parse_readings(body: bytes, content_type: str = "application/json") -> dict:
+    """Decode a readings payload into column arrays.
+
+    Accepts a JSON array of readings, ``{"readings": [...]}``, or NDJSON (one
+    reading per line) when ``content_type`` is ``application/x-ndjson``. Each
+    reading is ``{"bin_id", "fill_level", "battery"?, "timestamp"?}`` where
+    ``bin_id`` is an integer and ``timestamp`` is epoch seconds or an ISO-8601
+    string (default: now).
+
+    Readings stamped more than ``MAX_CLOCK_SKEW_S`` in the future are dropped
+    and counted in ``future``: a sensor with a wrong clock would otherwise
+    set the bin's last-reading time ahead and every real reading after it
+    would be discarded as stale.
+    """
+    try:
+        if "ndjson" in content_type:
+            rows = [json.loads(line) for line in body.splitlines() if line.strip()]
+        else:
+            rows = json.loads(body)
+            if isinstance(rows, dict):
+                rows = rows.get("readings")
+    except ValueError as e:
+        raise ReadingsError(f"Malformed payload: {e}")
+    if not isinstance(rows, list):
+        raise ReadingsError("Expected a list of readings")
+    if len(rows) > MAX_READINGS_PER_BATCH:
+        raise ReadingsError(f"At most {MAX_READINGS_PER_BATCH} readings per batch")
+
+    now = time.time()
+    n = len(rows)
+    bin_ids = np.empty(n, dtype=np.int64)
+    fills = np.empty(n, dtype=np.int16)
+    batteries = np.full(n, -1, dtype=np.int16)
+    timestamps = np.empty(n, dtype=np.float64)
+    try:
+        for i, r in enumerate(rows):
+            bin_id = r["bin_id"]
+            if type(bin_id) is not int:
+                raise ReadingsError(f"Invalid reading at index {i}: bin_id must be an integer, got {bin_id!r}")
+            bin_ids[i] = bin_id
+            fills[i] = min(100, max(0, int(r["fill_level"])))
+            if r.get("battery") is not None:
+                batteries[i] = min(100, max(0, int(r["battery"])))
+            timestamps[i] = _epoch(r.get("timestamp"), now)
+    except ReadingsError:
+        raise
+    except (KeyError, TypeError, ValueError, OverflowError) as e:
+        raise ReadingsError(f"Invalid reading at index {i}: {e}")
+    sane = timestamps <= now + MAX_CLOCK_SKEW_S
+    future = n - int(np.count_nonzero(sane))
+    if future:
+        bin_ids, fills, batteries, timestamps = bin_ids[sane], fills[sane], batteries[sane], timestamps[sane]
+    return {"bin_ids": bin_ids, "fills": fills, "batteries": batteries, "timestamps": timestamps, "future": future}
+
+
+def apply_readings(bin_ids, fills, batteries, timestamps, future: int = 0) -> dict:
+    """Apply a batch of readings under a single bins write lock.
+
+    Only the newest reading per bin is kept, and it is dropped if the bin has
+    already seen a reading at or after that timestamp. Status and alerts are
+    derived exactly as in the simulator. ``future`` is how many readings
+    ``parse_readings`` dropped for being stamped ahead of the clock.
+    """
+    received = len(bin_ids) + future
+    with store.write("bins"):
+        state = store.bin_state
+        index = state.index
+        rows = np.fromiter((index.get(b, -1) for b in bin_ids.tolist()), dtype=np.int64, count=len(bin_ids))
+        known = rows >= 0
+        rows, fills, batteries, timestamps = rows[known], fills[known], batteries[known], timestamps[known]
+
+        # Newest reading per bin within the batch
+        order = np.lexsort((timestamps, rows))
+        rows, fills, batteries, timestamps = rows[order], fills[order], batteries[order], timestamps[order]
+        last_of_bin = np.ones(len(rows), dtype=bool)
+        last_of_bin[:-1] = rows[1:] != rows[:-1]
+        # ...and only if it is newer than what the bin already has
+        fresh = last_of_bin & (timestamps > state.last_reading[rows])
+        rows, fills, batteries, timestamps = rows[fresh], fills[fresh], batteries[fresh], timestamps[fresh]
+
+        state.last_reading[rows] = timestamps
+        new_fill = state.fill.copy()
+        new_fill[rows] = fills
+        changed = store.apply_fill_levels(new_fill, rows, timestamps)
+
+        has_battery = batteries >= 0
+        if has_battery.any():
+            store.apply_battery_levels(rows[has_battery], batteries[has_battery])
+        alerts = evaluate_alerts(changed)
+
+    applied = len(rows)
+    unknown = int(len(known) - np.count_nonzero(known))
+    return {
+        "received": received,
+        "applied": applied,
+        "stale": received - future - unknown - applied,
+        "future": future,
+        "unknownBins": unknown,
+        "alertsRaised": len(alerts["raised"]),
+        "alertsCleared": len(alerts["cleared"]),
+    }
@@ -2,19 +2,59 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from apscheduler.schedulers.background import BackgroundScheduler
+import numpy as np
+from .alerts import archive_resolved_alerts, evaluate_alerts
+from .cluster import Cluster
+from .config import (ALERT_ARCHIVE_INTERVAL_MINUTES, CLUSTER, DATA_DIR, RETENTION_INTERVAL_MINUTES,
+                     SNAPSHOT_INTERVAL_SECONDS, STORAGE_BACKEND)
+from .data_store import store
+from .paging import NEXT_CURSOR_HEADER
+from .persistence import Journal
+from .responses import CompressionMiddleware, FastJSONResponse
+from .retention import archive_closed_records
 from .simulator import simulate_fill_levels
-from .routes import auth_routes, bin_routes, alert_routes, complaint_routes, stats_routes, task_routes
+from .thumbnails import thumbnails
+from .routes import auth_routes, bin_routes, alert_routes, complaint_routes, event_routes, stats_routes, task_routes
 
 scheduler = BackgroundScheduler()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    scheduler.add_job(simulate_fill_levels, "interval", seconds=30)
+    journal = None
+    # The SQLite engine is durable by itself; the journal backs the memory engine
+    if DATA_DIR and STORAGE_BACKEND == "memory":
+        journal = Journal(store, DATA_DIR)
+        recovered = journal.open()
+        print(f"Recovered store from {DATA_DIR} — {recovered['replayedEvents']} journal events "
+              f"replayed in {recovered['seconds'] * 1000:.0f} ms")
+        scheduler.add_job(journal.snapshot, "interval", seconds=SNAPSHOT_INTERVAL_SECONDS)
+    cluster = None
+    if CLUSTER:
+        if STORAGE_BACKEND != "sqlite":
+            raise RuntimeError("CLEANIFY_CLUSTER=1 requires CLEANIFY_STORAGE=sqlite")
+        cluster = Cluster(store)
+        cluster.start()
+        print(f"Cluster worker {cluster.worker_id} joined as {'leader' if cluster.is_leader else 'follower'}")
+    if cluster is None or cluster.is_leader:
+        # Alerts are then evaluated only for bins that change; catch up on the rest once
+        with store.write("bins"):
+            evaluate_alerts(np.arange(len(store.bin_state)))
+    # Jobs that must run once per deployment, not once per worker
+    singleton = cluster.leader_only if cluster else (lambda job: job)
+    scheduler.add_job(singleton(simulate_fill_levels), "interval", seconds=30)
+    scheduler.add_job(singleton(archive_resolved_alerts), "interval", minutes=ALERT_ARCHIVE_INTERVAL_MINUTES)
+    scheduler.add_job(singleton(archive_closed_records), "interval", minutes=RETENTION_INTERVAL_MINUTES)
     scheduler.start()
     print("Cleanify API started — simulator running every 30s")
     yield
     scheduler.shutdown()
+    thumbnails.shutdown()
+    if journal:
+        journal.close()
+    if cluster:
+        cluster.stop()
+    store.close()
     print("Cleanify API shutting down")
 
 
@@ -23,6 +63,7 @@ app = FastAPI(
     description="Smart City Waste Management System — Team Codecops",
     version="1.0.1",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 app.add_middleware(
@@ -31,7 +72,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
+app.add_middleware(CompressionMiddleware)
 
 app.include_router(auth_routes.router, prefix="/api/auth", tags=["Auth"])
 app.include_router(bin_routes.router, prefix="/api/bins", tags=["Bins"])
@@ -39,6 +82,7 @@ app.include_router(alert_routes.router, prefix="/api/alerts", tags=["Alerts"])
 app.include_router(complaint_routes.router, prefix="/api/complaints", tags=["Complaints"])
 app.include_router(stats_routes.router, prefix="/api/stats", tags=["Stats"])
 app.include_router(task_routes.router, prefix="/api/tasks", tags=["Tasks"])
+app.include_router(event_routes.router, prefix="/api/events", tags=["Events"])
 
 
 @app.get("/")
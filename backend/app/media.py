@@ -0,0 +1,196 @@
+"""Media serving — strong ETags, conditional GETs, byte ranges and caching.
+
+Uploaded files never change once written (new content gets a new
+``<sha256>.<ext>`` name, see app/uploads.py), so responses are marked
+``immutable`` and per-file metadata is cached instead of re-stat'ing the
+disk on every request.
+"""
+
+import hashlib
+import os
+import re
+import stat
+import threading
+from collections import OrderedDict
+from mimetypes import guess_type
+
+import anyio
+from fastapi import HTTPException, Request
+from fastapi.responses import FileResponse, Response
+
+from .config import MEDIA_CACHE_SIZE, UPLOAD_CHUNK_BYTES
+from .thumbnails import SIZES, is_image, thumbnails, variant_name
+from .uploads import UPLOAD_DIR
+
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_SHA256_NAME = re.compile(r"[0-9a-f]{64}")
+_RANGE = re.compile(r"bytes=(\d*)-(\d*)")
+
+
+class MediaInfo:
+    __slots__ = ("path", "size", "etag", "media_type", "stat_result")
+
+    def __init__(self, path: str, stat_result: os.stat_result, etag: str):
+        self.path = path
+        self.size = stat_result.st_size
+        self.etag = etag
+        self.media_type = guess_type(path)[0] or "application/octet-stream"
+        self.stat_result = stat_result
+
+
+class StatCache:
+    """LRU of ``MediaInfo`` by filename — files are immutable, so entries never go stale."""
+
+    def __init__(self, directory: str, size: int = MEDIA_CACHE_SIZE):
+        self.directory = directory
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, filename: str) -> MediaInfo | None:
+        """Metadata for ``filename`` in the directory, or None if it is not a served file."""
+        with self._lock:
+            info = self._entries.get(filename)
+            if info is not None:
+                self._entries.move_to_end(filename)
+                return info
+        if filename.startswith(".") or "/" in filename or "\\" in filename:
+            return None  # temp files and anything outside the directory
+        path = os.path.join(self.directory, filename)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None  # misses are not cached — the file may be uploaded later
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        info = MediaInfo(path, st, f'"{_content_hash(filename, path)}"')
+        with self._lock:
+            self._entries[filename] = info
+            if len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return info
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def _content_hash(filename: str, path: str) -> str:
+    # "<sha256>.<ext>" originals and their "<sha256>.<size>.webp" variants
+    stem = filename.rsplit(".", 1)[0]
+    if _SHA256_NAME.fullmatch(stem.split(".", 1)[0]):
+        return stem
+    # Files stored before content addressing: hash once, then cached
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(UPLOAD_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+stat_cache = StatCache(UPLOAD_DIR)
+
+
+class MediaFileResponse(FileResponse):
+    """``FileResponse`` with larger reads that can also send one byte range."""
+
+    chunk_size = 256 * 1024
+
+    def __init__(self, info: MediaInfo, headers: dict, start: int = 0, end: int | None = None):
+        self.start = start
+        self.end = info.size - 1 if end is None else end
+        status_code = 200
+        if end is not None:
+            status_code = 206
+            headers = {**headers, "Content-Range": f"bytes {start}-{end}/{info.size}"}
+        headers["Content-Length"] = str(self.end - self.start + 1)
+        super().__init__(info.path, status_code=status_code, headers=headers,
+                         media_type=info.media_type, stat_result=info.stat_result)
+
+    async def __call__(self, scope, receive, send):
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        remaining = self.end - self.start + 1
+        if scope["method"].upper() == "HEAD" or remaining <= 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            if self.start:
+                await file.seek(self.start)
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break  # file shorter than its cached size; never expected
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # Weak comparison, as If-None-Match requires
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def _byte_range(header: str, size: int):
+    """``(start, end)`` for a single-range header; None to send the whole file.
+
+    Raises 416 when the range lies entirely past the end of the file.
+    """
+    m = _RANGE.fullmatch(header.strip())
+    if not m or not (m.group(1) or m.group(2)):
+        return None  # multiple or malformed ranges: ignore, as RFC 9110 allows
+    first, last = m.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if start > end:
+            if start < size:
+                return None  # last < first: invalid, ignore
+            raise HTTPException(416, "Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    else:
+        suffix = int(last)
+        if suffix == 0:
+            raise HTTPException(416, "Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+        start, end = max(0, size - suffix), size - 1
+    return start, end
+
+
+def serve_media(request: Request, filename: str, size: str | None = None) -> Response:
+    """Send an uploaded file, honouring ``If-None-Match``, ``Range`` and ``If-Range``.
+
+    ``size`` picks a WebP variant (see app/thumbnails.py). Until it has been
+    rendered the original is sent, marked for revalidation so browsers do
+    not keep it under the variant URL.
+    """
+    cache_control = CACHE_CONTROL
+    info = None
+    if size is not None:
+        if size not in SIZES:
+            raise HTTPException(400, f"size must be one of: {', '.join(SIZES)}")
+        if is_image(filename):
+            info = stat_cache.get(variant_name(filename, size))
+        if info is None:
+            cache_control = "no-cache"
+            if stat_cache.get(filename) is not None:
+                thumbnails.submit(filename)
+    if info is None:
+        info = stat_cache.get(filename)
+    if info is None:
+        raise HTTPException(404, "File not found")
+    headers = {"ETag": info.etag, "Cache-Control": cache_control, "Accept-Ranges": "bytes"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, info.etag):
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("range")
+    if range_header and info.size:
+        if_range = request.headers.get("if-range")
+        if if_range is None or if_range.strip() == info.etag:
+            byte_range = _byte_range(range_header, info.size)
+            if byte_range:
+                return MediaFileResponse(info, headers, *byte_range)
+    return MediaFileResponse(info, headers)
@@ -0,0 +1,141 @@
+"""Keyset pagination — pre-sorted indexes, opaque cursors & field projection."""
+
+import base64
+import json
+from bisect import bisect_left, bisect_right, insort
+from fastapi import HTTPException, Response
+
+_MAX_ID = float("inf")
+
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class CursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+class SortedIndex:
+    """Records kept ordered by ``(record[key_field], record["id"])``.
+
+    Inserts of increasing keys (the common case for timestamps) append at the
+    end; scans start from a bisected position, so a page costs O(log n + page).
+    """
+
+    def __init__(self, key_field: str):
+        self.key_field = key_field
+        self._keys = []
+        self._records = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def key_of(self, record: dict) -> tuple:
+        return (record[self.key_field], record["id"])
+
+    def add(self, record: dict):
+        insort(self._keys, self.key_of(record))
+        self._records[record["id"]] = record
+
+    def remove(self, record: dict):
+        key = self.key_of(record)
+        i = bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            del self._keys[i]
+            self._records.pop(record["id"], None)
+
+    def scan(self, after: tuple | None = None, lo=None, hi=None, descending: bool = True):
+        """Yield ``(key, record)`` strictly past ``after`` within ``[lo, hi]``."""
+        keys = self._keys
+        start = bisect_left(keys, (lo,)) if lo is not None else 0
+        stop = bisect_right(keys, (hi, _MAX_ID)) if hi is not None else len(keys)
+        if descending:
+            if after is not None:
+                stop = min(stop, bisect_left(keys, after))
+            for i in range(stop - 1, start - 1, -1):
+                yield keys[i], self._records[keys[i][1]]
+        else:
+            if after is not None:
+                start = max(start, bisect_right(keys, after))
+            for i in range(start, stop):
+                yield keys[i], self._records[keys[i][1]]
+
+
+def encode_cursor(key: tuple) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key = json.loads(raw)
+        if not isinstance(key, list) or len(key) != 2:
+            raise ValueError("wrong shape")
+        return tuple(key)
+    except ValueError as e:
+        raise CursorError(f"Invalid cursor: {e}")
+
+
+def paginate(index: SortedIndex, limit: int | None = None, cursor: str | None = None,
+             lo=None, hi=None, predicate=None, descending: bool = True) -> tuple:
+    """Return ``(records, next_cursor)`` for one page of ``index``.
+
+    ``limit=None`` returns every matching record; ``next_cursor`` is None on
+    the last page.
+    """
+    after = decode_cursor(cursor) if cursor else None
+    items = []
+    last_key = None
+    try:
+        for key, record in index.scan(after, lo, hi, descending):
+            if predicate is not None and not predicate(record):
+                continue
+            if limit is not None and len(items) == limit:
+                return items, encode_cursor(last_key)
+            items.append(record)
+            last_key = key
+    except TypeError:
+        # Cursor key of the wrong type for this index
+        raise CursorError("Invalid cursor: does not match this listing")
+    return items, None
+
+
+def parse_fields(fields: str | None) -> list | None:
+    if not fields:
+        return None
+    return [f.strip() for f in fields.split(",") if f.strip()]
+
+
+def project(records: list, fields: list | None) -> list:
+    """Keep only ``fields`` of each record (all of them when None)."""
+    if fields is None:
+        return records
+    return [{f: r[f] for f in fields if f in r} for r in records]
+
+
+def page_or_400(response: Response, index: SortedIndex, **kwargs) -> list:
+    """``paginate`` for route handlers — sets the next-cursor header, 400 on a bad cursor."""
+    try:
+        items, next_cursor = paginate(index, **kwargs)
+    except CursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
+
+
+def all_of(*predicates):
+    """Combine the non-None predicates; None when there are none."""
+    active = [p for p in predicates if p is not None]
+    if not active:
+        return None
+    if len(active) == 1:
+        return active[0]
+    return lambda r: all(p(r) for p in active)
+
+
+def field_equals(field: str, value):
+    """Predicate ``record[field] == value``, or None when ``value`` is None."""
+    if value is None:
+        return None
+    return lambda r: r.get(field) == value
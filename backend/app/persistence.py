@@ -0,0 +1,206 @@
+"""Durable persistence — journal of change-feed events + snapshots.
+
+Layout of the data directory:
+
+    snapshot.json.gz    last compacted ``DataStore.dump_state()`` + its feed seq
+    wal-<seq>.log       JSON-lines journal segments; ``<seq>`` is the snapshot
+                        seq the segment was started after
+
+Every event published on ``store.changes`` is written to the current
+segment as it happens, and a background thread fsyncs the segment at most
+every ``WAL_FSYNC_INTERVAL_MS`` (group commit — a power loss can drop at
+most that window). Recovery loads the snapshot and replays every journaled
+event with a higher seq.
+
+The journal is write-behind, not write-ahead: an event is the record of a
+mutation the store has already made, so it is appended right after it,
+still under the writer's locks and before the request returns. A crash
+between the two loses only a change that no request was answered for and
+that no client could have seen, since both go down with the process. A crash in
+the middle of an append leaves a torn last line; recovery cuts the segment
+back to its last complete line so later appends are not stranded behind it.
+"""
+
+import glob
+import gzip
+import json
+import os
+import threading
+import time
+
+from .config import WAL_FSYNC_INTERVAL_MS
+from .data_store import LOCK_ORDER
+
+SNAPSHOT_FILE = "snapshot.json.gz"
+
+
+class Journal:
+    """Event journal + snapshot manager for a ``DataStore``."""
+
+    def __init__(self, store, data_dir: str, fsync_interval_ms: int = WAL_FSYNC_INTERVAL_MS):
+        self.store = store
+        self.data_dir = data_dir
+        self.fsync_interval = fsync_interval_ms / 1000
+        self._lock = threading.Lock()
+        self._wal = None
+        self._dirty = False
+        self._closed = threading.Event()
+        self._flusher = None
+        os.makedirs(data_dir, exist_ok=True)
+
+    # ── Lifecycle ──
+
+    def open(self) -> dict:
+        """Recover the store from disk, then start journaling new events.
+
+        An empty directory keeps the store's current (seeded) state and
+        writes it as the first snapshot. Returns recovery statistics.
+        """
+        stats = self.recover()
+        self.store.changes.add_listener(self._append)
+        if stats["snapshotSeq"] is None:
+            self.snapshot()
+        elif self._wal is None:
+            self._open_segment(self.store.changes.seq)
+        self._flusher = threading.Thread(target=self._flush_loop, name="wal-fsync", daemon=True)
+        self._flusher.start()
+        return stats
+
+    def close(self, snapshot: bool = True):
+        """Stop journaling, by default after taking a final snapshot."""
+        if snapshot:
+            self.snapshot()
+        self.store.changes.remove_listener(self._append)
+        self._closed.set()
+        if self._flusher:
+            self._flusher.join()
+        with self._lock:
+            if self._wal:
+                self._sync()
+                self._wal.close()
+                self._wal = None
+
+    # ── Write path ──
+
+    def _append(self, event: dict):
+        # Called by ChangeFeed.publish under the feed lock, in seq order
+        line = json.dumps({
+            "seq": event["seq"],
+            "type": event["type"],
+            "data": event["data"],
+            "userId": event["userId"],
+        }, separators=(",", ":"))
+        with self._lock:
+            self._wal.write(line + "\n")
+            self._wal.flush()
+            self._dirty = True
+
+    def _sync(self):
+        if self._dirty:
+            os.fsync(self._wal.fileno())
+            self._dirty = False
+
+    def _flush_loop(self):
+        while not self._closed.wait(self.fsync_interval):
+            with self._lock:
+                if not (self._wal and self._dirty):
+                    continue
+                # fsync a duplicate fd outside the lock so appends never wait on the disk
+                fd = os.dup(self._wal.fileno())
+                self._dirty = False
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def _open_segment(self, after_seq: int):
+        path = os.path.join(self.data_dir, f"wal-{after_seq:012d}.log")
+        with self._lock:
+            if self._wal:
+                self._sync()
+                self._wal.close()
+            self._wal = open(path, "a", encoding="utf-8")
+
+    # ── Snapshots ──
+
+    def snapshot(self) -> int:
+        """Write a compact snapshot and drop the journal segments it covers.
+
+        Writers are blocked only while the state is serialized; compression
+        and fsync happen after the locks are released. Returns the snapshot seq.
+        """
+        with self.store.read(*LOCK_ORDER):
+            seq = self.store.changes.seq
+            payload = json.dumps({"seq": seq, "state": self.store.dump_state()}, separators=(",", ":"))
+            # New events from here on go to a fresh segment
+            self._open_segment(seq)
+
+        path = os.path.join(self.data_dir, SNAPSHOT_FILE)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(gzip.compress(payload.encode(), compresslevel=3))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+        current = os.path.join(self.data_dir, f"wal-{seq:012d}.log")
+        for segment in self._segments():
+            if segment != current and _segment_seq(segment) < seq:
+                os.remove(segment)
+        return seq
+
+    # ── Recovery ──
+
+    def _segments(self) -> list:
+        return sorted(glob.glob(os.path.join(self.data_dir, "wal-*.log")), key=_segment_seq)
+
+    def recover(self) -> dict:
+        """Load the snapshot and replay the journal tail into the store."""
+        started = time.perf_counter()
+        path = os.path.join(self.data_dir, SNAPSHOT_FILE)
+        snapshot_seq = None
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                snap = json.loads(gzip.decompress(f.read()))
+            snapshot_seq = snap["seq"]
+
+        events = []
+        last_seq = snapshot_seq or 0
+        truncated = 0
+        for segment in self._segments():
+            with open(segment, "rb+") as f:
+                end = 0
+                for line in f:
+                    try:
+                        # A line without its newline was cut short even if it parses
+                        e = json.loads(line) if line.endswith(b"\n") else None
+                    except ValueError:
+                        e = None
+                    if e is None:
+                        # Torn write at the tail of a crashed segment: drop it, so
+                        # the next append starts on a line of its own
+                        f.truncate(end)
+                        truncated += 1
+                        break
+                    end += len(line)
+                    if e["seq"] > last_seq:
+                        events.append(e)
+                        last_seq = e["seq"]
+
+        if snapshot_seq is not None or events:
+            with self.store.write(*LOCK_ORDER):
+                if snapshot_seq is not None:
+                    self.store.load_state(snap["state"], reindex=False)
+                self.store.replay(events)
+                self.store.changes.reset(last_seq)
+        return {
+            "snapshotSeq": snapshot_seq,
+            "replayedEvents": len(events),
+            "lastSeq": last_seq,
+            "truncatedSegments": truncated,
+            "seconds": time.perf_counter() - started,
+        }
+
+
+def _segment_seq(path: str) -> int:
+    return int(os.path.basename(path)[len("wal-"):-len(".log")])
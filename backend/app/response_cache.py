@@ -0,0 +1,94 @@
+"""Versioned response cache — pre-serialized JSON for hot GET endpoints.
+
+Dashboards poll ``/api/stats/``, ``/api/bins/`` and ``/api/alerts/`` every
+few seconds and get identical bodies between mutations. A handler wraps its
+body in ``cached_json``: the encoded bytes (and any paging headers) are kept
+under the request path and query, along with the ``DataStore.version`` of
+each collection the body was built from. Until one of those versions moves,
+polls skip both building and serializing the body, and a client whose
+``If-None-Match`` matches gets a bodiless 304.
+
+The ETag is a hash of the body, not of the versions, so it stays valid
+across restarts and across workers (app/cluster.py) that built the same
+bytes independently.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+from fastapi import Request, Response
+
+from .config import RESPONSE_CACHE_MAX_BYTES
+from .data_store import store
+from .responses import dumps
+
+
+class ResponseCache:
+    """LRU of ``key -> (versions, etag, body, headers)`` bounded by total body bytes."""
+
+    def __init__(self, max_bytes: int = RESPONSE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple, versions: tuple):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != versions:
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: tuple, entry: tuple):
+        size = len(entry[2])
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[2])
+            self._entries[key] = entry
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted[2])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+response_cache = ResponseCache()
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+def cached_json(request: Request, response: Response, collections: tuple, build, vary=None) -> Response:
+    """Serve ``build()`` as JSON, reusing the bytes while ``collections`` are unchanged.
+
+    Call it under the read locks that guard ``collections``. ``build`` may
+    set headers on ``response`` (e.g. ``X-Next-Cursor``); they are cached
+    with the body. ``vary`` is anything else the body depends on — the
+    caller's role or id for per-user bodies, the date for day-bucketed ones.
+    """
+    key = (request.url.path, str(request.query_params), vary)
+    versions = store.version(*collections)
+    entry = response_cache.get(key, versions)
+    if entry is None:
+        body = dumps(build())
+        etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+        entry = (versions, etag, body, dict(response.headers))
+        response_cache.put(key, entry)
+    _, etag, body, headers = entry
+    headers = {**headers, "ETag": etag, "Cache-Control": "private, no-cache"}
+    if _matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
@@ -0,0 +1,189 @@
+"""Response encoding — orjson rendering and compression of large JSON bodies.
+
+* ``FastJSONResponse`` is the app's default response class: bodies are
+  encoded by orjson, and only values orjson cannot encode itself (e.g.
+  Pydantic models) go through ``jsonable_encoder``.
+* ``FastJSONRoute`` (the route class of every router) renders a handler's
+  plain dict/list result right away, so FastAPI does not first walk the
+  whole payload with ``jsonable_encoder``. Headers and status set on an
+  injected ``Response`` are kept, as FastAPI would. Routes with a
+  ``response_model`` keep FastAPI's validating path.
+* ``CompressionMiddleware`` compresses complete JSON bodies of at least
+  ``RESPONSE_COMPRESS_MIN_BYTES`` with brotli (when the optional ``brotli``
+  package is installed) or gzip, whichever the client accepts. Streams
+  (SSE) and media files pass through untouched, their headers sent as soon
+  as the app starts the response. The compressed bytes of a response with
+  an ETag (app/response_cache.py) are memoized, so a cached body is
+  compressed once, not on every poll.
+"""
+
+import asyncio
+import functools
+import gzip
+import inspect
+import threading
+from collections import OrderedDict
+
+import orjson
+from fastapi.concurrency import run_in_threadpool
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+from fastapi.routing import APIRoute
+from starlette.datastructures import Headers, MutableHeaders
+
+from .config import RESPONSE_COMPRESS_MIN_BYTES
+
+try:
+    import brotli
+except ImportError:  # optional; gzip only without it
+    brotli = None
+
+JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # brotli's default (11) is far too slow for per-request use
+COMPRESSED_CACHE_SIZE = 32
+
+
+def dumps(content) -> bytes:
+    return orjson.dumps(content, default=jsonable_encoder, option=JSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """``JSONResponse`` rendered with orjson."""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def _render_directly(endpoint, status_code: int | None):
+    """Wrap ``endpoint`` so that a plain result leaves it as a ``FastJSONResponse``."""
+    signature = inspect.signature(endpoint)
+    params = list(signature.parameters.values())
+    declared = next((p.name for p in params if p.annotation is Response), None)
+    name = declared or "_sub_response"
+    if declared is None:
+        # Ask FastAPI for the response it would have merged headers from
+        params.append(inspect.Parameter(name, inspect.Parameter.KEYWORD_ONLY, annotation=Response))
+
+    def render(result, response: Response):
+        if isinstance(result, Response):
+            return result
+        rendered = FastJSONResponse(result, status_code=response.status_code or status_code or 200)
+        rendered.raw_headers.extend(response.headers.raw)
+        return rendered
+
+    if asyncio.iscoroutinefunction(endpoint):
+        async def wrapper(**kwargs):
+            response = kwargs[name] if declared else kwargs.pop(name)
+            return render(await endpoint(**kwargs), response)
+    else:
+        def wrapper(**kwargs):
+            response = kwargs[name] if declared else kwargs.pop(name)
+            return render(endpoint(**kwargs), response)
+
+    functools.update_wrapper(wrapper, endpoint)
+    wrapper.__signature__ = signature.replace(parameters=params)
+    wrapper.renders_directly = True
+    return wrapper
+
+
+class FastJSONRoute(APIRoute):
+    """``APIRoute`` that skips ``jsonable_encoder`` for handlers without a response model."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        response_model = kwargs.get("response_model")
+        # include_router re-creates routes from the already wrapped endpoint
+        if ((response_model is None or isinstance(response_model, DefaultPlaceholder))
+                and not getattr(endpoint, "renders_directly", False)):
+            endpoint = _render_directly(endpoint, kwargs.get("status_code"))
+        super().__init__(path, endpoint, **kwargs)
+
+
+def _accepted_encoding(headers: Headers) -> str | None:
+    accepted = set()
+    for token in headers.get("accept-encoding", "").split(","):
+        coding, _, params = token.strip().partition(";")
+        if params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(coding.strip().lower())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing large, complete ``application/json`` bodies."""
+
+    def __init__(self, app, minimum_size: int = RESPONSE_COMPRESS_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+        # (etag, encoding) -> compressed body
+        self._compressed = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def __call__(self, scope, receive, send):
+        encoding = _accepted_encoding(Headers(scope=scope)) if scope["type"] == "http" else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        start = None
+
+        async def send_compressed(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if (headers.get("content-type", "").startswith("application/json")
+                        and "content-encoding" not in headers):
+                    # Held back until the first body chunk shows whether it is complete
+                    start = message
+                    return
+                # Anything else (SSE, media) starts right away: a stream may
+                # not send its first chunk for a while
+            if start is None:
+                await send(message)
+                return
+            held, start = start, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=held["headers"])
+            if not message.get("more_body") and len(body) >= self.minimum_size:
+                etag = headers.get("etag")
+                body = await self._compress(body, encoding, etag)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+                if etag and not etag.startswith("W/"):
+                    # Same content, different bytes: only weakly equal
+                    headers["ETag"] = f"W/{etag}"
+                message = {**message, "body": body}
+            await send(held)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+    async def _compress(self, body: bytes, encoding: str, etag: str | None) -> bytes:
+        key = (etag, encoding)
+        if etag:
+            with self._lock:
+                compressed = self._compressed.get(key)
+                if compressed is not None:
+                    self._compressed.move_to_end(key)
+                    return compressed
+        if len(body) >= 64 * 1024:
+            # Large bodies take milliseconds; keep them off the event loop
+            compressed = await run_in_threadpool(self._encode, body, encoding)
+        else:
+            compressed = self._encode(body, encoding)
+        if etag:
+            with self._lock:
+                self._compressed[key] = compressed
+                if len(self._compressed) > COMPRESSED_CACHE_SIZE:
+                    self._compressed.popitem(last=False)
+        return compressed
+
+    @staticmethod
+    def _encode(body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=BROTLI_QUALITY)
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
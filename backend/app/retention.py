@@ -0,0 +1,40 @@
+"""Retention — keeps the hot store bounded by moving closed records to the archive.
+
+Resolved alerts already leave after ``ALERT_ARCHIVE_AFTER_HOURS``
+(app/alerts.py). This job does the same for the other collections that
+only ever grow:
+
+* complaints resolved, and tasks completed and approved, more than
+  ``RECORD_ARCHIVE_AFTER_DAYS`` ago (``DataStore.archive_closed``)
+* reward history beyond each citizen's newest ``REWARD_HISTORY_LIMIT``
+  entries (``DataStore.archive_reward_history``)
+* collection-log entries older than ``RECORD_ARCHIVE_AFTER_DAYS``
+  (``DataStore.archive_collection_events``); their analytics totals are
+  kept as folded day buckets
+
+Archived records stay readable through the ``/archived`` routes, paged
+from app/archive.py segments. Dashboard counters and the recent lists
+cover the records still in the store; resolution and collection KPIs come
+from the collection log's day buckets (app/analytics.py), which cover
+archived entries too.
+"""
+
+from datetime import datetime, timedelta
+
+from .config import RECORD_ARCHIVE_AFTER_DAYS, REWARD_HISTORY_LIMIT
+from .data_store import store
+
+
+def archive_closed_records() -> dict:
+    """Archive closed complaints and tasks, old log entries, and trim reward histories.
+
+    Returns how many of each moved.
+    """
+    before = (datetime.now() - timedelta(days=RECORD_ARCHIVE_AFTER_DAYS)).isoformat()
+    with store.write("tasks", "complaints"):
+        moved = store.archive_closed(before)
+        moved["rewardEntries"] = store.archive_reward_history(REWARD_HISTORY_LIMIT)
+    # Collection events are logged under any of these groups
+    with store.write("tasks", "complaints", "bins"):
+        moved["collectionEvents"] = store.archive_collection_events(before)
+    return moved
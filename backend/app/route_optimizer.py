@@ -0,0 +1,222 @@
+"""Collection route optimizer — capacitated routes from worker start points.
+
+Routes are closed tours: each worker leaves their start point, collects a
+set of bins and returns. Planning has two phases over one precomputed
+distance matrix:
+
+1. Construction — parallel nearest neighbour: the worker whose route is
+   currently shortest takes the closest unvisited bin that still fits in
+   their remaining capacity, which keeps workloads balanced.
+2. Improvement — best-improvement 2-opt (reverse a stretch of the route)
+   and Or-opt (move a run of 1-3 stops elsewhere, possibly reversed).
+   Candidate moves only create edges to one of a stop's ``NEIGHBOURS``
+   nearest stops on the same route, and each move is found by scoring all
+   candidates at once as a NumPy array. Routes take turns so the time
+   budget is shared fairly.
+
+The budget covers the whole call; construction always completes, so a
+plan comes back even when the budget is smaller than it takes. Quality
+vs runtime: benchmarks/bench_routes.py.
+"""
+
+import time
+
+import numpy as np
+
+from .spatial import EARTH_RADIUS_M
+
+NEIGHBOURS = 16
+OR_OPT_SEGMENTS = (1, 2, 3)
+# Ignore "improvements" smaller than float32 rounding noise
+MIN_GAIN_M = 1e-2
+
+
+def distance_matrix(lat: np.ndarray, lng: np.ndarray) -> np.ndarray:
+    """Pairwise great-circle distances in meters (float32, symmetric)."""
+    lat, lng = np.radians(lat), np.radians(lng)
+    unit = np.column_stack([np.cos(lat) * np.cos(lng), np.cos(lat) * np.sin(lng), np.sin(lat)])
+    # Squared chord lengths from one matrix product (float64: nearby points
+    # differ in the 10th digit), then chord -> arc in float32, all in place
+    chord = unit @ unit.T
+    chord *= -2
+    chord += 2
+    np.maximum(chord, 0, out=chord)
+    np.sqrt(chord, out=chord)
+    half = chord.astype(np.float32)
+    half *= 0.5
+    np.minimum(half, 1, out=half)
+    np.arcsin(half, out=half)
+    half *= 2 * EARTH_RADIUS_M
+    return half
+
+
+def tour_length(dist: np.ndarray, tour) -> float:
+    tour = np.asarray(tour)
+    return float(dist[tour, np.roll(tour, -1)].sum(dtype=np.float64))
+
+
+def _nearest_neighbour(dist: np.ndarray, n_starts: int, demand: np.ndarray, capacity: np.ndarray) -> list:
+    """Tours (start node first) built greedily; bins that fit nowhere stay off every tour."""
+    tours = [[w] for w in range(n_starts)]
+    position = list(range(n_starts))
+    remaining = capacity.astype(float)
+    length = np.zeros(n_starts)
+    # Added to a distance row: inf for start points and bins already on a tour
+    taken = np.zeros(len(dist), dtype=np.float32)
+    taken[:n_starts] = np.inf
+    left = len(dist) - n_starts
+    heaviest = demand.max(initial=0)
+    active = set(range(n_starts))
+    while active and left:
+        w = min(active, key=lambda i: length[i])
+        row = dist[position[w]] + taken
+        if remaining[w] < heaviest:
+            row[demand > remaining[w]] = np.inf
+        nxt = int(np.argmin(row))
+        if row[nxt] == np.inf:
+            active.discard(w)
+            continue
+        tours[w].append(nxt)
+        taken[nxt] = np.inf
+        left -= 1
+        remaining[w] -= demand[nxt]
+        length[w] += row[nxt]
+        position[w] = nxt
+    return tours
+
+
+class _Route:
+    """One tour being improved, over its own slice of the distance matrix.
+
+    Stops are local indices into ``nodes``; ``order[0]`` is the start point
+    and never moves, and ``pos`` is the inverse of ``order``.
+    """
+
+    def __init__(self, dist: np.ndarray, nodes: list):
+        self.nodes = np.asarray(nodes)
+        self.d = dist[np.ix_(self.nodes, self.nodes)]
+        m = len(nodes)
+        self.order = np.arange(m)
+        self.pos = np.arange(m)
+        k = min(NEIGHBOURS, m - 1)
+        near = self.d + np.diag(np.full(m, np.inf, dtype=np.float32))
+        self.near = np.argpartition(near, k - 1, axis=1)[:, :k] if k > 0 else np.empty((m, 0), dtype=int)
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def tour(self) -> list:
+        return self.nodes[self.order].tolist()
+
+    def _set_order(self, order: np.ndarray):
+        self.order = order
+        self.pos[order] = np.arange(len(order))
+
+    def two_opt(self) -> bool:
+        """Apply the best candidate 2-opt move; False when none shortens the tour."""
+        m = len(self)
+        if m < 4:
+            return False
+        a = self.order
+        b = np.roll(a, -1)
+        edge = self.d[a, b]
+        # Replace edges (a_i, b_i) and (a_j, b_j) with (a_i, a_j) and (b_i, b_j),
+        # where a_j is near a_i or b_j is near b_i
+        i = np.repeat(np.arange(m)[:, None], 2 * self.near.shape[1], axis=1)
+        j = np.concatenate([self.pos[self.near[a]], (self.pos[self.near[b]] - 1) % m], axis=1)
+        delta = self.d[a[i], a[j]] + self.d[b[i], b[j]] - edge[i] - edge[j]
+        lo, hi = np.minimum(i, j), np.maximum(i, j)
+        delta[(hi - lo < 2) | ((lo == 0) & (hi == m - 1))] = np.inf
+        best = np.unravel_index(np.argmin(delta), delta.shape)
+        if delta[best] > -MIN_GAIN_M:
+            return False
+        lo, hi = lo[best], hi[best]
+        order = a.copy()
+        order[lo + 1:hi + 1] = order[lo + 1:hi + 1][::-1]
+        self._set_order(order)
+        return True
+
+    def or_opt(self) -> bool:
+        """Apply the best candidate Or-opt move; False when none shortens the tour."""
+        m = len(self)
+        a = self.order
+        b = np.roll(a, -1)
+        edge = self.d[a, b]
+        best = (-MIN_GAIN_M, None)
+        for seg in OR_OPT_SEGMENTS:
+            if m < seg + 3:
+                break
+            # Segment order[s:s + seg] for every s that keeps the start point in place
+            s = np.arange(1, m - seg + 1)
+            first, last = a[s], a[s + seg - 1]
+            removal_gain = self.d[a[s - 1], first] + self.d[last, a[(s + seg) % m]] - self.d[a[s - 1], a[(s + seg) % m]]
+            # Re-insert into edge (a_j, b_j) next to a neighbour of either end
+            near = np.concatenate([self.near[first], self.near[last]], axis=1)
+            j = np.concatenate([self.pos[near], (self.pos[near] - 1) % m], axis=1)
+            f, l = first[:, None], last[:, None]
+            forward = self.d[a[j], f] + self.d[l, b[j]] - edge[j]
+            reverse = self.d[a[j], l] + self.d[f, b[j]] - edge[j]
+            delta = np.minimum(forward, reverse) - removal_gain[:, None]
+            # Edges touching the segment are not insertion points
+            delta[(j >= s[:, None] - 1) & (j <= s[:, None] + seg - 1)] = np.inf
+            k = np.unravel_index(np.argmin(delta), delta.shape)
+            if delta[k] < best[0]:
+                best = (delta[k], (int(s[k[0]]), seg, int(j[k]), bool(reverse[k] < forward[k])))
+        if best[1] is None:
+            return False
+        start, seg, j, reversed_ = best[1]
+        segment = a[start:start + seg]
+        if reversed_:
+            segment = segment[::-1]
+        anchor = a[j]
+        rest = np.concatenate([a[:start], a[start + seg:]])
+        at = int(np.flatnonzero(rest == anchor)[0]) + 1
+        self._set_order(np.concatenate([rest[:at], segment, rest[at:]]))
+        return True
+
+
+def optimize_routes(start_lat, start_lng, capacity, bin_lat, bin_lng, demand,
+                    time_budget_s: float) -> dict:
+    """Plan one closed route per start point over the given bins.
+
+    ``capacity`` is per start point and ``demand`` per bin, in the same unit.
+    Returns bin indices per route (in visiting order), the bins that did not
+    fit, route lengths in meters and how the search went.
+    """
+    started = time.perf_counter()
+    deadline = started + time_budget_s
+    n_starts = len(start_lat)
+    dist = distance_matrix(np.concatenate([start_lat, bin_lat]), np.concatenate([start_lng, bin_lng]))
+    node_demand = np.concatenate([np.zeros(n_starts), demand])
+    tours = _nearest_neighbour(dist, n_starts, node_demand, np.asarray(capacity, dtype=float))
+    initial = [tour_length(dist, t) for t in tours]
+
+    routes = [_Route(dist, t) for t in tours]
+    moves = {"twoOpt": 0, "orOpt": 0}
+    improving = [r for r in routes if len(r) >= 3]
+    while improving and time.perf_counter() < deadline:
+        still = []
+        for route in improving:
+            if time.perf_counter() >= deadline:
+                still.append(route)
+                continue
+            if route.two_opt():
+                moves["twoOpt"] += 1
+            elif route.or_opt():
+                moves["orOpt"] += 1
+            else:
+                continue  # local optimum
+            still.append(route)
+        improving = still
+
+    tours = [r.tour() for r in routes]
+    routed = {node for t in tours for node in t[1:]}
+    return {
+        "routes": [[node - n_starts for node in t[1:]] for t in tours],
+        "unassigned": [i for i in range(len(demand)) if i + n_starts not in routed],
+        "lengths": [tour_length(dist, t) for t in tours],
+        "initialLengths": initial,
+        "moves": moves,
+        "converged": not improving,
+        "seconds": time.perf_counter() - started,
+    }
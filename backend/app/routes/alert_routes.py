@@ -1,28 +1,82 @@
 """Alert routes — view and resolve bin overflow alerts."""
 
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from fastapi import APIRouter, Depends, Query, Request, Response
 from ..auth import get_current_user
 from ..data_store import store
+from ..paging import MAX_PAGE_SIZE, all_of, field_equals, page_or_400, parse_fields, project
+from ..response_cache import cached_json
+from ..responses import FastJSONRoute
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 
 @router.get("/")
-def get_alerts(user: dict = Depends(get_current_user)):
-    with store.lock:
-        return sorted(store.alerts, key=lambda a: a["createdAt"], reverse=True)
+def get_alerts(
+    request: Request,
+    response: Response,
+    status_: str | None = Query(None, alias="status"),
+    area: str | None = None,
+    bin_id: int | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: str | None = None,
+    user: dict = Depends(get_current_user),
+):
+    """List alerts newest first; pass ``limit`` to page with the ``X-Next-Cursor`` header.
+
+    Served from the response cache (with ``ETag``) until an alert changes.
+    """
+    def build():
+        items = page_or_400(
+            response, store.alerts_sorted, limit=limit, cursor=cursor,
+            lo=since.isoformat() if since else None,
+            hi=until.isoformat() if until else None,
+            predicate=all_of(
+                field_equals("status", status_), field_equals("area", area), field_equals("binId", bin_id),
+            ),
+        )
+        return project(items, parse_fields(fields))
+
+    with store.read("bins"):
+        return cached_json(request, response, ("alerts",), build)
+
+
+@router.get("/archived")
+def get_archived_alerts(
+    response: Response,
+    area: str | None = None,
+    bin_id: int | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: str | None = None,
+    user: dict = Depends(get_current_user),
+):
+    """Resolved alerts moved to cold storage, newest first, paged like ``GET /``."""
+    # The archive has its own lock; no store lock is needed
+    items = page_or_400(
+        response, store.archive.index("alerts", "createdAt"), limit=limit, cursor=cursor,
+        lo=since.isoformat() if since else None,
+        hi=until.isoformat() if until else None,
+        predicate=all_of(field_equals("area", area), field_equals("binId", bin_id)),
+    )
+    return project(items, parse_fields(fields))
 
 
 @router.post("/{alert_id}/resolve")
 def resolve_alert(alert_id: int, user: dict = Depends(get_current_user)):
-    with store.lock:
-        alert = next((a for a in store.alerts if a["id"] == alert_id), None)
+    with store.write("bins"):
+        alert = store.get_alert(alert_id)
         if not alert:
             return {"error": "Alert not found"}
-        alert["status"] = "resolved"
+        answered = alert if alert["status"] == "active" else None
+        store.resolve_alert(alert)
         # Also collect the bin
-        b = next((b for b in store.bins if b["id"] == alert["binId"]), None)
+        b = store.get_bin(alert["binId"])
         if b:
-            b["fillLevel"] = 0
-            b["status"] = "empty"
+            store.collect_bin(b, user, answered)
         return {"message": "Alert resolved", "alert": alert}
@@ -4,14 +4,15 @@ from fastapi import APIRouter, HTTPException, status
 from ..schemas import LoginRequest, TokenResponse, CitizenRegister
 from ..auth import verify_password, create_access_token
 from ..data_store import store
+from ..responses import FastJSONRoute
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 
 @router.post("/login", response_model=TokenResponse)
 def login(req: LoginRequest):
-    with store.lock:
-        user = next((u for u in store.users if u["email"] == req.email), None)
+    with store.read("users"):
+        user = store.get_user_by_email(req.email)
 
     if not user or not verify_password(req.password, user["password"]):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password")
@@ -27,13 +28,13 @@ def login(req: LoginRequest):
 @router.post("/register")
 def register_citizen(req: CitizenRegister):
     """Register a new citizen account."""
-    with store.lock:
+    with store.write("users", "complaints"):
         # Check if email already exists
-        existing = next((u for u in store.users if u["email"] == req.email), None)
+        existing = store.get_user_by_email(req.email)
         if existing:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
 
-        new_id = max(u["id"] for u in store.users) + 1
+        new_id = store.next_user_id()
         new_user = {
             "id": new_id,
             "name": req.name,
@@ -41,10 +42,10 @@ def register_citizen(req: CitizenRegister):
             "password": req.password,
             "role": "citizen",
         }
-        store.users.append(new_user)
+        store.add_user(new_user)
 
         # Initialize rewards for new citizen
-        store.rewards[new_id] = {"points": 0, "history": []}
+        store.init_rewards(new_id)
 
     token = create_access_token({"sub": new_user["email"]})
     return {
@@ -1,28 +1,216 @@
-"""Bin management routes — list bins & trigger collections."""
+"""Bin management routes — list bins, trigger collections & ingest sensor readings."""
 
-from fastapi import APIRouter, Depends
+import time
+from datetime import datetime
+
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
 from ..auth import get_current_user
+from ..bin_state import ALERT_THRESHOLD
 from ..data_store import store
+from ..forecast import FULL_LEVEL
+from ..history import MAX_POINTS
+from ..ingest import ReadingsError, apply_readings, parse_readings
+from ..paging import MAX_PAGE_SIZE, all_of, field_equals, page_or_400, parse_fields, project
+from ..response_cache import cached_json
+from ..responses import FastJSONRoute
+from ..spatial import MAX_RADIUS_M, with_distance
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 
 @router.get("/")
-def get_bins(user: dict = Depends(get_current_user)):
-    with store.lock:
-        return store.bins.copy()
+def get_bins(
+    request: Request,
+    response: Response,
+    status_: str | None = Query(None, alias="status"),
+    area: str | None = None,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: str | None = None,
+    user: dict = Depends(get_current_user),
+):
+    """List bins by id; pass ``limit`` to page with the ``X-Next-Cursor`` header.
+
+    Served from the response cache (with ``ETag``) until a bin changes.
+    """
+    def build():
+        items = page_or_400(
+            response, store.bins_sorted, limit=limit, cursor=cursor, descending=False,
+            predicate=all_of(field_equals("status", status_), field_equals("area", area)),
+        )
+        return project(items, parse_fields(fields))
+
+    with store.read("bins"):
+        return cached_json(request, response, ("bins",), build)
+
+
+@router.get("/forecast")
+def get_forecast(
+    area: str | None = None,
+    within_hours: float | None = Query(None, ge=0),
+    limit: int | None = Query(None, ge=1),
+    fields: str | None = None,
+    user: dict = Depends(get_current_user),
+):
+    """Predicted time until every bin is full, soonest first.
+
+    ``ratePerHour`` is percent per hour; hours are from now and null when a
+    bin has too few readings or is not filling. ``within_hours`` keeps only
+    bins expected to be full by then.
+    """
+    now = time.time()
+    with store.read("bins"):
+        state, forecast = store.bin_state, store.forecast
+        to_full = forecast.hours_until(state.fill, FULL_LEVEL, now)
+        to_alert = forecast.hours_until(state.fill, ALERT_THRESHOLD, now)
+        rows = np.arange(len(state)) if within_hours is None else np.flatnonzero(to_full <= within_hours)
+        # Soonest first; unknown (NaN) sorts last, ties by id
+        rows = rows[np.lexsort((state.ids[rows], to_full[rows]))].tolist()
+        if area is not None:
+            rows = [i for i in rows if store.bins[i]["area"] == area]
+        items = []
+        for i in rows[:limit]:
+            b = store.bins[i]
+            hours = to_full[i]
+            items.append({
+                "id": b["id"],
+                "location": b["location"],
+                "area": b["area"],
+                "fillLevel": b["fillLevel"],
+                "ratePerHour": None if np.isnan(forecast.rate[i]) else round(float(forecast.rate[i]), 2),
+                "hoursToAlert": round(float(to_alert[i]), 2) if np.isfinite(to_alert[i]) else None,
+                "hoursToFull": round(float(hours), 2) if np.isfinite(hours) else None,
+                "fullAt": datetime.fromtimestamp(now + hours * 3600).isoformat() if np.isfinite(hours) else None,
+            })
+        return project(items, parse_fields(fields))
+
+
+def _history_window(start: datetime | None, end: datetime | None) -> tuple:
+    """Epoch seconds for a history query; the last 24 hours by default."""
+    end_s = end.timestamp() if end else time.time()
+    start_s = start.timestamp() if start else end_s - 86400
+    if start_s > end_s:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    return start_s, end_s
+
+
+@router.get("/history")
+def get_fill_history(
+    area: str | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    resolution: str | None = Query(None, pattern="^(1m|1h|1d)$"),
+    max_points: int = Query(MAX_POINTS, ge=1, le=5000),
+    user: dict = Depends(get_current_user),
+):
+    """Average, min and max fill over time across all bins or one ``area``.
+
+    Without ``resolution`` the finest rollup that still holds ``start`` and
+    has fewer than ``max_points`` buckets in the window is used.
+    """
+    start_s, end_s = _history_window(start, end)
+    with store.read("bins"):
+        history = store.fill_history
+        resolution = resolution or history.pick(start_s, end_s, max_points)
+        rows = slice(None) if area is None else [i for i, b in enumerate(store.bins) if b["area"] == area]
+        points = history.series(rows, start_s, end_s, resolution)
+    return {"area": area, "resolution": resolution, "points": points}
+
+
+@router.get("/{bin_id}/history")
+def get_bin_history(
+    bin_id: int,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    resolution: str | None = Query(None, pattern="^(raw|1m|1h|1d)$"),
+    max_points: int = Query(MAX_POINTS, ge=1, le=5000),
+    user: dict = Depends(get_current_user),
+):
+    """One bin's fill over time; ``resolution=raw`` returns its latest readings as-is."""
+    start_s, end_s = _history_window(start, end)
+    with store.read("bins"):
+        i = store.bin_state.index.get(bin_id)
+        if i is None:
+            raise HTTPException(status_code=404, detail="Bin not found")
+        history = store.fill_history
+        resolution = resolution or history.pick(start_s, end_s, max_points)
+        if resolution == "raw":
+            points = history.raw(i, start_s, end_s)
+        else:
+            points = history.series(i, start_s, end_s, resolution)
+    return {"binId": bin_id, "resolution": resolution, "points": points}
+
+
+@router.get("/nearby")
+def get_nearby_bins(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius: float = Query(1000, gt=0, le=MAX_RADIUS_M),
+    status_: str | None = Query(None, alias="status"),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    fields: str | None = None,
+    user: dict = Depends(get_current_user),
+):
+    """Bins within ``radius`` meters of a point, nearest first, with their ``distance``."""
+    with store.read("bins"):
+        found = store.nearby("bins", lat, lng, radius, limit, predicate=field_equals("status", status_))
+        return project(with_distance(found), parse_fields(fields))
+
+
+@router.get("/nearest")
+def get_nearest_bins(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    k: int = Query(5, ge=1, le=100),
+    fields: str | None = None,
+    user: dict = Depends(get_current_user),
+):
+    """The ``k`` bins closest to a point, nearest first."""
+    with store.read("bins"):
+        return project(with_distance(store.nearest("bins", lat, lng, k)), parse_fields(fields))
+
+
+@router.get("/within")
+def get_bins_within(
+    south: float = Query(..., ge=-90, le=90),
+    west: float = Query(..., ge=-180, le=180),
+    north: float = Query(..., ge=-90, le=90),
+    east: float = Query(..., ge=-180, le=180),
+    status_: str | None = Query(None, alias="status"),
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: str | None = None,
+    user: dict = Depends(get_current_user),
+):
+    """Bins inside a bounding box (for map viewports), by id."""
+    if south > north or west > east:
+        raise HTTPException(status_code=400, detail="Bounding box must have south <= north and west <= east")
+    with store.read("bins"):
+        found = store.within("bins", south, west, north, east, limit, predicate=field_equals("status", status_))
+        return project(found, parse_fields(fields))
+
+
+@router.post("/readings")
+async def ingest_readings(request: Request, user: dict = Depends(get_current_user)):
+    """Bulk-ingest sensor readings (JSON array or NDJSON body)."""
+    if user["role"] != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admin can ingest readings")
+    body = await request.body()
+    try:
+        batch = parse_readings(body, request.headers.get("content-type", "application/json"))
+    except ReadingsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # Applying the batch takes the bins write lock, so keep it off the event loop
+    return await run_in_threadpool(apply_readings, **batch)
 
 
 @router.post("/{bin_id}/collect")
 def collect_bin(bin_id: int, user: dict = Depends(get_current_user)):
-    with store.lock:
-        b = next((b for b in store.bins if b["id"] == bin_id), None)
+    with store.write("bins"):
+        b = store.get_bin(bin_id)
         if not b:
             return {"error": "Bin not found"}
-        b["fillLevel"] = 0
-        b["status"] = "empty"
-        # Resolve related active alerts
-        for a in store.alerts:
-            if a["binId"] == bin_id and a["status"] == "active":
-                a["status"] = "resolved"
+        # Empties the bin and resolves its active alert
+        store.collect_bin(b, user)
         return {"message": f"Bin {bin_id} collected", "bin": b}
@@ -1,105 +1,166 @@
 """Complaint routes — submit, respond, and resolve citizen complaints."""
 
-import os
-import uuid
 import base64
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status, UploadFile, File, Form
 from fastapi.responses import JSONResponse
 from datetime import datetime
 from typing import Optional
 from ..schemas import ComplaintCreate, ComplaintRespond
 from ..auth import get_current_user
 from ..data_store import store
+from ..responses import FastJSONRoute
+from ..paging import MAX_PAGE_SIZE, all_of, field_equals, page_or_400, parse_fields, project
+from ..spatial import MAX_RADIUS_M, with_distance
+from ..media import serve_media
+from ..thumbnails import thumbnails
+from ..uploads import UploadTooLarge, extension, save_upload
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
-UPLOAD_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "uploads")
-os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 
 @router.get("/")
-def get_complaints(user: dict = Depends(get_current_user)):
-    """Admin/worker sees all complaints; citizen sees only their own."""
-    with store.lock:
-        if user["role"] == "citizen":
-            data = [c for c in store.complaints if c["userId"] == user["id"]]
-        else:
-            data = list(store.complaints)
+def get_complaints(
+    response: Response,
+    status_: str | None = Query(None, alias="status"),
+    location: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: str | None = None,
+    user: dict = Depends(get_current_user),
+):
+    """Admin/worker sees all complaints; citizen sees only their own. Newest first."""
+    with store.read("tasks", "complaints"):
+        data = page_or_400(
+            response, store.complaint_index(user["id"] if user["role"] == "citizen" else None),
+            limit=limit, cursor=cursor,
+            lo=since.isoformat() if since else None,
+            hi=until.isoformat() if until else None,
+            predicate=all_of(field_equals("status", status_), field_equals("location", location)),
+        )
+        wanted = parse_fields(fields)
 
         # Enrich with linked task info (completion photos, worker name, approval)
         enriched = []
         for c in data:
             item = dict(c)
-            task = next((t for t in store.tasks if t.get("complaintId") == c["id"]), None)
-            if task:
-                item["linkedTask"] = {
-                    "id": task["id"],
-                    "workerName": task["workerName"],
-                    "status": task["status"],
-                    "approved": task.get("approved"),
-                    "completionPhotos": task.get("completionPhotos", []) if task.get("approved") else [],
-                    "completionNote": task.get("completionNote") if task.get("approved") else None,
-                    "completedAt": task.get("completedAt"),
-                }
-            else:
-                item["linkedTask"] = None
+            if wanted is None or "linkedTask" in wanted:
+                item["linkedTask"] = store.linked_task_view(c["id"])
             enriched.append(item)
 
-        return sorted(enriched, key=lambda c: c["createdAt"], reverse=True)
+        return project(enriched, wanted)
+
+
+@router.get("/archived")
+def get_archived_complaints(
+    response: Response,
+    location: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: str | None = None,
+    user: dict = Depends(get_current_user),
+):
+    """Closed complaints moved to cold storage, newest first; citizens see only their own."""
+    # The archive has its own lock; no store lock is needed
+    items = page_or_400(
+        response, store.archive.index("complaints", "createdAt"), limit=limit, cursor=cursor,
+        lo=since.isoformat() if since else None,
+        hi=until.isoformat() if until else None,
+        predicate=all_of(field_equals("userId", user["id"] if user["role"] == "citizen" else None),
+                         field_equals("location", location)),
+    )
+    return project(items, parse_fields(fields))
+
+
+@router.get("/nearby")
+def get_nearby_complaints(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius: float = Query(1000, gt=0, le=MAX_RADIUS_M),
+    status_: str | None = Query(None, alias="status"),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    fields: str | None = None,
+    user: dict = Depends(get_current_user),
+):
+    """Complaints within ``radius`` meters of a point, nearest first; citizens get only their own."""
+    owner = field_equals("userId", user["id"] if user["role"] == "citizen" else None)
+    with store.read("complaints"):
+        found = store.nearby("complaints", lat, lng, radius, limit,
+                             predicate=all_of(owner, field_equals("status", status_)))
+        return project(with_distance(found), parse_fields(fields))
+
+
+@router.get("/within")
+def get_complaints_within(
+    south: float = Query(..., ge=-90, le=90),
+    west: float = Query(..., ge=-180, le=180),
+    north: float = Query(..., ge=-90, le=90),
+    east: float = Query(..., ge=-180, le=180),
+    status_: str | None = Query(None, alias="status"),
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: str | None = None,
+    user: dict = Depends(get_current_user),
+):
+    """Complaints inside a bounding box, oldest first; citizens get only their own."""
+    if south > north or west > east:
+        raise HTTPException(status_code=400, detail="Bounding box must have south <= north and west <= east")
+    owner = field_equals("userId", user["id"] if user["role"] == "citizen" else None)
+    with store.read("complaints"):
+        found = store.within("complaints", south, west, north, east, limit,
+                             predicate=all_of(owner, field_equals("status", status_)))
+        return project(found, parse_fields(fields))
+
+
+@router.get("/{complaint_id}/nearest-bins")
+def get_nearest_bins(
+    complaint_id: int,
+    k: int = Query(5, ge=1, le=100),
+    fields: str | None = None,
+    user: dict = Depends(get_current_user),
+):
+    """The ``k`` bins closest to where a complaint was reported."""
+    with store.read("complaints", "bins"):
+        c = store.get_complaint(complaint_id)
+        if not c or (user["role"] == "citizen" and c["userId"] != user["id"]):
+            raise HTTPException(status_code=404, detail="Complaint not found")
+        if c.get("latitude") is None or c.get("longitude") is None:
+            raise HTTPException(status_code=400, detail="Complaint has no location")
+        found = store.nearest("bins", c["latitude"], c["longitude"], k)
+        return project(with_distance(found), parse_fields(fields))
 
 
 @router.post("/upload-media")
-async def upload_media(file: UploadFile = File(...), user: dict = Depends(get_current_user)):
+def upload_media(file: UploadFile = File(...), user: dict = Depends(get_current_user)):
     """Upload a photo or video and return its URL."""
     allowed = {"image/jpeg", "image/png", "image/webp", "image/gif", "video/mp4", "video/webm", "video/quicktime"}
     if file.content_type not in allowed:
         raise HTTPException(400, "Only images (JPEG/PNG/WebP/GIF) and videos (MP4/WebM) are allowed")
 
-    ext = file.filename.split(".")[-1] if "." in file.filename else "bin"
-    filename = f"{uuid.uuid4().hex}.{ext}"
-    filepath = os.path.join(UPLOAD_DIR, filename)
-
-    content = await file.read()
-    with open(filepath, "wb") as f:
-        f.write(content)
+    try:
+        saved = save_upload(file.file, extension(file.filename, "bin"))
+    except UploadTooLarge as e:
+        raise HTTPException(413, str(e))
 
+    filename = saved["filename"]
+    thumbnails.submit(filename)
     return {"url": f"/api/complaints/media/{filename}", "filename": filename}
 
 
 @router.get("/media/{filename}")
-def get_media(filename: str):
-    """Serve an uploaded media file."""
-    from fastapi.responses import FileResponse
-    filepath = os.path.join(UPLOAD_DIR, filename)
-    if not os.path.exists(filepath):
-        raise HTTPException(404, "File not found")
-    return FileResponse(filepath)
-
-
-def _award_points(user_id: int, action: str, points: int):
-    """Award reward points to a citizen."""
-    if user_id not in store.rewards:
-        store.rewards[user_id] = {"points": 0, "level": "Bronze", "history": []}
-    r = store.rewards[user_id]
-    r["points"] += points
-    r["history"].insert(0, {"action": action, "points": points, "date": datetime.now().isoformat()})
-    # Update level
-    if r["points"] >= 500:
-        r["level"] = "Platinum"
-    elif r["points"] >= 300:
-        r["level"] = "Gold"
-    elif r["points"] >= 100:
-        r["level"] = "Silver"
-    else:
-        r["level"] = "Bronze"
+def get_media(filename: str, request: Request, size: str | None = None):
+    """Serve an uploaded media file; ``?size=thumb|medium`` for a WebP variant."""
+    return serve_media(request, filename, size)
 
 
 @router.post("/")
 def create_complaint(req: ComplaintCreate, user: dict = Depends(get_current_user)):
-    with store.lock:
-        store._complaint_id += 1
+    with store.write("complaints"):
         complaint = {
-            "id": store._complaint_id,
+            "id": store.next_id("complaint"),
             "userId": user["id"],
             "userName": user["name"],
             "location": req.location,
@@ -112,14 +173,14 @@ def create_complaint(req: ComplaintCreate, user: dict = Depends(get_current_user
             "respondedAt": None,
             "createdAt": datetime.now().isoformat(),
         }
-        store.complaints.append(complaint)
+        store.add_complaint(complaint)
 
         # Award 50 points for submitting a complaint
-        _award_points(user["id"], "Complaint submitted", 50)
+        store.award_points(user["id"], "Complaint submitted", 50)
         if req.media_urls:
-            _award_points(user["id"], "Photo/video attached", 20)
+            store.award_points(user["id"], "Photo/video attached", 20)
         if req.latitude and req.longitude:
-            _award_points(user["id"], "Location shared", 10)
+            store.award_points(user["id"], "Location shared", 10)
 
         return complaint
 
@@ -129,42 +190,44 @@ def respond_complaint(complaint_id: int, req: ComplaintRespond, user: dict = Dep
     """Admin responds to a complaint with a message and status update."""
     if user["role"] != "admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admin can respond")
-    with store.lock:
-        c = next((c for c in store.complaints if c["id"] == complaint_id), None)
+    with store.write("complaints"):
+        c = store.get_complaint(complaint_id)
         if not c:
             raise HTTPException(status_code=404, detail="Complaint not found")
         c["response"] = req.response
-        c["status"] = req.status
         c["respondedAt"] = datetime.now().isoformat()
+        store.set_complaint_status(c, req.status)
 
         # Award citizen bonus points when their complaint is resolved
         if req.status == "resolved":
-            _award_points(c["userId"], "Complaint resolved", 50)
+            store.award_points(c["userId"], "Complaint resolved", 50)
 
         return {"message": "Response sent", "complaint": c}
 
 
 @router.post("/{complaint_id}/resolve")
 def resolve_complaint(complaint_id: int, user: dict = Depends(get_current_user)):
-    with store.lock:
-        c = next((c for c in store.complaints if c["id"] == complaint_id), None)
+    with store.write("complaints"):
+        c = store.get_complaint(complaint_id)
         if not c:
             return {"error": "Complaint not found"}
-        c["status"] = "resolved"
-        _award_points(c["userId"], "Complaint resolved", 50)
+        store.set_complaint_status(c, "resolved")
+        store.award_points(c["userId"], "Complaint resolved", 50)
         return {"message": "Complaint resolved", "complaint": c}
 
 
 @router.get("/rewards")
 def get_rewards(user: dict = Depends(get_current_user)):
     """Get reward points for the current citizen."""
-    with store.lock:
-        r = store.rewards.get(user["id"], {"points": 0, "level": "Bronze", "history": []})
+    with store.read("complaints"):
+        r = store.get_rewards(user["id"]) or {"points": 0, "level": "Bronze", "history": []}
         return {
             "userId": user["id"],
             "points": r["points"],
             "level": r["level"],
-            "history": r["history"],
+            "history": list(r["history"]),
+            # Older entries, paged from GET /rewards/archived
+            "archivedHistory": r.get("archived", 0),
             "milestones": [
                 {"level": "Bronze", "minPoints": 0, "reward": "Badge on profile"},
                 {"level": "Silver", "minPoints": 100, "reward": "Priority complaint handling"},
@@ -172,3 +235,22 @@ def get_rewards(user: dict = Depends(get_current_user)):
                 {"level": "Platinum", "minPoints": 500, "reward": "City clean champion award"},
             ]
         }
+
+
+@router.get("/rewards/archived")
+def get_archived_rewards(
+    response: Response,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    user: dict = Depends(get_current_user),
+):
+    """The current citizen's reward history entries moved to cold storage, newest first."""
+    items = page_or_400(
+        response, store.archive.index("rewards", "date"), limit=limit, cursor=cursor,
+        lo=since.isoformat() if since else None,
+        hi=until.isoformat() if until else None,
+        predicate=field_equals("userId", user["id"]),
+    )
+    return project(items, ["action", "points", "date"])
@@ -0,0 +1,74 @@
+"""Live update routes — Server-Sent Events stream of DataStore changes."""
+
+import asyncio
+from fastapi import APIRouter, Header, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from ..auth import user_from_token
+from ..change_feed import visible_to
+from ..data_store import store
+from ..responses import FastJSONRoute, dumps
+
+router = APIRouter(route_class=FastJSONRoute)
+
+HEARTBEAT_SECONDS = 15
+
+
+def _format(event_id: int, event_type: str, data) -> str:
+    return f"id: {event_id}\nevent: {event_type}\ndata: {dumps(data).decode()}\n\n"
+
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    token: str = Query(..., description="JWT access token (EventSource cannot send headers)"),
+    last_event_id: int | None = Header(None),
+):
+    """Push change deltas visible to the current user.
+
+    Events: ``bins.fill``, ``alert.created``, ``alert.resolved``,
+    ``complaint.created``, ``complaint.updated``, ``complaint.task`` (the
+    citizen-facing ``linkedTask`` of a complaint), ``task.created``,
+    ``task.updated`` and ``reward.updated``. A ``resync`` event means deltas
+    were missed and the client should refetch from the REST endpoints.
+    """
+    # Token lookup may hit the user store and its locks; keep it off the event loop
+    user = await run_in_threadpool(user_from_token, token)
+    feed = store.changes
+
+    async def events():
+        waiter = feed.subscribe()
+        _, wake = waiter
+        seq = feed.seq
+        try:
+            if last_event_id is not None:
+                if last_event_id > seq:
+                    # Feed restarted since the client's last event
+                    yield _format(seq, "resync", {})
+                else:
+                    seq = last_event_id
+            while not await request.is_disconnected():
+                batch, complete = feed.since(seq)
+                if not complete:
+                    yield _format(batch[-1]["seq"], "resync", {})
+                    seq = batch[-1]["seq"]
+                    continue
+                for e in batch:
+                    if visible_to(e, user):
+                        yield _format(e["seq"], e["type"], e["data"])
+                    seq = e["seq"]
+                if batch:
+                    continue
+                try:
+                    await asyncio.wait_for(wake.wait(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                wake.clear()
+        finally:
+            feed.unsubscribe(waiter)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,80 +1,68 @@
 """Statistics routes — aggregated dashboard metrics."""
 
-from fastapi import APIRouter, Depends
+from datetime import date, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from ..auth import get_current_user
 from ..data_store import store
+from ..response_cache import cached_json
+from ..responses import FastJSONRoute
+from ..thumbnails import thumbnails
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
+MAX_ANALYTICS_DAYS = 366
+
+# Everything the dashboard summary is built from
+STATS_COLLECTIONS = ("users", "assignments", "bins", "alerts", "complaints", "tasks", "collections")
 
-@router.get("/")
-def get_stats(user: dict = Depends(get_current_user)):
-    with store.lock:
-        bins = store.bins
-        alerts = store.alerts
-        complaints = store.complaints
-        workers = [u for u in store.users if u["role"] == "worker"]
-        tasks = store.tasks
 
-        total_bins = len(bins)
-        full_bins = sum(1 for b in bins if b["status"] in ("full", "overflow"))
-        pending_alerts = sum(1 for a in alerts if a["status"] == "active")
-        pending_complaints = sum(1 for c in complaints if c["status"] == "pending")
-        in_progress_complaints = sum(1 for c in complaints if c["status"] == "in_progress")
-        resolved_complaints = sum(1 for c in complaints if c["status"] == "resolved")
-        active_workers = len(workers)
-        avg_fill = round(sum(b["fillLevel"] for b in bins) / total_bins) if total_bins else 0
-        collection_rate = round(100 - (full_bins / total_bins * 100)) if total_bins else 100
+def _stats(today: date) -> dict:
+    # Counters and recent lists are maintained by DataStore at mutation time
+    summary = store.stats_summary()
+    total_bins = summary["totalBins"]
+    full_bins = summary["fullBins"]
+    avg_fill = round(summary.pop("fillTotal") / total_bins) if total_bins else 0
+    collection_rate = round(100 - (full_bins / total_bins * 100)) if total_bins else 100
 
-        # Task stats
-        total_tasks = len(tasks)
-        pending_tasks = sum(1 for t in tasks if t["status"] == "pending")
-        in_progress_tasks = sum(1 for t in tasks if t["status"] == "in_progress")
-        completed_tasks = sum(1 for t in tasks if t["status"] == "completed")
+    return {
+        **summary,
+        "avgFillLevel": avg_fill,
+        "collectionRate": collection_rate,
+        "collections": store.collection_log.daily_counts(today),
+        "assignments": store.assignments,
+    }
+
+
+@router.get("/")
+def get_stats(request: Request, response: Response, user: dict = Depends(get_current_user)):
+    with store.read("users", "tasks", "complaints", "bins"):
+        today = date.today()
+        # The 7-day collection series moves at midnight without any change
+        return cached_json(request, response, STATS_COLLECTIONS, lambda: _stats(today), vary=today)
 
-        # Recent complaints (latest 5)
-        recent_complaints = sorted(complaints, key=lambda c: c["createdAt"], reverse=True)[:5]
 
-        # Recent tasks (latest 5)
-        recent_tasks = sorted(tasks, key=lambda t: t["assignedAt"], reverse=True)[:5]
+@router.get("/analytics")
+def get_analytics(start: date | None = None, end: date | None = None, user: dict = Depends(get_current_user)):
+    """Collections per day, area and worker, alert-to-collection response time
+    and complaint resolution time from the collection log (admin only).
 
-        # Workers with task counts
-        worker_stats = []
-        for w in workers:
-            w_tasks = [t for t in tasks if t["workerId"] == w["id"]]
-            worker_stats.append({
-                "id": w["id"],
-                "name": w["name"],
-                "totalTasks": len(w_tasks),
-                "completedTasks": sum(1 for t in w_tasks if t["status"] == "completed"),
-                "activeTasks": sum(1 for t in w_tasks if t["status"] in ("pending", "in_progress")),
-            })
+    Defaults to the 7 days up to today.
+    """
+    if user["role"] != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admin can view analytics")
+    end = end or date.today()
+    start = start or end - timedelta(days=6)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    if (end - start).days >= MAX_ANALYTICS_DAYS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_ANALYTICS_DAYS} days per request")
+    return store.collection_log.summary(start, end)
 
-        # Area-wise complaints
-        area_complaints = {}
-        for c in complaints:
-            loc = c["location"]
-            area_complaints[loc] = area_complaints.get(loc, 0) + 1
 
-        return {
-            "totalBins": total_bins,
-            "fullBins": full_bins,
-            "avgFillLevel": avg_fill,
-            "pendingAlerts": pending_alerts,
-            "pendingComplaints": pending_complaints,
-            "inProgressComplaints": in_progress_complaints,
-            "resolvedComplaints": resolved_complaints,
-            "totalComplaints": len(complaints),
-            "activeWorkers": active_workers,
-            "collectionRate": collection_rate,
-            "collections": store.collections,
-            "assignments": store.assignments,
-            "totalTasks": total_tasks,
-            "pendingTasks": pending_tasks,
-            "inProgressTasks": in_progress_tasks,
-            "completedTasks": completed_tasks,
-            "recentComplaints": recent_complaints,
-            "recentTasks": recent_tasks,
-            "workerStats": worker_stats,
-            "areaComplaints": area_complaints,
-        }
+@router.get("/thumbnails")
+def get_thumbnail_metrics(user: dict = Depends(get_current_user)):
+    """Thumbnail pipeline queue depth and throughput (admin only)."""
+    if user["role"] != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admin can view pipeline metrics")
+    return thumbnails.metrics()
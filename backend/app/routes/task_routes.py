@@ -1,27 +1,93 @@
 """Task routes — admin creates tasks, workers complete them with photos."""
 
-import os
-import uuid
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from fastapi.responses import FileResponse
+import time
+
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status, UploadFile, File
 from datetime import datetime
-from ..schemas import TaskCreate, WorkerCreate
-from ..auth import get_current_user
+from ..schemas import RoutePlanRequest, TaskCreate, WorkerCreate
+from ..auth import get_current_user, token_cache
 from ..data_store import store
+from ..responses import FastJSONRoute
+from ..paging import MAX_PAGE_SIZE, all_of, field_equals, page_or_400, parse_fields, project
+from ..spatial import MAX_RADIUS_M, with_distance
+from ..config import DEPOT_LOCATION, ROUTE_CAPACITY, ROUTE_TIME_BUDGET_MS
+from ..media import serve_media
+from ..route_optimizer import optimize_routes
+from ..thumbnails import thumbnails
+from ..uploads import UploadTooLarge, extension, save_upload
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
-UPLOAD_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "uploads")
-os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 
 @router.get("/")
-def get_tasks(user: dict = Depends(get_current_user)):
-    """Admin sees all tasks; worker sees only their assigned tasks."""
-    with store.lock:
-        if user["role"] == "worker":
-            return [t for t in store.tasks if t["workerId"] == user["id"]]
-        return sorted(store.tasks, key=lambda t: t["assignedAt"], reverse=True)
+def get_tasks(
+    response: Response,
+    status_: str | None = Query(None, alias="status"),
+    priority: str | None = None,
+    worker_id: int | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: str | None = None,
+    user: dict = Depends(get_current_user),
+):
+    """Admin sees all tasks; worker sees only their assigned tasks. Newest first."""
+    if user["role"] == "worker":
+        worker_id = user["id"]
+    with store.read("tasks"):
+        items = page_or_400(
+            response, store.task_index(worker_id), limit=limit, cursor=cursor,
+            lo=since.isoformat() if since else None,
+            hi=until.isoformat() if until else None,
+            predicate=all_of(field_equals("status", status_), field_equals("priority", priority)),
+        )
+        return project(items, parse_fields(fields))
+
+
+@router.get("/archived")
+def get_archived_tasks(
+    response: Response,
+    priority: str | None = None,
+    worker_id: int | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: str | None = None,
+    user: dict = Depends(get_current_user),
+):
+    """Approved tasks moved to cold storage, newest first; workers see only their own."""
+    if user["role"] == "worker":
+        worker_id = user["id"]
+    # The archive has its own lock; no store lock is needed
+    items = page_or_400(
+        response, store.archive.index("tasks", "assignedAt"), limit=limit, cursor=cursor,
+        lo=since.isoformat() if since else None,
+        hi=until.isoformat() if until else None,
+        predicate=all_of(field_equals("priority", priority), field_equals("workerId", worker_id)),
+    )
+    return project(items, parse_fields(fields))
+
+
+@router.get("/nearby")
+def get_nearby_tasks(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius: float = Query(1000, gt=0, le=MAX_RADIUS_M),
+    status_: str | None = Query(None, alias="status"),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    fields: str | None = None,
+    user: dict = Depends(get_current_user),
+):
+    """Tasks within ``radius`` meters of a point, nearest first; workers get only their own."""
+    worker = field_equals("workerId", user["id"] if user["role"] == "worker" else None)
+    with store.read("tasks"):
+        found = store.nearby("tasks", lat, lng, radius, limit,
+                             predicate=all_of(worker, field_equals("status", status_)))
+        return project(with_distance(found), parse_fields(fields))
 
 
 @router.post("/")
@@ -30,23 +96,23 @@ def create_task(req: TaskCreate, user: dict = Depends(get_current_user)):
     if user["role"] != "admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admin can assign tasks")
 
-    worker = next((u for u in store.users if u["id"] == req.worker_id and u["role"] == "worker"), None)
-    if not worker:
-        raise HTTPException(status_code=404, detail="Worker not found")
+    with store.read("users"), store.write("tasks", "complaints"):
+        worker = store.get_user(req.worker_id)
+        if not worker or worker["role"] != "worker":
+            raise HTTPException(status_code=404, detail="Worker not found")
 
-    with store.lock:
-        store._task_id += 1
+        task_id = store.next_id("task")
         # Get lat/lng from linked complaint if not provided
         lat = req.latitude
         lng = req.longitude
         if not lat and req.complaint_id:
-            linked = next((c for c in store.complaints if c["id"] == req.complaint_id), None)
+            linked = store.get_complaint(req.complaint_id)
             if linked:
                 lat = linked.get("latitude")
                 lng = linked.get("longitude")
 
         task = {
-            "id": store._task_id,
+            "id": task_id,
             "workerId": req.worker_id,
             "workerName": worker["name"],
             "complaintId": req.complaint_id,
@@ -63,13 +129,13 @@ def create_task(req: TaskCreate, user: dict = Depends(get_current_user)):
             "completionNote": None,
             "approved": None,
         }
-        store.tasks.append(task)
+        store.add_task(task)
 
         # If linked to a complaint, update its status
         if req.complaint_id:
-            c = next((c for c in store.complaints if c["id"] == req.complaint_id), None)
+            c = store.get_complaint(req.complaint_id)
             if c:
-                c["status"] = "in_progress"
+                store.set_complaint_status(c, "in_progress")
 
         return task
 
@@ -77,64 +143,69 @@ def create_task(req: TaskCreate, user: dict = Depends(get_current_user)):
 @router.post("/{task_id}/start")
 def start_task(task_id: int, user: dict = Depends(get_current_user)):
     """Worker marks a task as in-progress."""
-    with store.lock:
-        task = next((t for t in store.tasks if t["id"] == task_id), None)
+    with store.write("tasks"), store.read("complaints"):
+        task = store.get_task(task_id)
         if not task:
             raise HTTPException(status_code=404, detail="Task not found")
-        task["status"] = "in_progress"
+        store.set_task_status(task, "in_progress")
         return task
 
 
 @router.post("/{task_id}/upload-photo")
-async def upload_completion_photo(task_id: int, file: UploadFile = File(...), user: dict = Depends(get_current_user)):
+def upload_completion_photo(task_id: int, file: UploadFile = File(...), user: dict = Depends(get_current_user)):
     """Worker uploads a completion photo for a task."""
     allowed = {"image/jpeg", "image/png", "image/webp", "image/gif"}
     if file.content_type not in allowed:
         raise HTTPException(400, "Only images (JPEG/PNG/WebP/GIF) are allowed")
 
-    ext = file.filename.split(".")[-1] if "." in file.filename else "jpg"
-    filename = f"task_{task_id}_{uuid.uuid4().hex}.{ext}"
-    filepath = os.path.join(UPLOAD_DIR, filename)
-
-    content = await file.read()
-    with open(filepath, "wb") as f:
-        f.write(content)
+    try:
+        saved = save_upload(file.file, extension(file.filename, "jpg"))
+    except UploadTooLarge as e:
+        raise HTTPException(413, str(e))
 
+    filename = saved["filename"]
+    thumbnails.submit(filename)
     url = f"/api/tasks/media/{filename}"
 
-    with store.lock:
-        task = next((t for t in store.tasks if t["id"] == task_id), None)
+    with store.write("tasks"), store.read("complaints"):
+        task = store.get_task(task_id)
         if not task:
             raise HTTPException(404, "Task not found")
         task["completionPhotos"].append(url)
+        store.task_changed(task)
 
     return {"url": url, "filename": filename}
 
 
 @router.get("/media/{filename}")
-def get_media(filename: str):
-    """Serve an uploaded task photo."""
-    filepath = os.path.join(UPLOAD_DIR, filename)
-    if not os.path.exists(filepath):
-        raise HTTPException(404, "File not found")
-    return FileResponse(filepath)
+def get_media(filename: str, request: Request, size: str | None = None):
+    """Serve an uploaded task photo; ``?size=thumb|medium`` for a WebP variant."""
+    return serve_media(request, filename, size)
 
 
 @router.post("/{task_id}/complete")
 def complete_task(task_id: int, user: dict = Depends(get_current_user)):
     """Worker marks a task as completed."""
-    with store.lock:
-        task = next((t for t in store.tasks if t["id"] == task_id), None)
+    with store.write("tasks", "complaints"):
+        task = store.get_task(task_id)
         if not task:
             raise HTTPException(status_code=404, detail="Task not found")
-        task["status"] = "completed"
         task["completedAt"] = datetime.now().isoformat()
+        store.set_task_status(task, "completed")
+        store.log_collection_event({
+            "type": "collection",
+            "at": task["completedAt"],
+            "taskId": task["id"],
+            "complaintId": task["complaintId"],
+            "workerId": task["workerId"],
+            "workerName": task["workerName"],
+        })
 
         # If linked to a complaint, mark it resolved
         if task["complaintId"]:
-            c = next((c for c in store.complaints if c["id"] == task["complaintId"]), None)
+            c = store.get_complaint(task["complaintId"])
             if c and c["status"] != "resolved":
-                c["status"] = "resolved"
+                store.set_complaint_status(c, "resolved")
 
         return task
 
@@ -144,20 +215,21 @@ def approve_task(task_id: int, user: dict = Depends(get_current_user)):
     """Admin approves a completed task after reviewing worker photos."""
     if user["role"] != "admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admin can approve tasks")
-    with store.lock:
-        task = next((t for t in store.tasks if t["id"] == task_id), None)
+    with store.write("tasks", "complaints"):
+        task = store.get_task(task_id)
         if not task:
             raise HTTPException(status_code=404, detail="Task not found")
         if task["status"] != "completed":
             raise HTTPException(status_code=400, detail="Task must be completed before approval")
         task["approved"] = True
         task["approvedAt"] = datetime.now().isoformat()
+        store.task_changed(task)
 
         # Also mark linked complaint as resolved if not already
         if task["complaintId"]:
-            c = next((c for c in store.complaints if c["id"] == task["complaintId"]), None)
+            c = store.get_complaint(task["complaintId"])
             if c:
-                c["status"] = "resolved"
+                store.set_complaint_status(c, "resolved")
 
         return task
 
@@ -167,24 +239,107 @@ def reject_task(task_id: int, user: dict = Depends(get_current_user)):
     """Admin rejects a completed task — sends it back to in_progress."""
     if user["role"] != "admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admin can reject tasks")
-    with store.lock:
-        task = next((t for t in store.tasks if t["id"] == task_id), None)
+    with store.write("tasks"), store.read("complaints"):
+        task = store.get_task(task_id)
         if not task:
             raise HTTPException(status_code=404, detail="Task not found")
         task["approved"] = False
-        task["status"] = "in_progress"
         task["completedAt"] = None
         task["completionPhotos"] = []
+        store.set_task_status(task, "in_progress")
         return task
 
 
+@router.post("/routes")
+def plan_routes(req: RoutePlanRequest, user: dict = Depends(get_current_user)):
+    """Plan collection routes over the bins at or above ``threshold`` (admin only).
+
+    With ``horizon_hours`` bins are picked (and loads counted) by their
+    forecast fill level that many hours from now. With ``apply`` the plan
+    replaces the worker assignments.
+    """
+    if user["role"] != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admin can plan routes")
+    if not 0 <= req.threshold <= 100:
+        raise HTTPException(status_code=400, detail="threshold must be between 0 and 100")
+    if req.horizon_hours < 0:
+        raise HTTPException(status_code=400, detail="horizon_hours must not be negative")
+    budget_ms = ROUTE_TIME_BUDGET_MS if req.time_budget_ms is None else req.time_budget_ms
+    budget_ms = min(max(budget_ms, 0), ROUTE_TIME_BUDGET_MS)
+
+    with store.read("users", "bins"):
+        if req.workers is None:
+            starts = [(w, *DEPOT_LOCATION, ROUTE_CAPACITY) for w in store.workers()]
+        else:
+            starts = []
+            for s in req.workers:
+                worker = store.get_user(s.worker_id)
+                if not worker or worker["role"] != "worker":
+                    raise HTTPException(status_code=404, detail=f"Worker {s.worker_id} not found")
+                located = s.latitude is not None and s.longitude is not None
+                starts.append((worker, *((s.latitude, s.longitude) if located else DEPOT_LOCATION),
+                               ROUTE_CAPACITY if s.capacity is None else s.capacity))
+        if not starts:
+            raise HTTPException(status_code=400, detail="No workers to route")
+        state = store.bin_state
+        expected = state.fill
+        if req.horizon_hours:
+            predicted = store.forecast.predict(time.time() + req.horizon_hours * 3600)
+            # Bins without a known rate are taken as they are now
+            expected = np.where(np.isnan(predicted), state.fill, np.round(predicted)).astype(np.int16)
+        rows = np.flatnonzero((expected >= req.threshold) & ~np.isnan(state.lat) & ~np.isnan(state.lng))
+        bins = [store.bins[i] for i in rows.tolist()]
+        lat, lng, fill = state.lat[rows], state.lng[rows], expected[rows]
+
+    # Planning is CPU-bound and can take the whole budget: no locks held
+    start_lat, start_lng, capacity = (np.array(col, dtype=float) for col in list(zip(*starts))[1:])
+    plan = optimize_routes(start_lat, start_lng, capacity, lat, lng, fill / 100, budget_ms / 1000)
+
+    routes = []
+    for (worker, s_lat, s_lng, cap), route, length, initial in zip(
+            starts, plan["routes"], plan["lengths"], plan["initialLengths"]):
+        routes.append({
+            "workerId": worker["id"],
+            "workerName": worker["name"],
+            "start": {"latitude": s_lat, "longitude": s_lng},
+            "capacity": cap,
+            "load": round(float(fill[route].sum()) / 100, 2),
+            "binIds": [bins[i]["id"] for i in route],
+            "stops": [{"binId": bins[i]["id"], "location": bins[i]["location"],
+                       "latitude": bins[i]["latitude"], "longitude": bins[i]["longitude"],
+                       "fillLevel": bins[i]["fillLevel"], "expectedFill": int(fill[i])} for i in route],
+            "distanceMeters": round(length),
+            "initialDistanceMeters": round(initial),
+        })
+    if req.apply:
+        now = datetime.now().isoformat()
+        with store.write("users"):
+            store.set_assignments([
+                {"workerId": r["workerId"], "workerName": r["workerName"], "binIds": r["binIds"],
+                 "status": "active", "assignedAt": now}
+                for r in routes if r["binIds"]
+            ])
+    return {
+        "threshold": req.threshold,
+        "horizonHours": req.horizon_hours,
+        "routes": routes,
+        "unassignedBinIds": [bins[i]["id"] for i in plan["unassigned"]],
+        "totalDistanceMeters": round(sum(plan["lengths"])),
+        "initialDistanceMeters": round(sum(plan["initialLengths"])),
+        "moves": plan["moves"],
+        "converged": plan["converged"],
+        "elapsedMs": round(plan["seconds"] * 1000, 1),
+        "applied": req.apply,
+    }
+
+
 @router.get("/workers")
 def get_workers(user: dict = Depends(get_current_user)):
     """Get list of workers (for admin task assignment dropdown)."""
     if user["role"] != "admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admin can view workers")
-    with store.lock:
-        workers = [{"id": u["id"], "name": u["name"], "email": u["email"]} for u in store.users if u["role"] == "worker"]
+    with store.read("users"):
+        workers = [{"id": u["id"], "name": u["name"], "email": u["email"]} for u in store.workers()]
         return workers
 
 
@@ -193,11 +348,11 @@ def create_worker(req: WorkerCreate, user: dict = Depends(get_current_user)):
     """Admin creates a new worker account with email/password."""
     if user["role"] != "admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admin can add workers")
-    with store.lock:
+    with store.write("users"):
         # Check for duplicate email
-        if any(u["email"] == req.email for u in store.users):
+        if store.get_user_by_email(req.email):
             raise HTTPException(status_code=400, detail="Email already exists")
-        new_id = max(u["id"] for u in store.users) + 1
+        new_id = store.next_user_id()
         worker = {
             "id": new_id,
             "name": req.name,
@@ -205,7 +360,7 @@ def create_worker(req: WorkerCreate, user: dict = Depends(get_current_user)):
             "password": req.password,
             "role": "worker",
         }
-        store.users.append(worker)
+        store.add_user(worker)
         return {"id": worker["id"], "name": worker["name"], "email": worker["email"], "role": "worker"}
 
 
@@ -214,9 +369,10 @@ def delete_worker(worker_id: int, user: dict = Depends(get_current_user)):
     """Admin removes a worker."""
     if user["role"] != "admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admin can remove workers")
-    with store.lock:
-        worker = next((u for u in store.users if u["id"] == worker_id and u["role"] == "worker"), None)
-        if not worker:
+    with store.write("users"):
+        worker = store.get_user(worker_id)
+        if not worker or worker["role"] != "worker":
             raise HTTPException(status_code=404, detail="Worker not found")
-        store.users = [u for u in store.users if u["id"] != worker_id]
+        store.remove_user(worker_id)
+        token_cache.invalidate_user(worker_id)
         return {"message": f"Worker {worker['name']} removed"}
@@ -39,6 +39,21 @@ class AssignmentCreate(BaseModel):
     bin_ids: list[int]
 
 
+class RouteStart(BaseModel):
+    worker_id: int
+    latitude: float | None = None  # default: the depot
+    longitude: float | None = None
+    capacity: float | None = None  # full bins' worth; default ROUTE_CAPACITY
+
+
+class RoutePlanRequest(BaseModel):
+    threshold: int = 80  # collect bins at or above this fill level
+    horizon_hours: float = 0  # ...as forecast this many hours from now
+    workers: list[RouteStart] | None = None  # default: every worker, from the depot
+    time_budget_ms: int | None = None
+    apply: bool = False  # replace the worker assignments with the plan
+
+
 class WorkerCreate(BaseModel):
     name: str
     email: str
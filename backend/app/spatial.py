@@ -0,0 +1,180 @@
+"""Spatial index — uniform lat/lon grid over NumPy coordinate columns.
+
+Points are bucketed into ``CELL_DEGREES`` cells (~550 m north-south); a
+query only looks at the cells its circle or box touches and computes exact
+great-circle distances for those candidates in one vectorized step, so
+radius, k-nearest and bounding-box queries stay well under a millisecond
+at city scale (see benchmarks/bench_spatial.py).
+"""
+
+import math
+
+import numpy as np
+
+EARTH_RADIUS_M = 6_371_008.8
+CELL_DEGREES = 0.005
+METERS_PER_DEGREE = math.pi * EARTH_RADIUS_M / 180
+MAX_RADIUS_M = 50_000
+
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    """Great-circle distance in meters; any argument may be an array."""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def _cell(lat: float, lon: float) -> tuple:
+    return math.floor(lat / CELL_DEGREES), math.floor(lon / CELL_DEGREES)
+
+
+class SpatialIndex:
+    """Record ids by location; records without coordinates are not indexed."""
+
+    def __init__(self):
+        self._lat = np.empty(64)
+        self._lon = np.empty(64)
+        self._ids = np.empty(64, dtype=np.int64)
+        self._size = 0
+        self._row_of = {}
+        self._cells = {}
+        self._cell_arrays = {}  # cell -> its rows as an array, built on first query
+        # Occupied cell range, bounding how far a k-nearest search can grow
+        self._min_cell = self._max_cell = None
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def add(self, record_id: int, lat, lon):
+        if lat is None or lon is None or record_id in self._row_of:
+            return
+        if self._size == len(self._ids):
+            grow = len(self._ids)
+            self._lat = np.concatenate([self._lat, np.empty(grow)])
+            self._lon = np.concatenate([self._lon, np.empty(grow)])
+            self._ids = np.concatenate([self._ids, np.empty(grow, dtype=np.int64)])
+        row = self._size
+        self._size += 1
+        self._lat[row], self._lon[row], self._ids[row] = lat, lon, record_id
+        self._row_of[record_id] = row
+        cell = _cell(lat, lon)
+        self._cells.setdefault(cell, []).append(row)
+        self._cell_arrays.pop(cell, None)
+        if self._min_cell is None:
+            self._min_cell = self._max_cell = cell
+        else:
+            self._min_cell = (min(self._min_cell[0], cell[0]), min(self._min_cell[1], cell[1]))
+            self._max_cell = (max(self._max_cell[0], cell[0]), max(self._max_cell[1], cell[1]))
+
+    def remove(self, record_id: int):
+        row = self._row_of.pop(record_id, None)
+        if row is None:
+            return
+        cell = _cell(float(self._lat[row]), float(self._lon[row]))
+        members = self._cells[cell]
+        members.remove(row)
+        if not members:
+            del self._cells[cell]
+        self._cell_arrays.pop(cell, None)
+        if len(self._row_of) < self._size // 2:
+            self._compact()
+
+    def _compact(self):
+        """Drop the rows of removed records, keeping insertion order."""
+        rows = np.sort(np.fromiter(self._row_of.values(), dtype=np.int64, count=len(self._row_of)))
+        capacity = max(64, 2 * len(rows))
+        lat, lon, ids = np.empty(capacity), np.empty(capacity), np.empty(capacity, dtype=np.int64)
+        n = len(rows)
+        lat[:n], lon[:n], ids[:n] = self._lat[rows], self._lon[rows], self._ids[rows]
+        self._lat, self._lon, self._ids, self._size = lat, lon, ids, n
+        self._row_of = dict(zip(ids[:n].tolist(), range(n)))
+        self._cells = {}
+        for row, (la, lo) in enumerate(zip(lat[:n].tolist(), lon[:n].tolist())):
+            self._cells.setdefault(_cell(la, lo), []).append(row)
+        self._cell_arrays = {}
+
+    def _cell_rows(self, cell: tuple):
+        rows = self._cell_arrays.get(cell)
+        if rows is None:
+            members = self._cells.get(cell)
+            if not members:
+                return None
+            rows = self._cell_arrays[cell] = np.array(members, dtype=np.int64)
+        return rows
+
+    def _rows_in_cells(self, lat_lo: int, lat_hi: int, lon_lo: int, lon_hi: int) -> np.ndarray:
+        if (lat_hi - lat_lo + 1) * (lon_hi - lon_lo + 1) > len(self._cells):
+            # Sparse data under a large window: walk the occupied cells instead
+            cells = [(i, j) for i, j in self._cells if lat_lo <= i <= lat_hi and lon_lo <= j <= lon_hi]
+        else:
+            cells = [(i, j) for i in range(lat_lo, lat_hi + 1) for j in range(lon_lo, lon_hi + 1)]
+        parts = [rows for rows in map(self._cell_rows, cells) if rows is not None]
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def within_radius(self, lat: float, lon: float, radius_m: float, limit: int | None = None) -> tuple:
+        """``(ids, distances)`` within ``radius_m``, nearest first."""
+        radius_m = min(radius_m, MAX_RADIUS_M)
+        dlat = radius_m / METERS_PER_DEGREE
+        dlon = radius_m / (METERS_PER_DEGREE * max(math.cos(math.radians(lat)), 1e-6))
+        lo, hi = _cell(lat - dlat, lon - dlon), _cell(lat + dlat, lon + dlon)
+        rows = self._rows_in_cells(lo[0], hi[0], lo[1], hi[1])
+        dist = haversine_m(lat, lon, self._lat[rows], self._lon[rows])
+        keep = dist <= radius_m
+        rows, dist = rows[keep], dist[keep]
+        order = np.argsort(dist, kind="stable")[:limit]
+        return self._ids[rows[order]].tolist(), dist[order].tolist()
+
+    def nearest(self, lat: float, lon: float, k: int) -> tuple:
+        """``(ids, distances)`` of the ``k`` nearest points, nearest first."""
+        if not self._row_of or k <= 0:
+            return [], []
+        ci, cj = _cell(lat, lon)
+        cell_m = CELL_DEGREES * METERS_PER_DEGREE * math.cos(math.radians(min(abs(lat) + 1, 89)))
+        max_ring = max(abs(ci - self._min_cell[0]), abs(ci - self._max_cell[0]),
+                       abs(cj - self._min_cell[1]), abs(cj - self._max_cell[1]))
+        ring = 0
+        while True:
+            rows = self._rows_in_cells(ci - ring, ci + ring, cj - ring, cj + ring)
+            if len(rows) >= k or ring >= max_ring:
+                dist = haversine_m(lat, lon, self._lat[rows], self._lon[rows])
+                top = np.argpartition(dist, k - 1)[:k] if len(rows) > k else np.arange(len(rows))
+                top = top[np.argsort(dist[top], kind="stable")]
+                kth = dist[top[-1]]
+                # Settled once no unvisited cell can hold anything closer
+                if ring >= max_ring or kth <= self._clearance(lat, lon, ci, cj, ring):
+                    return self._ids[rows[top]].tolist(), dist[top].tolist()
+                # Jump straight to the ring that covers the current k-th distance
+                ring = min(max_ring, max(ring + 1, math.ceil(kth / cell_m)))
+            else:
+                ring = min(max_ring, ring * 2 + 1)
+
+    @staticmethod
+    def _clearance(lat: float, lon: float, ci: int, cj: int, ring: int) -> float:
+        """Meters from the point to the nearest edge of the searched window."""
+        lat_lo, lat_hi = (ci - ring) * CELL_DEGREES, (ci + ring + 1) * CELL_DEGREES
+        lon_lo, lon_hi = (cj - ring) * CELL_DEGREES, (cj + ring + 1) * CELL_DEGREES
+        # Parallels shrink toward the poles: use the window's widest latitude
+        cos_lat = math.cos(math.radians(min(max(abs(lat_lo), abs(lat_hi)), 90)))
+        north_south = min(lat - lat_lo, lat_hi - lat) * METERS_PER_DEGREE
+        east_west = min(lon - lon_lo, lon_hi - lon) * METERS_PER_DEGREE * cos_lat
+        # A great circle to a meridian is a little shorter than along the parallel
+        return min(north_south, east_west) * 0.999
+
+    def within_bbox(self, south: float, west: float, north: float, east: float,
+                    limit: int | None = None) -> list:
+        """Ids inside the box, in insertion order."""
+        lo, hi = _cell(south, west), _cell(north, east)
+        rows = self._rows_in_cells(lo[0], hi[0], lo[1], hi[1])
+        if not len(rows):
+            return []
+        rows.sort()
+        lat, lon = self._lat[rows], self._lon[rows]
+        inside = (lat >= south) & (lat <= north) & (lon >= west) & (lon <= east)
+        return self._ids[rows[inside]][:limit].tolist()
+
+
+def with_distance(pairs: list) -> list:
+    """``(record, meters)`` pairs as records carrying a ``distance`` field in meters."""
+    return [{**record, "distance": round(meters, 1)} for record, meters in pairs]
@@ -0,0 +1,688 @@
+"""SQLite storage engine — the ``DataStore`` API over an on-disk database.
+
+Selected with ``CLEANIFY_STORAGE=sqlite``. Users, alerts, complaints, tasks
+and rewards live in ``SQLITE_PATH`` (WAL mode, so readers never block the
+writer) and are loaded one record at a time, so those collections are no
+longer bounded by RAM. Each record is stored as a JSON document next to the
+columns it is looked up, filtered or ordered by.
+
+What stays in memory:
+
+* bins — the simulator and bulk ingest work on the NumPy columns; every
+  fill/battery change is written through to the ``bins`` table
+* complaint and task coordinates for the spatial indexes (app/spatial.py)
+* active alerts (at most one per bin) and the dashboard counters, rebuilt
+  with ``GROUP BY`` queries on startup and then maintained incrementally
+  by the shared ``DataStore`` mutators
+* the collection log's day buckets, folded from ``collection_events`` and
+  the summary of archived entries
+
+Routes keep their locking and mutation pattern: records returned by the
+getters are fresh dicts, and the ``set_*``/``*_changed`` mutators that
+follow every in-place edit write them back. Ids come from the
+``id_counters`` table, so several processes can share one database
+(app/cluster.py keeps their in-memory state in step).
+"""
+
+import json
+import queue
+import sqlite3
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+from .analytics import CollectionLog
+from .archive import Archive
+from .config import SQLITE_POOL_SIZE
+from .change_feed import ChangeFeed
+from .data_store import DataStore, LOCK_ORDER, RECENT_LIMIT, RWLock
+from .spatial import SpatialIndex
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    email TEXT NOT NULL UNIQUE,
+    role TEXT NOT NULL,
+    doc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS users_role ON users (role);
+
+CREATE TABLE IF NOT EXISTS bins (
+    id INTEGER PRIMARY KEY,
+    area TEXT NOT NULL,
+    fillLevel INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    sensorBattery INTEGER NOT NULL,
+    doc TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS alerts (
+    id INTEGER PRIMARY KEY,
+    binId INTEGER NOT NULL,
+    area TEXT NOT NULL,
+    status TEXT NOT NULL,
+    createdAt TEXT NOT NULL,
+    doc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS alerts_created ON alerts (createdAt, id);
+CREATE INDEX IF NOT EXISTS alerts_status ON alerts (status);
+CREATE INDEX IF NOT EXISTS alerts_area ON alerts (area);
+-- At most one active alert per bin, even with several workers raising them.
+-- Databases from before this index may hold duplicates: keep each bin's oldest.
+UPDATE alerts SET status = 'resolved', doc = json_set(doc, '$.status', 'resolved')
+WHERE status = 'active'
+  AND id > (SELECT MIN(id) FROM alerts AS a WHERE a.binId = alerts.binId AND a.status = 'active');
+CREATE UNIQUE INDEX IF NOT EXISTS alerts_active_bin ON alerts (binId) WHERE status = 'active';
+
+CREATE TABLE IF NOT EXISTS complaints (
+    id INTEGER PRIMARY KEY,
+    userId INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    location TEXT NOT NULL,
+    createdAt TEXT NOT NULL,
+    doc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS complaints_created ON complaints (createdAt, id);
+CREATE INDEX IF NOT EXISTS complaints_user ON complaints (userId, createdAt, id);
+CREATE INDEX IF NOT EXISTS complaints_status ON complaints (status);
+CREATE INDEX IF NOT EXISTS complaints_area ON complaints (location);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    workerId INTEGER NOT NULL,
+    complaintId INTEGER,
+    status TEXT NOT NULL,
+    assignedAt TEXT NOT NULL,
+    doc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_assigned ON tasks (assignedAt, id);
+CREATE INDEX IF NOT EXISTS tasks_worker ON tasks (workerId, assignedAt, id);
+CREATE INDEX IF NOT EXISTS tasks_complaint ON tasks (complaintId);
+CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status);
+
+CREATE TABLE IF NOT EXISTS rewards (
+    userId INTEGER PRIMARY KEY,
+    doc TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    doc TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS collection_events (
+    id INTEGER PRIMARY KEY,
+    doc TEXT NOT NULL
+);
+
+-- Next-id counters, shared by every process using the database
+CREATE TABLE IF NOT EXISTS id_counters (
+    kind TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+# Rows fetched per round trip while a page is being scanned
+SCAN_BATCH = 64
+
+
+def _dumps(record: dict) -> str:
+    return json.dumps(record, separators=(",", ":"))
+
+
+class ConnectionPool:
+    """Reuses SQLite connections across threadpool workers.
+
+    A connection is used by one thread at a time; up to ``size`` idle
+    connections are kept, each with its own prepared-statement cache (the
+    SQL strings below are constants, so they are compiled once per connection).
+    """
+
+    def __init__(self, path: str, size: int = SQLITE_POOL_SIZE):
+        self.path = path
+        self.size = size
+        self._idle = queue.LifoQueue()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit: each statement is its own transaction unless wrapped in ``transaction``
+        conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False, cached_statements=128)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # With WAL, NORMAL syncs at checkpoints: a power loss can drop the
+        # newest commits but never corrupts the database
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            yield conn
+        finally:
+            if self._idle.qsize() < self.size:
+                self._idle.put(conn)
+            else:
+                conn.close()
+
+    @contextmanager
+    def transaction(self):
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class SQLiteIndex:
+    """``SortedIndex``-compatible keyset scan over an indexed table.
+
+    ``scan`` yields ``(key, record)`` in ``(key_field, id)`` order, so
+    ``paging.paginate`` works unchanged; each page is one range query.
+    """
+
+    def __init__(self, pool: ConnectionPool, table: str, key_field: str, where: str = "", params: tuple = ()):
+        self._pool = pool
+        self.key_field = key_field
+        self._select = f"SELECT {key_field}, id, doc FROM {table}"
+        self._where = [where] if where else []
+        self._params = params
+
+    def scan(self, after: tuple | None = None, lo=None, hi=None, descending: bool = True):
+        if after is not None and not (isinstance(after[0], str) and isinstance(after[1], int)):
+            # SQLite would silently compare across types; match SortedIndex
+            raise TypeError("cursor key does not match this index")
+        key = self.key_field
+        clauses, params = list(self._where), list(self._params)
+        if lo is not None:
+            clauses.append(f"{key} >= ?")
+            params.append(lo)
+        if hi is not None:
+            clauses.append(f"{key} <= ?")
+            params.append(hi)
+        if after is not None:
+            clauses.append(f"({key}, id) {'<' if descending else '>'} (?, ?)")
+            params.extend(after)
+        order = "DESC" if descending else "ASC"
+        sql = self._select
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {key} {order}, id {order}"
+        with self._pool.connection() as conn:
+            cursor = conn.execute(sql, params)
+            try:
+                while rows := cursor.fetchmany(SCAN_BATCH):
+                    for k, record_id, doc in rows:
+                        yield (k, record_id), json.loads(doc)
+            finally:
+                # Paging stops early; end the read before the connection is reused
+                cursor.close()
+
+
+class SQLiteDataStore(DataStore):
+    """``DataStore`` whose record collections are kept in SQLite."""
+
+    def __init__(self, path: str):
+        if self._initialized:
+            return
+        self._initialized = True
+        self.path = path
+        self._pool = ConnectionPool(path)
+        self._locks = {name: RWLock() for name in LOCK_ORDER}
+        self.changes = ChangeFeed()
+        self._versions = {}
+        self.changes.add_listener(self._bump_version)
+        self.archive = Archive()
+        self._load()
+
+    # ── Helpers ──
+
+    def _execute(self, sql: str, params=()):
+        with self._pool.connection() as conn:
+            conn.execute(sql, params)
+
+    def _rows(self, sql: str, params=()) -> list:
+        with self._pool.connection() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def _doc(self, sql: str, params=()):
+        with self._pool.connection() as conn:
+            row = conn.execute(sql, params).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _docs(self, sql: str, params=()) -> list:
+        return [json.loads(doc) for doc, in self._rows(sql, params)]
+
+    def close(self):
+        self._pool.close()
+
+    # ── Startup ──
+
+    def _load(self):
+        with self._pool.connection() as conn:
+            conn.executescript(SCHEMA)
+        # Demo collections are static and always come from the seed, as do
+        # the assignments until a route plan replaces them
+        self._seed()
+        self._insert_seed()
+        self.users = self.alerts = self.complaints = self.tasks = self.rewards = None
+        self.collection_events = self.collection_summary = None
+        self.reload()
+
+    def reload(self):
+        """Rebuild everything kept in memory from the database; requires all write locks."""
+        assignments = self._doc("SELECT doc FROM settings WHERE key = 'assignments'")
+        if assignments is not None:
+            self.assignments = assignments
+        self.bins = []
+        for bin_row in self._rows("SELECT doc, fillLevel, status, sensorBattery FROM bins ORDER BY id"):
+            b = json.loads(bin_row[0])
+            b["fillLevel"], b["status"], b["sensorBattery"] = bin_row[1:]
+            self.bins.append(b)
+        self._build_indexes()
+
+    def _insert_seed(self):
+        with self._pool.transaction() as conn:
+            # Checked inside the write transaction: workers may start together
+            if conn.execute("SELECT EXISTS (SELECT 1 FROM users)").fetchone()[0]:
+                return
+            conn.executemany("INSERT INTO users VALUES (?, ?, ?, ?)",
+                             [(u["id"], u["email"], u["role"], _dumps(u)) for u in self.users])
+            conn.executemany("INSERT INTO bins VALUES (?, ?, ?, ?, ?, ?)",
+                             [(b["id"], b["area"], b["fillLevel"], b["status"], b["sensorBattery"], _dumps(b))
+                              for b in self.bins])
+            conn.executemany("INSERT INTO alerts VALUES (?, ?, ?, ?, ?, ?)",
+                             [self._alert_row(a) for a in self.alerts])
+            conn.executemany("INSERT INTO complaints VALUES (?, ?, ?, ?, ?, ?)",
+                             [self._complaint_row(c) for c in self.complaints])
+            conn.executemany("INSERT INTO tasks VALUES (?, ?, ?, ?, ?, ?)",
+                             [self._task_row(t) for t in self.tasks])
+            conn.executemany("INSERT INTO rewards VALUES (?, ?)",
+                             [(uid, _dumps({**r, "history": list(r["history"])})) for uid, r in self.rewards.items()])
+
+    def _build_indexes(self):
+        """Rebuild the in-memory bin state and counters from the database."""
+        self._index_bins()
+        self.recount()
+        self.alerts_sorted = SQLiteIndex(self._pool, "alerts", "createdAt")
+        self.complaints_sorted = SQLiteIndex(self._pool, "complaints", "createdAt")
+        self.complaint_locations = self._locations("complaints")
+        self._linked_task_views = {}
+        self.tasks_sorted = SQLiteIndex(self._pool, "tasks", "assignedAt")
+        self.task_locations = self._locations("tasks")
+        self.collection_log = CollectionLog(self._docs("SELECT doc FROM collection_events ORDER BY id"),
+                                            self._collection_summary())
+        self._bump_all_versions()
+
+        # Ids are allocated from id_counters; catch up with the rows (and
+        # with the alert counter older databases kept in settings)
+        highest = {
+            "user": self._rows("SELECT COALESCE(MAX(id), 0) FROM users")[0][0],
+            "alert": max(self._rows("SELECT COALESCE(MAX(id), 0) FROM alerts")[0][0],
+                         self._doc("SELECT doc FROM settings WHERE key = 'alertId'") or 0),
+            "complaint": self._rows("SELECT COALESCE(MAX(id), 0) FROM complaints")[0][0],
+            "task": self._rows("SELECT COALESCE(MAX(id), 0) FROM tasks")[0][0],
+        }
+        with self._pool.connection() as conn:
+            conn.executemany(
+                "INSERT INTO id_counters VALUES (?, ?)"
+                " ON CONFLICT (kind) DO UPDATE SET value = MAX(value, excluded.value)", highest.items())
+
+    def recount(self, groups=LOCK_ORDER):
+        """Recompute the counters of the named lock groups with ``GROUP BY`` queries.
+
+        Requires write locks on ``groups``.
+        """
+        if "users" in groups:
+            self._user_id = 0
+            self._workers = {}
+            for u in self._docs("SELECT doc FROM users WHERE role = 'worker' ORDER BY id"):
+                self._count_user(u)
+        if "bins" in groups:
+            self._active_alert_by_bin = {}
+            self._active_alerts = 0
+            self.bin_state.alerted[:] = False
+            for a in self._docs("SELECT doc FROM alerts WHERE status = 'active' ORDER BY id"):
+                self._count_alert(a)
+        if "complaints" in groups:
+            self._complaint_status_counts = dict(self._rows("SELECT status, COUNT(*) FROM complaints GROUP BY status"))
+            self._area_complaints = dict(self._rows("SELECT location, COUNT(*) FROM complaints GROUP BY location"))
+        if "tasks" in groups:
+            self._task_status_counts = {}
+            self._worker_task_counts = {}
+            for worker_id, status, n in self._rows(
+                    "SELECT workerId, status, COUNT(*) FROM tasks GROUP BY workerId, status"):
+                task = {"workerId": worker_id}
+                counts = self._worker_task_counts.setdefault(worker_id, {"total": 0, "completed": 0, "active": 0})
+                counts["total"] += n
+                self._count_task_status(task, status, n)
+        for group in groups:
+            # Counters may have moved without a change-feed event
+            collection = {"bins": "alerts"}.get(group, group)
+            self._versions[collection] = self._versions.get(collection, 0) + 1
+
+    def next_user_id(self) -> int:
+        return self.next_id("user")
+
+    def next_id(self, kind: str) -> int:
+        # Atomic across processes, unlike a counter in memory
+        with self._pool.connection() as conn:
+            return conn.execute(
+                "UPDATE id_counters SET value = value + 1 WHERE kind = ? RETURNING value", (kind,)).fetchone()[0]
+
+    def _locations(self, table: str) -> SpatialIndex:
+        index = SpatialIndex()
+        for row in self._rows(f"SELECT id, json_extract(doc, '$.latitude'), json_extract(doc, '$.longitude') "
+                              f"FROM {table} ORDER BY id"):
+            index.add(*row)
+        return index
+
+    # ── Row images ──
+
+    @staticmethod
+    def _alert_row(a: dict) -> tuple:
+        return a["id"], a["binId"], a["area"], a["status"], a["createdAt"], _dumps(a)
+
+    @staticmethod
+    def _complaint_row(c: dict) -> tuple:
+        return c["id"], c["userId"], c["status"], c["location"], c["createdAt"], _dumps(c)
+
+    @staticmethod
+    def _task_row(t: dict) -> tuple:
+        return t["id"], t["workerId"], t.get("complaintId"), t["status"], t["assignedAt"], _dumps(t)
+
+    # ── Users ──
+
+    def get_user(self, user_id: int):
+        return self._doc("SELECT doc FROM users WHERE id = ?", (user_id,))
+
+    def get_user_by_email(self, email: str):
+        return self._doc("SELECT doc FROM users WHERE email = ?", (email,))
+
+    def _insert_user(self, user: dict):
+        self._execute("INSERT INTO users VALUES (?, ?, ?, ?)", (user["id"], user["email"], user["role"], _dumps(user)))
+
+    def _delete_user(self, user_id: int):
+        user = self.get_user(user_id)
+        if user is not None:
+            self._execute("DELETE FROM users WHERE id = ?", (user_id,))
+        return user
+
+    # ── Bins & alerts ──
+
+    def _save_bins(self, rows: list):
+        bins = self.bins
+        # One commit for the whole batch, not one per row
+        with self._pool.transaction() as conn:
+            conn.executemany(
+                "UPDATE bins SET fillLevel = ?, status = ?, sensorBattery = ? WHERE id = ?",
+                [(b["fillLevel"], b["status"], b["sensorBattery"], b["id"]) for b in (bins[i] for i in rows)],
+            )
+
+    def get_alert(self, alert_id: int):
+        return self._doc("SELECT doc FROM alerts WHERE id = ?", (alert_id,))
+
+    def _insert_alert(self, alert: dict) -> bool:
+        # Check, id and insert in one write transaction: another worker may
+        # have raised an alert for the bin. alerts_active_bin backs this up.
+        with self._pool.transaction() as conn:
+            if conn.execute("SELECT EXISTS (SELECT 1 FROM alerts WHERE binId = ? AND status = 'active')",
+                            (alert["binId"],)).fetchone()[0]:
+                return False
+            alert["id"] = conn.execute(
+                "UPDATE id_counters SET value = value + 1 WHERE kind = 'alert' RETURNING value").fetchone()[0]
+            conn.execute("INSERT INTO alerts VALUES (?, ?, ?, ?, ?, ?)", self._alert_row(alert))
+        return True
+
+    def _save_alert(self, alert: dict):
+        self._execute("UPDATE alerts SET status = ?, doc = ? WHERE id = ?", (alert["status"], _dumps(alert), alert["id"]))
+
+    def _resolved_alerts_before(self, before: str) -> list:
+        return self._docs(
+            "SELECT doc FROM alerts WHERE status = 'resolved'"
+            " AND COALESCE(json_extract(doc, '$.resolvedAt'), createdAt) < ? ORDER BY createdAt, id", (before,))
+
+    def _delete_alerts(self, alerts: list):
+        with self._pool.transaction() as conn:
+            conn.executemany("DELETE FROM alerts WHERE id = ?", [(a["id"],) for a in alerts])
+
+    # ── Complaints ──
+
+    def get_complaint(self, complaint_id: int):
+        return self._doc("SELECT doc FROM complaints WHERE id = ?", (complaint_id,))
+
+    def complaint_index(self, user_id: int | None = None) -> SQLiteIndex:
+        if user_id is None:
+            return self.complaints_sorted
+        return SQLiteIndex(self._pool, "complaints", "createdAt", "userId = ?", (user_id,))
+
+    def _insert_complaint(self, complaint: dict):
+        self._execute("INSERT INTO complaints VALUES (?, ?, ?, ?, ?, ?)", self._complaint_row(complaint))
+
+    def _save_complaint(self, complaint: dict):
+        self._execute(
+            "UPDATE complaints SET status = ?, location = ?, doc = ? WHERE id = ?",
+            (complaint["status"], complaint["location"], _dumps(complaint), complaint["id"]),
+        )
+
+    def _resolved_complaints_before(self, before: str) -> list:
+        return self._docs(
+            "SELECT doc FROM complaints WHERE status = 'resolved'"
+            " AND COALESCE(json_extract(doc, '$.resolvedAt'), createdAt) < ? ORDER BY createdAt, id", (before,))
+
+    def _delete_complaints(self, complaints: list):
+        with self._pool.transaction() as conn:
+            conn.executemany("DELETE FROM complaints WHERE id = ?", [(c["id"],) for c in complaints])
+
+    # ── Tasks ──
+
+    def get_task(self, task_id: int):
+        return self._doc("SELECT doc FROM tasks WHERE id = ?", (task_id,))
+
+    def task_for_complaint(self, complaint_id: int):
+        return self._doc("SELECT doc FROM tasks WHERE complaintId = ? ORDER BY id LIMIT 1", (complaint_id,))
+
+    def tasks_for_complaint(self, complaint_id: int) -> list:
+        return self._docs("SELECT doc FROM tasks WHERE complaintId = ? ORDER BY id", (complaint_id,))
+
+    def task_index(self, worker_id: int | None = None) -> SQLiteIndex:
+        if worker_id is None:
+            return self.tasks_sorted
+        return SQLiteIndex(self._pool, "tasks", "assignedAt", "workerId = ?", (worker_id,))
+
+    def _insert_task(self, task: dict):
+        self._execute("INSERT INTO tasks VALUES (?, ?, ?, ?, ?, ?)", self._task_row(task))
+
+    def _save_task(self, task: dict):
+        self._execute(
+            "UPDATE tasks SET status = ?, doc = ? WHERE id = ?",
+            (task["status"], _dumps(task), task["id"]),
+        )
+
+    def _closed_tasks_before(self, before: str) -> list:
+        return self._docs(
+            "SELECT doc FROM tasks WHERE status = 'completed' AND json_extract(doc, '$.approved') = 1"
+            " AND COALESCE(json_extract(doc, '$.approvedAt'), json_extract(doc, '$.completedAt'), assignedAt) < ?"
+            " ORDER BY assignedAt, id", (before,))
+
+    def _delete_tasks(self, tasks: list):
+        with self._pool.transaction() as conn:
+            conn.executemany("DELETE FROM tasks WHERE id = ?", [(t["id"],) for t in tasks])
+
+    # ── Rewards ──
+
+    def get_rewards(self, user_id: int):
+        r = self._doc("SELECT doc FROM rewards WHERE userId = ?", (user_id,))
+        if r is not None:
+            r["history"] = deque(r["history"])
+        return r
+
+    def _save_rewards(self, user_id: int, rewards: dict):
+        self._execute("INSERT OR REPLACE INTO rewards VALUES (?, ?)", (user_id, _dumps({**rewards, "history": list(rewards["history"])})))
+
+    def _rewards_over(self, keep: int) -> list:
+        over = []
+        for user_id, doc in self._rows(
+                "SELECT userId, doc FROM rewards WHERE json_array_length(doc, '$.history') > ?", (keep,)):
+            r = json.loads(doc)
+            r["history"] = deque(r["history"])
+            over.append((user_id, r))
+        return over
+
+    def _save_assignments(self, assignments: list):
+        self._execute("INSERT OR REPLACE INTO settings VALUES ('assignments', ?)", (json.dumps(assignments),))
+
+    def _insert_collection_event(self, entry: dict):
+        self._execute("INSERT INTO collection_events (doc) VALUES (?)", (_dumps(entry),))
+
+    def _collection_events_before(self, before: str) -> list:
+        return self._docs(
+            "SELECT doc FROM collection_events WHERE json_extract(doc, '$.at') < ? ORDER BY id", (before,))
+
+    def _collection_summary(self):
+        return self._doc("SELECT doc FROM settings WHERE key = 'collectionSummary'")
+
+    def _delete_collection_events(self, before: str, summary: dict):
+        with self._pool.transaction() as conn:
+            conn.execute("DELETE FROM collection_events WHERE json_extract(doc, '$.at') < ?", (before,))
+            conn.execute("INSERT OR REPLACE INTO settings VALUES ('collectionSummary', ?)", (json.dumps(summary),))
+
+    # ── Persistence ──
+
+    # Every change is committed to the database as it happens, so a journal
+    # (app/persistence.py, which app/main.py only opens for the memory
+    # engine) has nothing to snapshot or restore here.
+
+    def dump_state(self) -> dict:
+        """Nothing to snapshot: the database is the durable state."""
+        return {}
+
+    def load_state(self, state: dict, reindex: bool = True):
+        """No-op: the database already holds the state a snapshot would restore."""
+
+    def replay(self, events):
+        """No-op: journaled events are already committed to the database."""
+
+    # ── Other workers (app/cluster.py) ──
+
+    def apply_remote(self, events: list):
+        """Bring the in-memory state up to date with changes other workers made.
+
+        Their records are already in the database; this updates the bin
+        columns, counters, spatial indexes and caches derived from them.
+        Created records are counted as they arrive; an update does not say
+        what changed, so its group's counters are recounted once per batch.
+        Requires write locks on every group the events belong to.
+        """
+        state = self.bin_state
+        recount = set()
+        for e in events:
+            type_, data = e["type"], e["data"]
+            if type_ == "bins.fill":
+                rows = np.array([state.index[i] for i in data["ids"]], dtype=np.int64)
+                fill = state.fill.copy()
+                fill[rows] = data["fillLevel"]
+                self._update_fill(fill, rows, None)
+            elif type_ == "bins.battery":
+                rows = np.array([state.index[i] for i in data["ids"]], dtype=np.int64)
+                self._update_battery(rows, np.array(data["sensorBattery"]))
+            elif type_ == "alert.created":
+                self._count_alert(data)
+            elif type_ == "alert.resolved":
+                active = self._active_alert_by_bin.get(data["binId"])
+                if active is not None and active["id"] == data["id"]:
+                    self._active_alerts -= 1
+                    del self._active_alert_by_bin[data["binId"]]
+                    state.alerted[state.index[data["binId"]]] = False
+                    state.recheck.add(state.index[data["binId"]])
+            elif type_ == "complaint.created":
+                self._count_complaint(data)
+            elif type_ == "complaint.updated":
+                recount.add("complaints")
+                self._linked_task_views.pop(data["id"], None)
+            elif type_ == "task.created":
+                self._count_task(data)
+                self._linked_task_views.pop(data.get("complaintId"), None)
+            elif type_ == "task.updated":
+                recount.add("tasks")
+                self._linked_task_views.pop(data.get("complaintId"), None)
+            elif type_ in ("complaints.archived", "tasks.archived"):
+                group = type_.partition(".")[0]
+                locations = self.complaint_locations if group == "complaints" else self.task_locations
+                for record_id in data["ids"]:
+                    locations.remove(record_id)
+                recount.add(group)
+                self._linked_task_views.clear()
+            elif type_ == "user.created":
+                self._count_user(data)
+            elif type_ == "user.removed":
+                self._workers.pop(data["id"], None)
+            elif type_ == "assignments.updated":
+                self.assignments = data
+            elif type_ == "collection.logged":
+                self.collection_log.add(data)
+        if recount:
+            self.recount(recount)
+
+    # ── Dashboard aggregates ──
+
+    def recent_complaints(self) -> list:
+        # Ties newest-first by insertion order, like the in-memory engine
+        return self._docs(
+            "SELECT doc FROM complaints ORDER BY createdAt DESC, id ASC LIMIT ?", (RECENT_LIMIT,))
+
+    def recent_tasks(self) -> list:
+        return self._docs("SELECT doc FROM tasks ORDER BY assignedAt DESC, id ASC LIMIT ?", (RECENT_LIMIT,))
+
+    def recompute_stats(self) -> dict:
+        """Recompute ``stats_summary()`` with SQL aggregates over the tables."""
+        def count(sql, params=()):
+            return self._rows(sql, params)[0][0]
+
+        worker_stats = []
+        for w in self._docs("SELECT doc FROM users WHERE role = 'worker' ORDER BY id"):
+            total, completed, active = self._rows(
+                "SELECT COUNT(*), COALESCE(SUM(status = 'completed'), 0),"
+                " COALESCE(SUM(status IN ('pending', 'in_progress')), 0) FROM tasks WHERE workerId = ?",
+                (w["id"],),
+            )[0]
+            worker_stats.append({
+                "id": w["id"],
+                "name": w["name"],
+                "totalTasks": total,
+                "completedTasks": completed,
+                "activeTasks": active,
+            })
+        bins = self.bins
+        return {
+            "totalBins": len(bins),
+            "fullBins": count("SELECT COUNT(*) FROM bins WHERE status IN ('full', 'overflow')"),
+            "fillTotal": count("SELECT COALESCE(SUM(fillLevel), 0) FROM bins"),
+            "pendingAlerts": count("SELECT COUNT(*) FROM alerts WHERE status = 'active'"),
+            "pendingComplaints": count("SELECT COUNT(*) FROM complaints WHERE status = 'pending'"),
+            "inProgressComplaints": count("SELECT COUNT(*) FROM complaints WHERE status = 'in_progress'"),
+            "resolvedComplaints": count("SELECT COUNT(*) FROM complaints WHERE status = 'resolved'"),
+            "totalComplaints": count("SELECT COUNT(*) FROM complaints"),
+            "activeWorkers": len(worker_stats),
+            "totalTasks": count("SELECT COUNT(*) FROM tasks"),
+            "pendingTasks": count("SELECT COUNT(*) FROM tasks WHERE status = 'pending'"),
+            "inProgressTasks": count("SELECT COUNT(*) FROM tasks WHERE status = 'in_progress'"),
+            "completedTasks": count("SELECT COUNT(*) FROM tasks WHERE status = 'completed'"),
+            "recentComplaints": self.recent_complaints(),
+            "recentTasks": self.recent_tasks(),
+            "workerStats": worker_stats,
+            "areaComplaints": dict(self._rows("SELECT location, COUNT(*) FROM complaints GROUP BY location")),
+        }
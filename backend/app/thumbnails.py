@@ -0,0 +1,136 @@
+"""Background WebP thumbnails for uploaded photos.
+
+Uploads enqueue the new file; a process pool (kept off the request path
+and out of the GIL) writes ``<stem>.<size>.webp`` variants next to the
+original in ``uploads/``. The queue is bounded: when it is full, new work
+is dropped and counted instead of piling up, and a request for a variant
+that does not exist yet gets the original while the variant is re-queued.
+
+This module is imported by the pool workers, so it must not import the
+data store.
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from .config import THUMBNAIL_QUEUE_SIZE, THUMBNAIL_WORKERS
+from .uploads import UPLOAD_DIR
+
+# Variant name -> longest side in pixels
+SIZES = {"thumb": 240, "medium": 1280}
+WEBP_QUALITY = 80
+IMAGE_EXTENSIONS = ("jpg", "jpeg", "png", "webp", "gif")
+
+
+def variant_name(filename: str, size: str) -> str:
+    return f"{filename.rsplit('.', 1)[0]}.{size}.webp"
+
+
+def is_image(filename: str) -> bool:
+    return filename.rsplit(".", 1)[-1].lower() in IMAGE_EXTENSIONS
+
+
+def render_variants(directory: str, filename: str) -> list:
+    """Write every ``SIZES`` variant of one image; runs in a pool worker."""
+    from PIL import Image, ImageOps
+
+    written = []
+    with Image.open(os.path.join(directory, filename)) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+        for size, pixels in SIZES.items():
+            variant = image.copy()
+            variant.thumbnail((pixels, pixels), Image.Resampling.LANCZOS)
+            name = variant_name(filename, size)
+            tmp = os.path.join(directory, f".{name}.part")
+            variant.save(tmp, "WEBP", quality=WEBP_QUALITY, method=4)
+            os.replace(tmp, os.path.join(directory, name))
+            written.append(name)
+    return written
+
+
+class ThumbnailPipeline:
+    """Bounded queue in front of a lazily started process pool."""
+
+    def __init__(self, directory: str = UPLOAD_DIR, workers: int = THUMBNAIL_WORKERS,
+                 max_queue: int = THUMBNAIL_QUEUE_SIZE):
+        self.directory = directory
+        self.workers = workers
+        self.max_queue = max_queue
+        self._pool = None
+        self._lock = threading.Lock()
+        self._in_flight = set()
+        self._unreadable = set()  # failed once; not retried on every ?size= request
+        self._metrics = {"submitted": 0, "completed": 0, "failed": 0, "dropped": 0, "highWater": 0}
+        self._latency_total = 0.0
+
+    def submit(self, filename: str) -> bool:
+        """Queue variants for an uploaded image; False if skipped or the queue is full."""
+        if not is_image(filename):
+            return False
+        with self._lock:
+            if filename in self._in_flight:
+                return True
+            if filename in self._unreadable:
+                return False
+            if len(self._in_flight) >= self.max_queue:
+                self._metrics["dropped"] += 1
+                return False
+            if self._pool is None:
+                # spawn, not fork: the server process is multi-threaded
+                self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            pool = self._pool
+            try:
+                future = pool.submit(render_variants, self.directory, filename)
+            except BrokenProcessPool:
+                # A worker died; start a fresh pool on the next upload
+                self._pool = None
+                self._metrics["failed"] += 1
+                return False
+            self._in_flight.add(filename)
+            self._metrics["submitted"] += 1
+            self._metrics["highWater"] = max(self._metrics["highWater"], len(self._in_flight))
+            started = time.perf_counter()
+        future.add_done_callback(lambda f: self._done(filename, started, pool, f))
+        return True
+
+    def _done(self, filename: str, started: float, pool, future):
+        with self._lock:
+            self._in_flight.discard(filename)
+            self._latency_total += time.perf_counter() - started
+            error = None if future.cancelled() else future.exception()
+            if error is None and not future.cancelled():
+                self._metrics["completed"] += 1
+                return
+            self._metrics["failed"] += 1
+            if isinstance(error, BrokenProcessPool):
+                if self._pool is pool:
+                    self._pool = None
+            elif error is not None:
+                self._unreadable.add(filename)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            finished = self._metrics["completed"] + self._metrics["failed"]
+            return {
+                **self._metrics,
+                "queued": len(self._in_flight),
+                "maxQueue": self.max_queue,
+                "workers": self.workers,
+                # Time from submit to finish, including time spent queued
+                "avgLatencyMs": round(self._latency_total / finished * 1000, 1) if finished else None,
+            }
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+thumbnails = ThumbnailPipeline()
@@ -0,0 +1,63 @@
+"""Media uploads — streamed to disk, size-limited and content-addressed.
+
+Files are stored as ``<sha256>.<ext>`` in ``UPLOAD_DIR``, so uploading the
+same photo twice keeps a single copy. Each upload is written to a temporary
+file in the same directory and renamed into place once complete, so a
+reader never sees a partial file.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+
+from .config import MAX_UPLOAD_BYTES, UPLOAD_CHUNK_BYTES
+
+UPLOAD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "uploads")
+os.makedirs(UPLOAD_DIR, exist_ok=True)
+
+_EXTENSION = re.compile(r"[a-z0-9]{1,8}")
+
+
+class UploadTooLarge(ValueError):
+    """Raised when an upload exceeds ``MAX_UPLOAD_BYTES``."""
+
+
+def extension(filename: str | None, default: str) -> str:
+    """Lower-cased extension of ``filename``, or ``default`` when missing or odd."""
+    ext = filename.rsplit(".", 1)[-1].lower() if filename and "." in filename else ""
+    return ext if _EXTENSION.fullmatch(ext) else default
+
+
+def save_upload(src, ext: str, max_bytes: int = MAX_UPLOAD_BYTES) -> dict:
+    """Copy the binary file object ``src`` into ``UPLOAD_DIR`` chunk by chunk.
+
+    Blocking — call it from a sync route (threadpool), never on the event
+    loop. Returns ``{"filename", "sha256", "size"}``; raises ``UploadTooLarge``
+    (leaving nothing behind) once more than ``max_bytes`` have been read.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp = tempfile.mkstemp(dir=UPLOAD_DIR, prefix=".upload-", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while chunk := src.read(UPLOAD_CHUNK_BYTES):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(f"File exceeds the {max_bytes // (1024 * 1024)} MB upload limit")
+                digest.update(chunk)
+                out.write(chunk)
+            out.flush()
+            os.fsync(out.fileno())
+        sha256 = digest.hexdigest()
+        filename = f"{sha256}.{ext}"
+        path = os.path.join(UPLOAD_DIR, filename)
+        if os.path.exists(path):
+            os.remove(tmp)  # identical content is already stored
+        else:
+            os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return {"filename": filename, "sha256": sha256, "size": size}
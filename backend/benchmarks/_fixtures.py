@@ -0,0 +1,31 @@
+"""Shared helpers for benchmarks — grow the in-memory store to a target size."""
+
+import random
+
+from app.bin_state import bin_status
+from app.data_store import store
+
+AREAS = ["Central", "South", "East", "West", "North"]
+# Baramati and surroundings, roughly 11 km x 13 km
+CITY_BOUNDS = (18.10, 74.52, 18.20, 74.64)
+
+
+def seed_bins(n: int, seed: int = 7):
+    """Extend ``store.bins`` to ``n`` bins and rebuild the indexes."""
+    rng = random.Random(seed)
+    south, west, north, east = CITY_BOUNDS
+    with store.write("users", "tasks", "complaints", "bins"):
+        for i in range(len(store.bins) + 1, n + 1):
+            fill = rng.randint(0, 60)
+            store.bins.append({
+                "id": i,
+                "location": f"Sensor site {i}",
+                "area": rng.choice(AREAS),
+                "latitude": round(rng.uniform(south, north), 6),
+                "longitude": round(rng.uniform(west, east), 6),
+                "fillLevel": fill,
+                "status": bin_status(fill),
+                "lastCollected": "2026-02-16T08:30:00",
+                "sensorBattery": rng.randint(40, 100),
+            })
+        store._build_indexes()
@@ -0,0 +1,102 @@
+"""Alert engine — evaluation cost per tick, flapping, and archival.
+
+    python -m benchmarks.bench_alerts [bins] [changed_per_tick]
+
+1. Ticks where ``changed_per_tick`` random bins get a new reading: time to
+   apply them and evaluate alerts for the changed rows only, against
+   evaluating every bin.
+2. 1,000 bins reporting 80% +- 4 (noise) for 100 ticks: alerts raised
+   with the hysteresis band against a single threshold.
+3. Archiving every resolved alert: time, archive size, and the first two
+   pages of GET /api/alerts/archived.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from app import alerts
+from app.archive import Archive
+from app.bin_state import ALERT_THRESHOLD
+from app.data_store import store
+from app.paging import paginate
+
+from ._fixtures import seed_bins
+
+TICKS = 50
+
+
+def tick(rows: np.ndarray, fill: np.ndarray, evaluate_all: bool) -> tuple:
+    """Seconds to apply the readings, and to evaluate alerts afterwards."""
+    with store.write("bins"):
+        new_fill = store.bin_state.fill.copy()
+        new_fill[rows] = fill
+        t = time.perf_counter()
+        changed = store.apply_fill_levels(new_fill, rows)
+        applied = time.perf_counter()
+        alerts.evaluate_alerts(np.arange(len(new_fill)) if evaluate_all else changed)
+        return applied - t, time.perf_counter() - applied
+
+
+def flapping(rng, clear_threshold: int) -> int:
+    default, alerts.ALERT_CLEAR_THRESHOLD = alerts.ALERT_CLEAR_THRESHOLD, clear_threshold
+    rows = np.arange(1000)
+    raised = 0
+    try:
+        for _ in range(100):
+            with store.write("bins"):
+                new_fill = store.bin_state.fill.copy()
+                new_fill[rows] = np.clip(np.round(rng.normal(80, 4, len(rows))), 0, 100)
+                changed = store.apply_fill_levels(new_fill, rows)
+                raised += len(alerts.evaluate_alerts(changed)["raised"])
+    finally:
+        alerts.ALERT_CLEAR_THRESHOLD = default
+    return raised
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    per_tick = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+    rng = np.random.default_rng(2)
+    seed_bins(n)
+    store.archive = Archive(tempfile.mkdtemp(prefix="bench-archive-"))
+
+    print(f"bins={n:,} changed per tick={per_tick:,}")
+    for evaluate_all, label in ((False, "changed rows"), (True, "every bin")):
+        seconds = []
+        for _ in range(TICKS):
+            rows = rng.choice(n, per_tick, replace=False)
+            seconds.append(tick(rows, rng.integers(0, 101, per_tick), evaluate_all))
+        apply_s, evaluate_s = np.median(seconds, axis=0)
+        print(f"tick     {evaluate_s * 1e3:8.2f} ms median to evaluate {label} "
+              f"(apply {apply_s * 1e3:.2f} ms)")
+
+    for clear, label in ((alerts.ALERT_CLEAR_THRESHOLD, f"hysteresis {alerts.ALERT_CLEAR_THRESHOLD}-{ALERT_THRESHOLD}"),
+                         (ALERT_THRESHOLD, f"single threshold {ALERT_THRESHOLD}")):
+        print(f"flapping {flapping(rng, clear):8,} alerts raised  ({label}, 1,000 noisy bins x 100 ticks)")
+
+    with store.write("bins"):
+        hot = len(store.alerts)
+        for bin_id in store.bin_state.ids[store.bin_state.alerted].tolist():
+            store.resolve_alert(store.active_alert_for_bin(bin_id))
+        t = time.perf_counter()
+        moved = store.archive_alerts("9999")
+        archive_s = time.perf_counter() - t
+    size = sum(os.path.getsize(os.path.join(store.archive.root, f)) for f in os.listdir(store.archive.root))
+    print(f"archive  {archive_s * 1e3:8.1f} ms for {moved:,} of {hot:,} alerts "
+          f"({size / max(moved, 1):.0f} B each on disk), {len(store.alerts):,} left in memory")
+    index = store.archive.index("alerts", "createdAt")
+    cursor = None
+    for label in ("first page (decodes the month)", "next page (cached)"):
+        t = time.perf_counter()
+        page, cursor = paginate(index, limit=100, cursor=cursor)
+        print(f"query    {(time.perf_counter() - t) * 1e3:8.2f} ms archived alerts, {label}")
+    shutil.rmtree(store.archive.root)
+
+
+if __name__ == "__main__":
+    main()
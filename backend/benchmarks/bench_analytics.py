@@ -0,0 +1,69 @@
+"""Collection analytics — folding the log into day buckets and range queries.
+
+    python -m benchmarks.bench_analytics [entries] [days]
+
+Builds a ``CollectionLog`` from ``entries`` synthetic collections and
+complaint resolutions spread over ``days`` days (as on startup), then
+times appends and /api/stats/analytics-style summaries over 7, 30 and
+365 days.
+"""
+
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+from app.analytics import CollectionLog
+
+from ._fixtures import AREAS
+
+WORKERS = 50
+REPEAT = 50
+
+
+def make_entries(n: int, days: int, end: date) -> list:
+    rng = random.Random(11)
+    start = datetime.combine(end - timedelta(days=days - 1), datetime.min.time())
+    entries = []
+    for _ in range(n):
+        at = (start + timedelta(seconds=rng.uniform(0, days * 86400))).isoformat()
+        if rng.random() < 0.1:
+            entries.append({"type": "complaint_resolved", "at": at, "complaintId": rng.randint(1, 10**6),
+                            "resolutionSeconds": rng.uniform(600, 7 * 86400)})
+        else:
+            worker = rng.randint(1, WORKERS)
+            entries.append({"type": "collection", "at": at, "binId": rng.randint(1, 10**5),
+                            "area": rng.choice(AREAS), "workerId": worker, "workerName": f"Worker {worker}",
+                            "responseSeconds": rng.uniform(60, 6 * 3600) if rng.random() < 0.5 else None})
+    return entries
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 365
+    today = date.today()
+    entries = make_entries(n, days, today)
+
+    t = time.perf_counter()
+    log = CollectionLog(entries)
+    build_s = time.perf_counter() - t
+    print(f"entries={n:,} over {days} days")
+    print(f"build    {build_s * 1e3:9.1f} ms  ({n / build_s:,.0f} entries/s)")
+
+    extra = make_entries(10_000, 1, today)
+    t = time.perf_counter()
+    for entry in extra:
+        log.add(entry)
+    print(f"append   {(time.perf_counter() - t) / len(extra) * 1e6:9.2f} us per entry")
+
+    for span in (7, 30, 365):
+        start = today - timedelta(days=span - 1)
+        t = time.perf_counter()
+        for _ in range(REPEAT):
+            summary = log.summary(start, today)
+        ms = (time.perf_counter() - t) / REPEAT * 1e3
+        print(f"summary  {ms:9.3f} ms  {span:>3} days ({summary['collections']:,} collections)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Per-request auth overhead of get_current_user — old scan path, cold decode, cached.
+
+    python -m benchmarks.bench_auth [iterations] [users]
+"""
+
+import sys
+import time
+
+from jose import jwt
+
+from app.auth import create_access_token, token_cache, user_from_token
+from app.config import ALGORITHM, SECRET_KEY
+from app.data_store import store
+
+
+def seed_users(n: int) -> int:
+    """Add ``n`` citizens; returns the last id."""
+    with store.write("users"):
+        for _ in range(n):
+            uid = store.next_user_id()
+            store.add_user({"id": uid, "name": f"Citizen {uid}", "email": f"c{uid}@example.com",
+                            "password": "x", "role": "citizen"})
+    return uid
+
+
+def timed(fn, iterations: int) -> float:
+    t = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - t) / iterations * 1e6
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    users = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    last = seed_users(users)
+    token = create_access_token({"sub": f"c{last}@example.com"})
+
+    def linear_scan():
+        # The pre-index path: decode, then scan store.users by email
+        email = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])["sub"]
+        with store.read("users"):
+            next(u for u in store.users if u["email"] == email)
+
+    def cold():
+        token_cache.clear()
+        user_from_token(token)
+
+    scan_us = timed(linear_scan, max(1, iterations // 50))
+    cold_us = timed(cold, iterations)
+    user_from_token(token)
+    warm_us = timed(lambda: user_from_token(token), iterations)
+    print(f"users={len(store.users)} iterations={iterations}")
+    print(f"jwt.decode + linear scan   {scan_us:8.2f} us/request  (before)")
+    print(f"jwt.decode + index lookup  {cold_us:8.2f} us/request")
+    print(f"token cache hit            {warm_us:8.2f} us/request  ({scan_us / warm_us:.0f}x faster than before)")
+
+
+if __name__ == "__main__":
+    main()
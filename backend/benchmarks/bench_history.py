@@ -0,0 +1,79 @@
+"""Fill history — memory per bin-day, recording throughput and query latency.
+
+    python -m benchmarks.bench_history [bins] [days] [interval_s]
+
+Records ``days`` of readings (one per bin every ``interval_s`` seconds)
+ending now, one ``record`` call per round as the ingest path does, then
+times chart queries at each resolution for one bin, one area and the city.
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from app.history import FillHistory
+
+AREAS = 5
+REPEAT = 20
+
+
+def timed(fn) -> float:
+    fn()
+    t = time.perf_counter()
+    for _ in range(REPEAT):
+        fn()
+    return (time.perf_counter() - t) / REPEAT * 1e3
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    days = float(sys.argv[2]) if len(sys.argv) > 2 else 2
+    interval = int(sys.argv[3]) if len(sys.argv) > 3 else 300
+    rng = np.random.default_rng(5)
+    history = FillHistory(n)
+    rows = np.arange(n)
+    area_rows = np.flatnonzero(rng.integers(0, AREAS, n) == 0)
+    rate = rng.uniform(0.5, 4, n)  # percent per hour
+    fill = rng.uniform(0, 80, n)
+
+    end = time.time()
+    start = end - days * 86400
+    rounds = np.arange(start, end, interval)
+    record_s = 0.0
+    for at in rounds:
+        fill += rate * interval / 3600
+        fill[fill >= 95] = 0
+        t = time.perf_counter()
+        history.record(rows, fill.astype(np.uint8), at, end)
+        record_s += time.perf_counter() - t
+
+    readings = n * len(rounds)
+    print(f"bins={n:,} readings={readings:,} over {days:g} days (every {interval} s)")
+    print(f"record   {record_s / len(rounds) * 1e3:8.2f} ms per round ({readings / record_s:,.0f} readings/s)")
+    print(f"memory   {history.nbytes / n:8,.0f} B per bin allocated ({history.nbytes / 2**20:,.1f} MiB)")
+    raw_bytes = (history.raw_time.nbytes + history.raw_fill.nbytes + history.raw_next.nbytes) / n
+    print(f"         {'raw':>4} {raw_bytes:8,.0f} B per bin ({len(history.raw_time)} readings)")
+    for tier in history.tiers:
+        per_bucket = tier.nbytes / tier.slots / n
+        print(f"         {tier.name:>4} {per_bucket * 86400 / tier.width:8,.0f} B per bin-day "
+              f"(kept {tier.slots * tier.width / 86400:g} days)")
+
+    day, hour = 86400, 3600
+    queries = [
+        ("bin, 1 h raw", lambda: history.raw(7, end - hour, end)),
+        ("bin, 24 h @1m", lambda: history.series(7, end - day, end, "1m")),
+        ("bin, 30 d @1h", lambda: history.series(7, end - 30 * day, end, "1h")),
+        ("bin, 1 y @1d", lambda: history.series(7, end - 365 * day, end, "1d")),
+        (f"area ({len(area_rows):,} bins), 6 h @1m", lambda: history.series(area_rows, end - 6 * hour, end, "1m")),
+        (f"area ({len(area_rows):,} bins), 7 d @1h", lambda: history.series(area_rows, end - 7 * day, end, "1h")),
+        (f"city ({n:,} bins), 24 h @1h", lambda: history.series(slice(None), end - day, end, "1h")),
+        (f"city ({n:,} bins), 30 d @1d", lambda: history.series(slice(None), end - 30 * day, end, "1d")),
+    ]
+    for name, query in queries:
+        points = len(query())
+        print(f"query    {timed(query):8.3f} ms  {name} -> {points} points")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Sustained throughput of POST /api/bins/readings (parse + apply, in-process).
+
+    python -m benchmarks.bench_ingest [bins] [batch_size] [batches]
+"""
+
+import json
+import sys
+import time
+
+from app.ingest import apply_readings, parse_readings
+
+from ._fixtures import seed_bins
+
+
+def make_batch(n_bins: int, size: int, t0: float, rng_state: int) -> bytes:
+    lines = []
+    for k in range(size):
+        bin_id = (rng_state * 7919 + k * 104729) % n_bins + 1
+        lines.append(json.dumps({
+            "bin_id": bin_id,
+            "fill_level": (k * 37 + rng_state) % 101,
+            "battery": 90,
+            "timestamp": t0 + k * 1e-3,
+        }))
+    return "\n".join(lines).encode()
+
+
+def main():
+    n_bins = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    batches = int(sys.argv[3]) if len(sys.argv) > 3 else 40
+    seed_bins(n_bins)
+
+    payloads = [make_batch(n_bins, batch_size, 1e9 + i * 10, i) for i in range(batches)]
+    parse_s = apply_s = 0.0
+    for body in payloads:
+        t = time.perf_counter()
+        batch = parse_readings(body, "application/x-ndjson")
+        parse_s += time.perf_counter() - t
+        t = time.perf_counter()
+        apply_readings(**batch)
+        apply_s += time.perf_counter() - t
+
+    total = batch_size * batches
+    print(f"bins={n_bins} batch={batch_size} batches={batches}")
+    print(f"parse  {parse_s * 1e3:8.1f} ms  {total / parse_s:12,.0f} readings/s")
+    print(f"apply  {apply_s * 1e3:8.1f} ms  {total / apply_s:12,.0f} readings/s")
+    print(f"total  {(parse_s + apply_s) * 1e3:8.1f} ms  {total / (parse_s + apply_s):12,.0f} readings/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Media serving throughput with concurrent clients — bare FileResponse vs serve_media.
+
+    python -m benchmarks.bench_media [clients] [seconds]
+
+Starts uvicorn in a subprocess with both handlers and measures a dashboard
+re-fetching photos it already has, and a video player seeking in 1 MB steps.
+The client runs on the same machine, so compare the two handlers rather
+than reading the absolute numbers.
+"""
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import FileResponse
+
+from app.media import serve_media
+from app.uploads import UPLOAD_DIR
+
+PHOTO = "bench-photo.jpg"
+VIDEO = "bench-video.mp4"
+PHOTO_BYTES = 300 * 1024
+VIDEO_BYTES = 64 * 1024 * 1024
+SEEK_BYTES = 1024 * 1024
+
+bench_app = FastAPI()
+
+
+@bench_app.get("/bare/{filename}")
+def bare(filename: str):
+    # The handler before the media layer
+    filepath = os.path.join(UPLOAD_DIR, filename)
+    if not os.path.exists(filepath):
+        raise HTTPException(404, "File not found")
+    return FileResponse(filepath)
+
+
+@bench_app.get("/media/{filename}")
+def media(filename: str, request: Request):
+    return serve_media(request, filename)
+
+
+async def load(port: int, path: str, clients: int, seconds: float, headers_for) -> tuple:
+    """Return (requests/s, MB/s received) for ``clients`` looping on GET ``path``."""
+    done = 0
+    received = 0
+    deadline = time.perf_counter() + seconds
+
+    async def client(http, i):
+        nonlocal done, received
+        n = 0
+        while time.perf_counter() < deadline:
+            r = await http.get(path, headers=headers_for(i, n))
+            assert r.status_code in (200, 206, 304), r.status_code
+            received += len(r.content)
+            done += 1
+            n += 1
+
+    limits = httpx.Limits(max_connections=clients)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as http:
+        started = time.perf_counter()
+        await asyncio.gather(*(client(http, i) for i in range(clients)))
+        elapsed = time.perf_counter() - started
+    return done / elapsed, received / elapsed / 1e6
+
+
+async def run(port: int, clients: int, seconds: float):
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as http:
+        etag = (await http.get(f"/media/{PHOTO}")).headers["etag"]
+
+    def no_headers(i, n):
+        return {}
+
+    def revalidate(i, n):
+        return {"If-None-Match": etag}
+
+    def seek(i, n):
+        start = ((i * 7 + n) * SEEK_BYTES) % (VIDEO_BYTES - SEEK_BYTES)
+        return {"Range": f"bytes={start}-{start + SEEK_BYTES - 1}"}
+
+    cases = [
+        ("photo, first load", PHOTO, no_headers, no_headers),
+        ("photo, revisit", PHOTO, no_headers, revalidate),
+        ("video, 1 MB seek", VIDEO, seek, seek),
+    ]
+    print(f"{clients} clients, {seconds:.0f} s per case")
+    print(f"{'case':<20} {'handler':<8} {'req/s':>10} {'MB/s':>10}")
+    for name, filename, bare_headers, media_headers in cases:
+        for handler, headers_for in (("bare", bare_headers), ("media", media_headers)):
+            rps, mbps = await load(port, f"/{handler}/{filename}", clients, seconds, headers_for)
+            print(f"{name:<20} {handler:<8} {rps:>10,.0f} {mbps:>10,.1f}")
+
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    files = {PHOTO: PHOTO_BYTES, VIDEO: VIDEO_BYTES}
+    for name, size in files.items():
+        with open(os.path.join(UPLOAD_DIR, name), "wb") as f:
+            f.write(os.urandom(size))
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = subprocess.Popen([sys.executable, "-m", "uvicorn", "benchmarks.bench_media:bench_app",
+                               "--port", str(port), "--log-level", "warning"])
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(f"http://127.0.0.1:{port}/docs")
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        asyncio.run(run(port, clients, seconds))
+    finally:
+        server.terminate()
+        server.wait()
+        for name in files:
+            os.remove(os.path.join(UPLOAD_DIR, name))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Journal write throughput and startup recovery time.
+
+    python -m benchmarks.bench_persistence [complaints] [tail_events]
+"""
+
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from app.data_store import LOCK_ORDER, store
+from app.persistence import Journal
+
+
+def add_complaints(n: int):
+    for _ in range(n):
+        with store.write("complaints"):
+            store.add_complaint({
+                "id": store.next_id("complaint"), "userId": 4, "userName": "Amit Patel",
+                "location": "Supe Road", "description": "Overflowing bin near the bus stop",
+                "latitude": 18.15, "longitude": 74.57, "mediaUrls": [], "status": "pending",
+                "response": None, "respondedAt": None, "createdAt": datetime.now().isoformat(),
+            })
+
+
+def main():
+    complaints = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    tail = int(sys.argv[2]) if len(sys.argv) > 2 else 50_000
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        journal = Journal(store, data_dir)
+        journal.open()
+
+        t = time.perf_counter()
+        add_complaints(complaints)
+        write_s = time.perf_counter() - t
+        print(f"journaled writes   {complaints / write_s:12,.0f} mutations/s")
+
+        t = time.perf_counter()
+        journal.snapshot()
+        print(f"snapshot           {(time.perf_counter() - t) * 1e3:10.0f} ms  ({len(store.complaints):,} complaints)")
+
+        add_complaints(tail)
+        # Stop without a final snapshot, as after a crash
+        journal.close(snapshot=False)
+
+        recovered = Journal(store, data_dir).recover()
+        with store.read(*LOCK_ORDER):
+            assert len(store.complaints) == complaints + tail + 3
+        print(f"recovery           {recovered['seconds'] * 1e3:10.0f} ms  "
+              f"(snapshot + {recovered['replayedEvents']:,} journal events)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Record layout — memory and speed per complaint as a dict and as a slotted class.
+
+    python -m benchmarks.bench_records [complaints]      (default: 1000000)
+
+Builds ``complaints`` records of the shape ``POST /api/complaints/`` creates
+(a unique id, description and timestamp each) once as the dicts the store
+keeps and once as a ``__slots__`` class with the same fields, and reports
+the traced bytes per record (values included), the size of the container
+alone, a status scan through ``r["status"]`` and encoding a 500-record
+page with ``app.responses.dumps``. The slotted class keeps the subscript
+protocol the routes use, the cheapest way it can (``object.__getattribute__``
+as ``__getitem__``), and is encoded through its ``to_dict()``.
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from app.responses import dumps
+
+AREAS = ["Supe Road", "Market Yard Baramati", "Shivaji Chowk", "Bhigwan Road Chowk", "Jalochi Road"]
+STATUSES = ["pending", "in_progress", "resolved"]
+REPEAT = 5
+
+
+class SlottedComplaint:
+    __slots__ = ("id", "userId", "userName", "location", "description", "latitude", "longitude", "mediaUrls",
+                 "status", "response", "respondedAt", "createdAt")
+
+    def __init__(self, data: dict):
+        for name in self.__slots__:
+            object.__setattr__(self, name, data[name])
+
+    __getitem__ = object.__getattribute__
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def fields(i: int, start: datetime) -> dict:
+    return {
+        "id": i, "userId": 100 + i % 5_000, "userName": "Citizen", "location": AREAS[i % len(AREAS)],
+        "description": f"Overflowing bin near stop {i}", "latitude": 18.15 + i % 1000 * 1e-5,
+        "longitude": 74.57 - i % 1000 * 1e-5, "mediaUrls": [], "status": STATUSES[i % 3],
+        "response": None, "respondedAt": None, "createdAt": (start + timedelta(seconds=i * 30)).isoformat(),
+    }
+
+
+def build(n: int, make) -> tuple:
+    """``(records, traced bytes)`` of ``n`` records built with ``make``."""
+    start = datetime(2026, 1, 1)
+    gc.collect()
+    tracemalloc.start()
+    records = [make(fields(i, start)) for i in range(1, n + 1)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return records, size
+
+
+def timed(fn) -> float:
+    """Median milliseconds per call."""
+    samples = []
+    for _ in range(REPEAT):
+        t = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t)
+    return float(np.median(samples)) * 1e3
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"complaints={n:,}")
+    print(f"{'record':<10}{'bytes/rec':>10}{'container':>10}{'scan ms':>9}{'500 → JSON ms':>15}")
+    for label, make in (("dict", dict), ("slotted", SlottedComplaint)):
+        records, size = build(n, make)
+        scan = timed(lambda: sum(1 for r in records if r["status"] == "resolved"))
+        page = records[:500]
+        encode = timed(lambda: dumps(page if label == "dict" else [r.to_dict() for r in page]))
+        print(f"{label:<10}{size / n:10.0f}{sys.getsizeof(records[0]):10}{scan:9.1f}{encode:15.3f}")
+        del records, page
+
+
+if __name__ == "__main__":
+    main()
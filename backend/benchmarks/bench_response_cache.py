@@ -0,0 +1,84 @@
+"""Versioned response cache — cost of a dashboard poll with and without it.
+
+    python -m benchmarks.bench_response_cache [bins]
+
+For /api/stats/, /api/bins/ (every bin and a 100-bin page) and
+/api/alerts/ (100 newest), times the handler body as it was (build, then
+FastAPI's ``jsonable_encoder`` + ``JSONResponse``), a cache miss (build +
+orjson + ETag), a cache hit, and a 304 for a matching ``If-None-Match``.
+"""
+
+import sys
+import time
+from datetime import date
+
+import numpy as np
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app import alerts
+from app.data_store import LOCK_ORDER, store
+from app.paging import paginate, project
+from app.response_cache import cached_json, response_cache
+from app.routes.stats_routes import STATS_COLLECTIONS, _stats
+
+from ._fixtures import seed_bins
+
+REPEAT = 50
+
+
+def request(path: str, query: str = "", etag: str | None = None) -> Request:
+    headers = [(b"if-none-match", etag.encode())] if etag else []
+    return Request({"type": "http", "method": "GET", "path": path, "query_string": query.encode(), "headers": headers})
+
+
+def timed(fn) -> float:
+    """Median milliseconds per call."""
+    samples = []
+    for _ in range(REPEAT):
+        t = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t)
+    return float(np.median(samples)) * 1e3
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    seed_bins(n)
+    with store.write("bins"):
+        # Raise alerts on a fifth of the bins so the alert list has content
+        state = store.bin_state
+        fill = state.fill.copy()
+        fill[::5] = 90
+        alerts.evaluate_alerts(store.apply_fill_levels(fill))
+    today = date.today()
+    endpoints = [
+        ("stats", "/api/stats/", "", STATS_COLLECTIONS, lambda: _stats(today), today),
+        ("bins (all)", "/api/bins/", "", ("bins",),
+         lambda: project(paginate(store.bins_sorted, descending=False)[0], None), None),
+        ("bins (100)", "/api/bins/", "limit=100", ("bins",),
+         lambda: project(paginate(store.bins_sorted, limit=100, descending=False)[0], None), None),
+        ("alerts (100)", "/api/alerts/", "limit=100", ("alerts",),
+         lambda: project(paginate(store.alerts_sorted, limit=100)[0], None), None),
+    ]
+    print(f"bins={n:,} alerts={len(store.alerts):,}")
+    print(f"{'endpoint':<14}{'before ms':>11}{'miss ms':>10}{'hit ms':>9}{'304 ms':>9}{'bytes':>12}")
+    with store.read(*LOCK_ORDER):
+        for label, path, query, collections, build, vary in endpoints:
+            before = timed(lambda: JSONResponse(jsonable_encoder(build())).body)
+
+            def miss():
+                response_cache.clear()
+                return cached_json(request(path, query), Response(), collections, build, vary)
+
+            miss_ms = timed(miss)
+            first = miss()
+            hit = timed(lambda: cached_json(request(path, query), Response(), collections, build, vary))
+            etag = first.headers["etag"]
+            not_modified = timed(lambda: cached_json(request(path, query, etag), Response(), collections, build, vary))
+            print(f"{label:<14}{before:11.3f}{miss_ms:10.3f}{hit:9.3f}{not_modified:9.3f}{len(first.body):12,}")
+
+
+if __name__ == "__main__":
+    main()
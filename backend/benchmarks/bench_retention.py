@@ -0,0 +1,96 @@
+"""Retention — memory of the hot store under a steady complaint workload.
+
+    python -m benchmarks.bench_retention [rounds] [per_round]      (default: 8 x 10000)
+
+Each round files ``per_round`` complaints from 200 citizens, assigns each
+a task, completes and approves the task, resolves the complaint and awards
+the points, through the same ``DataStore`` mutators the routes use. Run
+once without retention and once archiving everything closed after every
+round (a cutoff of "now" stands in for ``RECORD_ARCHIVE_AFTER_DAYS``), and
+report the records, reward history and collection-log entries left in
+memory and the traced memory per round. Archive times are inflated
+several-fold by tracemalloc.
+"""
+
+import gc
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from app.archive import Archive
+from app.config import REWARD_HISTORY_LIMIT
+from app.data_store import store
+
+from ._fixtures import AREAS
+
+CITIZENS = 200
+
+
+def run_round(n: int, rng_offset: int):
+    now = datetime.now().isoformat()
+    with store.write("tasks", "complaints"):
+        for i in range(n):
+            user_id = 1_000 + (rng_offset + i) % CITIZENS
+            c = store.add_complaint({
+                "id": store.next_id("complaint"), "userId": user_id, "userName": "Citizen",
+                "location": AREAS[i % len(AREAS)], "description": f"Overflowing bin near stop {i}",
+                "latitude": 18.10 + i % 1000 * 1e-4, "longitude": 74.52 + i % 997 * 1e-4, "mediaUrls": [],
+                "status": "pending", "response": None, "respondedAt": None, "createdAt": now,
+            })
+            store.award_points(user_id, "Complaint submitted", 10)
+            t = store.add_task({
+                "id": store.next_id("task"), "workerId": 2, "workerName": "Ravi Kumar", "complaintId": c["id"],
+                "title": f"Clear {c['location']}", "description": c["description"], "location": c["location"],
+                "latitude": c["latitude"], "longitude": c["longitude"], "priority": "medium", "status": "pending",
+                "assignedAt": now, "completedAt": None, "completionPhotos": [], "completionNote": None,
+                "approved": None,
+            })
+            t["completedAt"] = now
+            store.set_task_status(t, "completed")
+            t["approved"], t["approvedAt"] = True, now
+            store.task_changed(t)
+            store.set_complaint_status(c, "resolved")
+            store.award_points(user_id, "Complaint resolved", 50)
+
+
+def soak(rounds: int, per_round: int, retention: bool):
+    store._seed()
+    store._build_indexes()
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    print(f"{'round':>5}{'complaints':>12}{'tasks':>9}{'history':>9}{'log':>9}{'archive ms':>12}{'traced MiB':>12}")
+    for r in range(1, rounds + 1):
+        run_round(per_round, r * per_round)
+        archive_ms = 0.0
+        if retention:
+            t = time.perf_counter()
+            with store.write("tasks", "complaints", "bins"):
+                store.archive_closed("9999")
+                store.archive_reward_history(REWARD_HISTORY_LIMIT)
+                store.archive_collection_events("9999")
+            archive_ms = (time.perf_counter() - t) * 1e3
+        gc.collect()
+        traced = tracemalloc.get_traced_memory()[0] - base
+        history = sum(len(rw["history"]) for rw in store.rewards.values())
+        print(f"{r:5}{len(store.complaints):12,}{len(store.tasks):9,}{history:9,}"
+              f"{len(store.collection_events):9,}{archive_ms:12.0f}{traced / 2**20:12.1f}")
+    tracemalloc.stop()
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    per_round = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    store.archive = Archive(tempfile.mkdtemp(prefix="bench-archive-"))
+    store.changes.publish = lambda *args, **kwargs: None  # no live clients or journal here
+    for retention in (False, True):
+        print(f"\nrounds={rounds} x {per_round:,} complaints, retention {'on' if retention else 'off'}")
+        soak(rounds, per_round, retention)
+    shutil.rmtree(store.archive.root)
+
+
+if __name__ == "__main__":
+    main()
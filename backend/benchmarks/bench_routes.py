@@ -0,0 +1,45 @@
+"""Route optimizer — solution quality vs time budget.
+
+    python -m benchmarks.bench_routes [bins ...]      (default: 200 1000 2000)
+
+Random bins over the city box (see _fixtures.CITY_BOUNDS), five workers
+leaving the depot with unlimited capacity. "vs NN" is the total distance
+relative to the nearest-neighbour construction the improvement starts from.
+"""
+
+import sys
+
+import numpy as np
+
+from app.config import DEPOT_LOCATION
+from app.route_optimizer import optimize_routes
+
+from ._fixtures import CITY_BOUNDS
+
+WORKERS = 5
+BUDGETS_MS = (0, 50, 200, 1000, 5000)
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [200, 1000, 2000]
+    south, west, north, east = CITY_BOUNDS
+    print(f"{'bins':>6} {'budget ms':>10} {'elapsed ms':>11} {'total km':>9} {'vs NN':>7} "
+          f"{'2-opt':>6} {'or-opt':>7}  converged")
+    for n in sizes:
+        rng = np.random.default_rng(n)
+        lat, lng = rng.uniform(south, north, n), rng.uniform(west, east, n)
+        demand = rng.uniform(0.8, 1.0, n)
+        start_lat, start_lng = np.full(WORKERS, DEPOT_LOCATION[0]), np.full(WORKERS, DEPOT_LOCATION[1])
+        capacity = np.full(WORKERS, np.inf)
+        for budget in BUDGETS_MS:
+            plan = optimize_routes(start_lat, start_lng, capacity, lat, lng, demand, budget / 1000)
+            total, initial = sum(plan["lengths"]), sum(plan["initialLengths"])
+            print(f"{n:>6} {budget:>10} {plan['seconds'] * 1000:>11.0f} {total / 1000:>9.1f} "
+                  f"{(total / initial - 1) * 100:>6.1f}% {plan['moves']['twoOpt']:>6} "
+                  f"{plan['moves']['orOpt']:>7}  {plan['converged']}")
+            if plan["converged"]:
+                break
+
+
+if __name__ == "__main__":
+    main()
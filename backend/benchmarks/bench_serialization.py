@@ -0,0 +1,80 @@
+"""Response encoding — serialization time and bytes on the wire per endpoint.
+
+    python -m benchmarks.bench_serialization [bins] [complaints]
+
+Seeds the store, then for each endpoint fetches its payload through the app
+and times rendering it the way FastAPI did before (``jsonable_encoder`` +
+stdlib ``json`` in ``JSONResponse``) against ``FastJSONResponse`` (orjson).
+The byte columns are the body as sent without compression and with gzip
+(and brotli, if installed) at the levels app/responses.py uses.
+"""
+
+import gzip
+import json
+import sys
+import time
+
+import numpy as np
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.responses import BROTLI_QUALITY, GZIP_LEVEL, FastJSONResponse, brotli
+
+from ._fixtures import CITY_BOUNDS, seed_bins
+
+REPEAT = 30
+ENDPOINTS = [
+    "/api/stats/",
+    "/api/bins/",
+    "/api/bins/?limit=100",
+    "/api/complaints/?limit=500",
+    "/api/complaints/?limit=500&fields=id,status,location",
+    "/api/tasks/",
+    "/api/alerts/?limit=100",
+]
+
+
+def timed(fn) -> float:
+    """Median milliseconds per call."""
+    samples = []
+    for _ in range(REPEAT):
+        t = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t)
+    return float(np.median(samples)) * 1e3
+
+
+def main():
+    bins = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    complaints = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+    seed_bins(bins)
+    south, west, north, east = CITY_BOUNDS
+    rng = np.random.default_rng(7)
+    with TestClient(app) as client:
+        token = client.post("/api/auth/login", json={"email": "admin@cleanify.com", "password": "admin123"})
+        headers = {"Authorization": f"Bearer {token.json()['access_token']}", "Accept-Encoding": "identity"}
+        for i in range(complaints):
+            client.post("/api/complaints/", headers=headers, json={
+                "location": f"Street {i}", "description": "Overflowing bin near the market entrance",
+                "latitude": float(rng.uniform(south, north)), "longitude": float(rng.uniform(west, east))})
+        print(f"bins={bins:,} complaints={complaints:,} brotli={'yes' if brotli else 'not installed'}")
+        print(f"{'endpoint':<54}{'before ms':>10}{'orjson ms':>10}{'bytes':>11}{'gzip':>9}{'gzip ms':>8}"
+              + (f"{'br':>9}{'br ms':>7}" if brotli else ""))
+        for path in ENDPOINTS:
+            payload = json.loads(client.get(path, headers=headers).content)
+            before = timed(lambda: JSONResponse(jsonable_encoder(payload)).body)
+            after = timed(lambda: FastJSONResponse(payload).body)
+            body = FastJSONResponse(payload).body
+            line = (f"{path:<54}{before:10.3f}{after:10.3f}{len(body):11,}"
+                    f"{len(gzip.compress(body, GZIP_LEVEL)):9,}"
+                    f"{timed(lambda: gzip.compress(body, GZIP_LEVEL)):8.3f}")
+            if brotli:
+                line += (f"{len(brotli.compress(body, quality=BROTLI_QUALITY)):9,}"
+                         f"{timed(lambda: brotli.compress(body, quality=BROTLI_QUALITY)):7.3f}")
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Spatial queries over bins — grid index vs a full NumPy scan.
+
+    python -m benchmarks.bench_spatial [bins] [queries]
+
+Query points are drawn from the same city box the bins are spread over
+(see _fixtures.CITY_BOUNDS); every index answer is checked against the scan.
+"""
+
+import random
+import sys
+import time
+
+import numpy as np
+
+from app.data_store import store
+from app.spatial import haversine_m
+
+from ._fixtures import CITY_BOUNDS, seed_bins
+
+
+def timed(fn, points) -> float:
+    """Mean microseconds per query."""
+    t = time.perf_counter()
+    for p in points:
+        fn(*p)
+    return (time.perf_counter() - t) / len(points) * 1e6
+
+
+def main():
+    n_bins = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    n_queries = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+    t = time.perf_counter()
+    seed_bins(n_bins)
+    print(f"bins={len(store.bins):,}  indexed in {time.perf_counter() - t:.2f} s (all indexes)")
+
+    index = store.bin_locations
+    lat = np.array([b["latitude"] for b in store.bins])
+    lng = np.array([b["longitude"] for b in store.bins])
+    ids = np.array([b["id"] for b in store.bins])
+    south, west, north, east = CITY_BOUNDS
+    rng = random.Random(11)
+    points = [(rng.uniform(south, north), rng.uniform(west, east)) for _ in range(n_queries)]
+    boxes = [(la, lo, la + 0.005, lo + 0.005) for la, lo in points]  # ~550 m squares
+
+    def scan_radius(la, lo, r=500):
+        d = haversine_m(la, lo, lat, lng)
+        keep = np.flatnonzero(d <= r)
+        return ids[keep[np.argsort(d[keep], kind="stable")]].tolist()
+
+    def scan_nearest(la, lo, k=10):
+        d = haversine_m(la, lo, lat, lng)
+        part = np.argpartition(d, k)[:k]
+        return ids[part[np.argsort(d[part], kind="stable")]].tolist()
+
+    def scan_bbox(s, w, n, e):
+        return ids[(lat >= s) & (lat <= n) & (lng >= w) & (lng <= e)].tolist()
+
+    for la, lo in points[:200]:
+        assert index.within_radius(la, lo, 500)[0] == scan_radius(la, lo)
+        assert set(index.nearest(la, lo, 10)[0]) == set(scan_nearest(la, lo))
+    for box in boxes[:200]:
+        assert index.within_bbox(*box) == scan_bbox(*box)
+
+    hits = np.mean([len(index.within_radius(la, lo, 500)[0]) for la, lo in points])
+    cases = [
+        (f"radius 500 m (~{hits:.0f} hits)", lambda la, lo: index.within_radius(la, lo, 500),
+         scan_radius, points),
+        ("radius 500 m, limit 50", lambda la, lo: index.within_radius(la, lo, 500, 50),
+         scan_radius, points),
+        ("10 nearest", lambda la, lo: index.nearest(la, lo, 10), scan_nearest, points),
+        ("1 nearest", lambda la, lo: index.nearest(la, lo, 1), lambda la, lo: scan_nearest(la, lo, 1), points),
+        ("bbox ~550 m", index.within_bbox, scan_bbox, boxes),
+    ]
+    print(f"{'query':<28} {'index µs':>10} {'scan µs':>10} {'speedup':>8}")
+    for name, fn, scan, args in cases:
+        idx_us = timed(fn, args)
+        scan_us = timed(scan, args[:200])
+        print(f"{name:<28} {idx_us:>10.1f} {scan_us:>10.1f} {scan_us / idx_us:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
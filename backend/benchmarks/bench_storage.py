@@ -0,0 +1,99 @@
+"""Memory vs SQLite storage engine at growing complaint counts.
+
+    python -m benchmarks.bench_storage [rows ...]      (default: 10000 100000)
+
+Each (engine, size) runs in a fresh process so peak RSS is comparable;
+``1000000`` works but takes a few minutes per engine.
+"""
+
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+AREAS = ["Supe Road", "Market Yard Baramati", "Shivaji Chowk", "Bhigwan Road Chowk", "Jalochi Road"]
+STATUSES = ["pending", "in_progress", "resolved"]
+
+
+def timed(fn, repeat: int) -> float:
+    """Mean microseconds per call."""
+    t = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t) / repeat * 1e6
+
+
+def run(rows: int) -> dict:
+    # Imported here so the parent process never builds a store
+    from app.data_store import LOCK_ORDER, store
+    from app.paging import encode_cursor, paginate
+
+    rng = random.Random(7)
+    start = datetime(2026, 1, 1)
+    t = time.perf_counter()
+    with store.write("complaints"):
+        for i in range(rows):
+            last_id = store.next_id("complaint")
+            store.add_complaint({
+                "id": last_id, "userId": rng.randint(100, 5_099), "userName": "Citizen",
+                "location": rng.choice(AREAS), "description": "Overflowing bin near the bus stop",
+                "latitude": 18.15, "longitude": 74.57, "mediaUrls": [], "status": rng.choice(STATUSES),
+                "response": None, "respondedAt": None,
+                "createdAt": (start + timedelta(seconds=i * 30)).isoformat(),
+            })
+    insert_rate = rows / (time.perf_counter() - t)
+
+    ids = [rng.randint(1, last_id) for _ in range(1000)]
+    middle = store.get_complaint(last_id // 2)
+    middle_cursor = encode_cursor((middle["createdAt"], middle["id"]))
+    it = iter(ids * 10)
+
+    def set_status():
+        c = store.get_complaint(next(it))
+        store.set_complaint_status(c, "in_progress" if c["status"] == "pending" else "pending")
+
+    with store.write(*LOCK_ORDER):
+        result = {
+            "insert/s": insert_rate,
+            "get µs": timed(lambda: store.get_complaint(next(it)), 1000),
+            "page µs": timed(lambda: paginate(store.complaint_index(), limit=50), 200),
+            "mid page µs": timed(lambda: paginate(store.complaint_index(), limit=50, cursor=middle_cursor), 200),
+            "citizen µs": timed(lambda: paginate(store.complaint_index(user_id=next(it) % 5_000 + 100), limit=50), 200),
+            "status µs": timed(set_status, 1000),
+            "stats µs": timed(store.stats_summary, 200),
+        }
+        t = time.perf_counter()
+        store._build_indexes()
+        result["reindex ms"] = (time.perf_counter() - t) * 1e3
+        assert not store.verify_aggregates()
+    result["peak MB"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return result
+
+
+def main():
+    if sys.argv[1:2] == ["--child"]:
+        print(json.dumps(run(int(sys.argv[2]))))
+        return
+
+    sizes = [int(a) for a in sys.argv[1:]] or [10_000, 100_000]
+    columns = None
+    for rows in sizes:
+        for engine in ("memory", "sqlite"):
+            with tempfile.TemporaryDirectory() as tmp:
+                env = dict(os.environ, CLEANIFY_STORAGE=engine, CLEANIFY_SQLITE_PATH=os.path.join(tmp, "bench.db"))
+                out = subprocess.run([sys.executable, "-m", "benchmarks.bench_storage", "--child", str(rows)],
+                                     env=env, check=True, capture_output=True, text=True).stdout
+            result = json.loads(out.splitlines()[-1])
+            if columns is None:
+                columns = list(result)
+                print(f"{'rows':>9} {'engine':>7} " + " ".join(f"{c:>12}" for c in columns))
+            print(f"{rows:>9,} {engine:>7} " + " ".join(f"{result[c]:>12,.1f}" for c in columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Multi-worker mode — API throughput from 1 to N worker processes.
+
+    python -m benchmarks.bench_workers [max_workers] [seconds]
+
+Starts ``uvicorn app.main:app --workers k`` over one SQLite database in
+cluster mode (app/cluster.py) for k = 1, 2, 4, ... up to ``max_workers``
+(default: the CPU count), and drives it for ``seconds`` (default 10) from
+as many client processes, each keeping ``CONNECTIONS`` keep-alive
+connections busy. The mix is 90% reads (dashboard stats, a page of bins, a
+page of complaints) and 10% complaint submissions. The clients share the
+machine with the server, so leave a core or two free when reading the
+scaling figures.
+"""
+
+import http.client
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+PORT = 8799
+CONNECTIONS = 8
+READS = ["/api/stats/", "/api/bins/?limit=50", "/api/complaints/?limit=50"]
+
+
+def _request(conn, method: str, path: str, token: str, body=None):
+    headers = {"Authorization": f"Bearer {token}"}
+    if body is not None:
+        headers["Content-Type"] = "application/json"
+        body = json.dumps(body)
+    conn.request(method, path, body, headers)
+    resp = conn.getresponse()
+    resp.read()
+    return resp.status
+
+
+def _client(token: str, seconds: float, seed: int, results):
+    """One client process: ``CONNECTIONS`` threads issuing requests back to back."""
+    done, errors = [0] * CONNECTIONS, [0] * CONNECTIONS
+    deadline = time.perf_counter() + seconds
+
+    def run(slot: int):
+        rng = random.Random(seed * CONNECTIONS + slot)
+        conn = http.client.HTTPConnection("127.0.0.1", PORT)
+        while time.perf_counter() < deadline:
+            if rng.random() < 0.1:
+                status = _request(conn, "POST", "/api/complaints/", token,
+                                  {"location": "Central", "description": "Overflowing bin",
+                                   "latitude": 18.15, "longitude": 74.57})
+            else:
+                status = _request(conn, "GET", rng.choice(READS), token)
+            done[slot] += 1
+            errors[slot] += status >= 400
+        conn.close()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(CONNECTIONS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    results.put((sum(done), sum(errors)))
+
+
+def _wait_ready(proc) -> str:
+    for _ in range(300):
+        if proc.poll() is not None:
+            raise RuntimeError("uvicorn exited during startup")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", PORT)
+            conn.request("POST", "/api/auth/login", json.dumps({"email": "citizen@cleanify.com", "password": "citizen123"}),
+                         {"Content-Type": "application/json"})
+            return json.loads(conn.getresponse().read())["access_token"]
+        except (ConnectionError, OSError):
+            time.sleep(0.1)
+    raise RuntimeError("uvicorn did not start")
+
+
+def measure(workers: int, clients: int, seconds: float) -> tuple:
+    """``(requests/s, errors)`` with ``workers`` API processes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, CLEANIFY_STORAGE="sqlite", CLEANIFY_SQLITE_PATH=os.path.join(tmp, "bench.db"),
+                   CLEANIFY_CLUSTER="1", CLEANIFY_ARCHIVE_DIR=os.path.join(tmp, "archive"))
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(PORT), "--workers", str(workers),
+             "--log-level", "warning"],
+            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            token = _wait_ready(server)
+            # Every worker has to be up, not just the first to answer
+            time.sleep(1 + workers * 0.5)
+            results = multiprocessing.Queue()
+            procs = [multiprocessing.Process(target=_client, args=(token, seconds, i, results)) for i in range(clients)]
+            t = time.perf_counter()
+            for p in procs:
+                p.start()
+            totals = [results.get() for _ in procs]
+            elapsed = time.perf_counter() - t
+            for p in procs:
+                p.join()
+        finally:
+            server.terminate()
+            server.wait()
+    return sum(n for n, _ in totals) / elapsed, sum(e for _, e in totals)
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else cpus
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10.0
+    counts = sorted({1, max_workers} | {2 ** i for i in range(max_workers.bit_length()) if 2 ** i <= max_workers})
+    clients = max(2, max_workers)
+    print(f"cpus={cpus} clients={clients} x {CONNECTIONS} connections, {seconds:.0f} s per run")
+    base = None
+    for workers in counts:
+        rate, errors = measure(workers, clients, seconds)
+        base = base or rate
+        print(f"workers {workers:3}  {rate:9,.0f} req/s  x{rate / base:5.2f}  ({errors} errors)")
+
+
+if __name__ == "__main__":
+    main()
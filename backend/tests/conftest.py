@@ -0,0 +1,48 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.archive import Archive
+from app.data_store import LOCK_ORDER, DataStore, store
+from app.main import app
+from app.sqlite_store import SQLiteDataStore
+
+USERS = {
+    "admin": ("admin@cleanify.com", "admin123"),
+    "worker": ("worker1@cleanify.com", "worker123"),
+    "citizen": ("citizen@cleanify.com", "citizen123"),
+}
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def engine(request, tmp_path_factory, tmp_path):
+    """The store of each engine. The memory one is reseeded for every test.
+
+    There is one instance per engine class, so the SQLite store keeps the
+    database it was first opened on for the whole session.
+    """
+    if request.param == "memory":
+        store = DataStore()
+        with store.write(*LOCK_ORDER):
+            store._load()
+    else:
+        store = SQLiteDataStore(str(tmp_path_factory.getbasetemp() / "cleanify.db"))
+    store.archive = Archive(str(tmp_path / "archive"))
+    return store
+
+
+@pytest.fixture
+def client():
+    """A client of the API (without its background jobs) on a reseeded store."""
+    with store.write(*LOCK_ORDER):
+        store._load()
+    return TestClient(app)
+
+
+@pytest.fixture
+def headers(client):
+    """``headers(role)``: the Authorization header of a seeded admin, worker or citizen."""
+    def login(role: str) -> dict:
+        email, password = USERS[role]
+        token = client.post("/api/auth/login", json={"email": email, "password": password}).json()["access_token"]
+        return {"Authorization": f"Bearer {token}"}
+    return login
@@ -0,0 +1,81 @@
+"""The incrementally maintained /api/stats aggregates must match a full recompute.
+
+Runs the mutators the routes use — creates, status changes and deletes
+across users, tasks, complaints and bins — on both storage engines and
+checks ``verify_aggregates()`` after each step.
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+from app.data_store import LOCK_ORDER
+
+
+def add_complaint(store, user_id: int, location: str) -> dict:
+    return store.add_complaint({
+        "id": store.next_id("complaint"), "userId": user_id, "userName": "Citizen",
+        "location": location, "description": "Overflowing bin", "latitude": 18.15, "longitude": 74.57,
+        "mediaUrls": [], "status": "pending", "response": None, "respondedAt": None,
+        "createdAt": datetime.now().isoformat(),
+    })
+
+
+def add_task(store, worker: dict, complaint: dict | None) -> dict:
+    return store.add_task({
+        "id": store.next_id("task"), "workerId": worker["id"], "workerName": worker["name"],
+        "complaintId": complaint["id"] if complaint else None, "title": "Clear bin", "description": "",
+        "location": "Supe Road", "latitude": 18.15, "longitude": 74.57, "priority": "medium",
+        "status": "pending", "assignedAt": datetime.now().isoformat(), "completedAt": None,
+        "completionPhotos": [], "completionNote": None, "approved": None,
+    })
+
+
+def test_aggregates_track_mutations(engine):
+    store = engine
+    with store.write(*LOCK_ORDER):
+        assert store.verify_aggregates() == []
+
+        # Users: a new worker with tasks, later removed
+        worker = store.add_user({"id": store.next_user_id(), "name": "Test Worker",
+                                 "email": "test.worker@cleanify.com", "password": "x", "role": "worker"})
+        citizen = store.add_user({"id": store.next_user_id(), "name": "Test Citizen",
+                                  "email": "test.citizen@cleanify.com", "password": "x", "role": "citizen"})
+        assert store.verify_aggregates() == []
+
+        # Complaints and tasks: create, move through every status
+        complaints = [add_complaint(store, citizen["id"], area) for area in ("Supe Road", "Market Yard", "Supe Road")]
+        tasks = [add_task(store, worker, c) for c in complaints] + [add_task(store, worker, None)]
+        assert store.verify_aggregates() == []
+        store.set_complaint_status(complaints[0], "in_progress")
+        store.set_task_status(tasks[0], "in_progress")
+        tasks[1]["completedAt"] = datetime.now().isoformat()
+        store.set_task_status(tasks[1], "completed")
+        tasks[1]["approved"] = True
+        store.task_changed(tasks[1])
+        store.set_complaint_status(complaints[1], "resolved")
+        store.set_task_status(tasks[3], "completed")
+        assert store.verify_aggregates() == []
+
+        # Bins: single and bulk fill changes, alerts and a collection
+        b = store.bins[0]
+        store.set_bin_fill(b, 95)
+        store.add_alert({
+            "binId": b["id"], "location": b["location"], "area": b["area"],
+            "fillLevel": 95, "type": "overflow", "status": "active", "createdAt": datetime.now().isoformat(),
+        })
+        assert store.verify_aggregates() == []
+        store.collect_bin(b, worker)
+        fill = np.array([(i * 37) % 101 for i in range(len(store.bins))], dtype=np.int16)
+        store.apply_fill_levels(fill)
+        assert all(type(b["fillLevel"]) is int for b in store.bins)
+        assert store.verify_aggregates() == []
+
+        # Deletes: archive everything closed, then remove the worker
+        store.archive_alerts("9999")
+        moved = store.archive_closed("9999")
+        assert moved["complaints"] >= 1 and moved["tasks"] >= 1
+        assert store.verify_aggregates() == []
+        store.remove_user(worker["id"])
+        store.remove_user(citizen["id"])
+        assert store.verify_aggregates() == []
@@ -0,0 +1,88 @@
+"""Alert engine: hysteresis, re-alerting a bin left full, one active alert per bin."""
+
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from app.alerts import evaluate_alerts
+from app.bin_state import ALERT_CLEAR_THRESHOLD, ALERT_THRESHOLD
+from app.data_store import LOCK_ORDER, store
+from app.sqlite_store import SQLiteDataStore
+
+NO_ROWS = np.array([], dtype=np.int64)
+
+
+@pytest.fixture
+def fresh_store():
+    with store.write(*LOCK_ORDER):
+        store._load()
+
+
+def set_fill(row: int, fill: int) -> np.ndarray:
+    new_fill = store.bin_state.fill.copy()
+    new_fill[row] = fill
+    return store.apply_fill_levels(new_fill)
+
+
+def new_alert(b: dict) -> dict:
+    return {"binId": b["id"], "location": b["location"], "area": b["area"], "fillLevel": b["fillLevel"],
+            "type": "high_fill", "status": "active", "createdAt": datetime.now().isoformat()}
+
+
+def test_hysteresis(fresh_store):
+    with store.write("bins"):
+        bin_id = store.bins[0]["id"]
+        evaluate_alerts(set_fill(0, 95))
+        alert = store.active_alert_for_bin(bin_id)
+        assert alert is not None
+        # Between the thresholds nothing changes
+        evaluate_alerts(set_fill(0, (ALERT_THRESHOLD + ALERT_CLEAR_THRESHOLD) // 2))
+        assert store.active_alert_for_bin(bin_id) is alert
+        result = evaluate_alerts(set_fill(0, ALERT_CLEAR_THRESHOLD - 1))
+        assert result["cleared"].tolist() == [0]
+        assert store.active_alert_for_bin(bin_id) is None and alert["status"] == "resolved"
+
+
+def test_bin_resolved_without_collection_is_alerted_again(fresh_store):
+    with store.write("bins"):
+        bin_id = store.bins[0]["id"]
+        evaluate_alerts(set_fill(0, 100))
+        first = store.active_alert_for_bin(bin_id)
+        store.resolve_alert(first)
+        # The bin stays at 100, so no later tick reports it as changed
+        assert set_fill(0, 100).tolist() == []
+        result = evaluate_alerts(NO_ROWS)
+        assert result["raised"].tolist() == [0]
+        second = store.active_alert_for_bin(bin_id)
+        assert second is not None and second["id"] != first["id"]
+        assert evaluate_alerts(NO_ROWS)["raised"].tolist() == []
+
+
+def test_refused_alert_does_not_use_up_an_id(engine):
+    with engine.write("bins"):
+        a, b = engine.bins[1], engine.bins[2]
+        for bin_ in (a, b):
+            active = engine.active_alert_for_bin(bin_["id"])
+            if active is not None:
+                engine.resolve_alert(active)
+        first = engine.add_alert(new_alert(a))
+        duplicate = new_alert(a)
+        assert engine.add_alert(duplicate) is None
+        assert "id" not in duplicate
+        assert engine.add_alert(new_alert(b))["id"] == first["id"] + 1
+        assert engine.verify_aggregates() == []
+
+
+def test_database_refuses_a_second_active_alert(engine):
+    if not isinstance(engine, SQLiteDataStore):
+        pytest.skip("SQLite only")
+    with engine.write("bins"):
+        b = engine.bins[2]
+        if engine.active_alert_for_bin(b["id"]) is None:
+            engine.add_alert(new_alert(b))
+        active = engine.active_alert_for_bin(b["id"])
+    row = engine._alert_row({**active, "id": active["id"] + 10_000})
+    with engine._pool.connection() as conn, pytest.raises(sqlite3.IntegrityError):
+        conn.execute("INSERT INTO alerts VALUES (?, ?, ?, ?, ?, ?)", row)
@@ -0,0 +1,78 @@
+"""Change-feed events: published state is frozen, audiences, SSE framing."""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from app.change_feed import visible_to
+from app.data_store import LOCK_ORDER, store
+from app.routes.event_routes import _format
+
+ADMIN = {"id": 1, "role": "admin"}
+WORKER = {"id": 2, "role": "worker"}
+CITIZEN = {"id": 4, "role": "citizen"}
+
+
+@pytest.fixture(autouse=True)
+def fresh_store():
+    with store.write(*LOCK_ORDER):
+        store._load()
+
+
+def published_since(seq: int) -> list:
+    return store.changes.since(seq)[0]
+
+
+def new_complaint_and_task() -> tuple:
+    now = datetime.now().isoformat()
+    complaint = store.add_complaint({
+        "id": store.next_id("complaint"), "userId": CITIZEN["id"], "userName": "Amit Patel",
+        "location": "Supe Road", "description": "Overflowing bin", "latitude": 18.15, "longitude": 74.57,
+        "mediaUrls": ["/api/complaints/media/a.jpg"], "status": "pending", "response": None,
+        "respondedAt": None, "createdAt": now,
+    })
+    task = store.add_task({
+        "id": store.next_id("task"), "workerId": WORKER["id"], "workerName": "Ravi Kumar",
+        "complaintId": complaint["id"], "title": "Clear bin", "description": "", "location": "Supe Road",
+        "latitude": 18.15, "longitude": 74.57, "priority": "medium", "status": "pending",
+        "assignedAt": now, "completedAt": None, "completionPhotos": [], "completionNote": None,
+        "approved": None,
+    })
+    return complaint, task
+
+
+def test_events_keep_the_state_they_were_published_with():
+    seq = store.changes.seq
+    with store.write("tasks", "complaints"):
+        complaint, task = new_complaint_and_task()
+        task["completionPhotos"].append("/api/tasks/media/1.jpg")
+        store.task_changed(task)
+        # Later in-place edits must not leak into events already published
+        task["completionPhotos"].append("/api/tasks/media/2.jpg")
+        complaint["mediaUrls"].append("/api/complaints/media/b.jpg")
+    events = {e["type"]: e["data"] for e in published_since(seq)}
+    assert events["complaint.created"]["mediaUrls"] == ["/api/complaints/media/a.jpg"]
+    assert events["task.created"]["completionPhotos"] == []
+    assert events["task.updated"]["completionPhotos"] == ["/api/tasks/media/1.jpg"]
+
+
+def test_linked_task_changes_reach_the_complaint_owner_only():
+    seq = store.changes.seq
+    with store.write("tasks", "complaints"):
+        _, task = new_complaint_and_task()
+        store.set_task_status(task, "in_progress")
+    events = published_since(seq)
+    citizen = [(e["type"], e["data"]["linkedTask"]["status"]) for e in events
+               if visible_to(e, CITIZEN) and e["type"] == "complaint.task"]
+    assert citizen == [("complaint.task", "pending"), ("complaint.task", "in_progress")]
+    assert not any(visible_to(e, CITIZEN) for e in events if e["type"].startswith("task."))
+    assert all(visible_to(e, ADMIN) and visible_to(e, WORKER) for e in events if e["type"] == "task.updated")
+
+
+def test_sse_framing():
+    frame = _format(7, "complaint.updated", {"id": 3, "description": "Kachra – Supe Road"})
+    head, data = frame.rstrip("\n").rsplit("\n", 1)
+    assert head == "id: 7\nevent: complaint.updated"
+    assert frame.endswith("\n\n")
+    assert json.loads(data.removeprefix("data: ")) == {"id": 3, "description": "Kachra – Supe Road"}
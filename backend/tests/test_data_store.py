@@ -0,0 +1,124 @@
+"""DataStore indexes and locks: lookups follow the records, groups lock independently."""
+
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from app.data_store import LOCK_ORDER, DataStore, RWLock
+
+
+def new_user(store, role: str = "worker") -> dict:
+    user_id = store.next_user_id()
+    return {"id": user_id, "name": f"User {user_id}", "email": f"user{user_id}@cleanify.com",
+            "password": "secret", "role": role}
+
+
+def new_complaint(store) -> dict:
+    return {
+        "id": store.next_id("complaint"), "userId": 4, "userName": "Amit Patel", "location": "Supe Road",
+        "description": "Overflowing bin", "latitude": 18.15, "longitude": 74.57, "mediaUrls": [],
+        "status": "pending", "response": None, "respondedAt": None, "createdAt": datetime.now().isoformat(),
+    }
+
+
+def new_task(store, worker: dict, complaint_id: int | None) -> dict:
+    return {
+        "id": store.next_id("task"), "workerId": worker["id"], "workerName": worker["name"],
+        "complaintId": complaint_id, "title": "Clear bin", "description": "", "location": "Supe Road",
+        "latitude": 18.15, "longitude": 74.57, "priority": "medium", "status": "pending",
+        "assignedAt": datetime.now().isoformat(), "completedAt": None, "completionPhotos": [],
+        "completionNote": None, "approved": None,
+    }
+
+
+def test_user_lookups_follow_adds_and_removals(engine):
+    with engine.write("users"):
+        user = engine.add_user(new_user(engine))
+        assert engine.get_user(user["id"])["email"] == user["email"]
+        assert engine.get_user_by_email(user["email"])["id"] == user["id"]
+        assert user["id"] in {w["id"] for w in engine.workers()}
+
+        assert engine.remove_user(user["id"])["id"] == user["id"]
+        assert engine.get_user(user["id"]) is None
+        assert engine.get_user_by_email(user["email"]) is None
+        assert user["id"] not in {w["id"] for w in engine.workers()}
+        # A removed user's id is never handed out again
+        assert engine.next_user_id() > user["id"]
+
+
+def test_task_lookups_by_complaint_and_worker(engine):
+    with engine.read("users"), engine.write("tasks", "complaints"):
+        worker = engine.get_user(2)
+        complaint = engine.add_complaint(new_complaint(engine))
+        assert engine.task_for_complaint(complaint["id"]) is None
+        first = engine.add_task(new_task(engine, worker, complaint["id"]))
+        second = engine.add_task(new_task(engine, worker, complaint["id"]))
+
+        assert engine.get_task(first["id"])["title"] == "Clear bin"
+        assert [t["id"] for t in engine.tasks_for_complaint(complaint["id"])] == [first["id"], second["id"]]
+        assert engine.task_for_complaint(complaint["id"])["id"] == first["id"]
+        worker_tasks = [t for _, t in engine.task_index(worker["id"]).scan()]
+        assert {first["id"], second["id"]} <= {t["id"] for t in worker_tasks}
+        assert all(t["workerId"] == worker["id"] for t in worker_tasks)
+        assert complaint["id"] in {c["id"] for _, c in engine.complaint_index(complaint["userId"]).scan()}
+
+
+def test_unknown_ids_are_none(engine):
+    with engine.read(*LOCK_ORDER):
+        assert engine.get_user(10_000_000) is None
+        assert engine.get_user_by_email("nobody@cleanify.com") is None
+        assert engine.get_bin(10_000_000) is None
+        assert engine.get_task(10_000_000) is None
+        assert engine.get_complaint(10_000_000) is None
+        assert engine.active_alert_for_bin(10_000_000) is None
+        assert engine.tasks_for_complaint(10_000_000) == []
+
+
+def in_thread(fn) -> threading.Thread:
+    thread = threading.Thread(target=fn, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_readers_share_the_lock():
+    lock = RWLock()
+    lock.acquire_read()
+    second = in_thread(lock.acquire_read)
+    second.join(1)
+    assert not second.is_alive()
+    lock.release_read()
+    lock.release_read()
+
+
+def test_writer_waits_for_readers_and_blocks_new_ones():
+    lock = RWLock()
+    lock.acquire_read()
+    writer = in_thread(lambda: (lock.acquire_write(), lock.release_write()))
+    time.sleep(0.05)
+    assert writer.is_alive()
+    # Writer-preferring: a waiting writer holds back readers that arrive after it
+    late_reader = in_thread(lambda: (lock.acquire_read(), lock.release_read()))
+    time.sleep(0.05)
+    assert late_reader.is_alive()
+    lock.release_read()
+    writer.join(1)
+    late_reader.join(1)
+    assert not writer.is_alive() and not late_reader.is_alive()
+
+
+def test_groups_lock_independently():
+    store = DataStore()
+    done = threading.Event()
+
+    def read_complaints():
+        with store.read("complaints"):
+            done.set()
+
+    with store.write("bins"):
+        in_thread(read_complaints)
+        assert done.wait(1)
+    with pytest.raises(KeyError, match="alerts"):
+        with store.read("alerts"):
+            pass
@@ -0,0 +1,77 @@
+"""Bulk sensor ingest: parsing, per-bin deduplication and stale/future handling."""
+
+import json
+import time
+
+import pytest
+
+from app.data_store import LOCK_ORDER, store
+from app.history import MAX_CLOCK_SKEW_S
+from app.ingest import ReadingsError, apply_readings, parse_readings
+
+
+@pytest.fixture(autouse=True)
+def fresh_store():
+    with store.write(*LOCK_ORDER):
+        store._load()
+
+
+def ingest(*readings: dict) -> dict:
+    return apply_readings(**parse_readings(json.dumps(list(readings)).encode()))
+
+
+def fill_of(bin_id: int) -> int:
+    with store.read("bins"):
+        return store.get_bin(bin_id)["fillLevel"]
+
+
+def test_newest_reading_per_bin_wins():
+    t = time.time() - 600
+    result = ingest({"bin_id": 1, "fill_level": 30, "timestamp": t + 2},
+                    {"bin_id": 1, "fill_level": 70, "timestamp": t + 5},
+                    {"bin_id": 1, "fill_level": 40, "timestamp": t + 1})
+    assert (result["received"], result["applied"], result["stale"]) == (3, 1, 2)
+    assert fill_of(1) == 70
+
+
+def test_older_reading_after_newer_is_stale():
+    t = time.time() - 600
+    ingest({"bin_id": 2, "fill_level": 55, "timestamp": t + 10})
+    result = ingest({"bin_id": 2, "fill_level": 10, "timestamp": t + 10},
+                    {"bin_id": 3, "fill_level": 20, "timestamp": t})
+    assert (result["applied"], result["stale"]) == (1, 1)
+    assert fill_of(2) == 55
+    assert fill_of(3) == 20
+
+
+def test_unknown_bins_are_counted():
+    result = ingest({"bin_id": 10_000_000, "fill_level": 50}, {"bin_id": 1, "fill_level": 50})
+    assert (result["applied"], result["unknownBins"], result["stale"]) == (1, 1, 0)
+
+
+def test_future_reading_is_dropped_and_does_not_block_later_readings():
+    result = ingest({"bin_id": 4, "fill_level": 50, "timestamp": time.time() + 365 * 86400})
+    assert (result["received"], result["applied"], result["future"], result["stale"]) == (1, 0, 1, 0)
+    assert fill_of(4) != 50
+
+    result = ingest({"bin_id": 4, "fill_level": 35})
+    assert (result["applied"], result["stale"]) == (1, 0)
+    assert fill_of(4) == 35
+
+
+def test_small_clock_skew_is_accepted():
+    result = ingest({"bin_id": 5, "fill_level": 45, "timestamp": time.time() + MAX_CLOCK_SKEW_S / 2})
+    assert (result["applied"], result["future"]) == (1, 0)
+
+
+@pytest.mark.parametrize("bin_id", [1.7, 1.0, "1", True, None])
+def test_non_integer_bin_id_is_rejected(bin_id):
+    with pytest.raises(ReadingsError, match="bin_id"):
+        parse_readings(json.dumps([{"bin_id": bin_id, "fill_level": 50}]).encode())
+
+
+def test_ndjson_payload():
+    body = b'{"bin_id": 1, "fill_level": 12}\n\n{"bin_id": 2, "fill_level": 13}\n'
+    batch = parse_readings(body, "application/x-ndjson")
+    assert batch["bin_ids"].tolist() == [1, 2]
+    assert batch["fills"].tolist() == [12, 13]
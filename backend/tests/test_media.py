@@ -0,0 +1,81 @@
+"""Media serving: ETags and 304s, byte ranges, immutable caching."""
+
+import hashlib
+import os
+
+import pytest
+
+from app import media
+from app.media import CACHE_CONTROL, StatCache
+
+BODY = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def video(tmp_path, monkeypatch, client) -> tuple:
+    """``(url, etag)`` of a content-addressed upload served from a temp directory."""
+    digest = hashlib.sha256(BODY).hexdigest()
+    # An upload still being written sits next to it under a dot name
+    for name in (f"{digest}.mp4", ".upload.part"):
+        with open(os.path.join(tmp_path, name), "wb") as f:
+            f.write(BODY)
+    monkeypatch.setattr(media, "stat_cache", StatCache(str(tmp_path)))
+    return f"/api/complaints/media/{digest}.mp4", f'"{digest}"'
+
+
+def test_full_response_is_cacheable_forever(client, video):
+    url, etag = video
+    r = client.get(url)
+    assert r.status_code == 200 and r.content == BODY
+    assert r.headers["etag"] == etag
+    assert r.headers["cache-control"] == CACHE_CONTROL
+    assert r.headers["accept-ranges"] == "bytes"
+    assert r.headers["content-type"] == "video/mp4"
+
+
+@pytest.mark.parametrize("if_none_match, status", [
+    ("{etag}", 304), ("W/{etag}", 304), ('"other", {etag}', 304), ("*", 304), ('"other"', 200),
+])
+def test_if_none_match(client, video, if_none_match, status):
+    url, etag = video
+    r = client.get(url, headers={"If-None-Match": if_none_match.format(etag=etag)})
+    assert r.status_code == status
+    assert r.headers["etag"] == etag
+    if status == 304:
+        assert r.content == b""
+
+
+@pytest.mark.parametrize("range_, start, end", [
+    ("bytes=100-199", 100, 199), ("bytes=1000-", 1000, 1023), ("bytes=-10", 1014, 1023),
+    ("bytes=1000-5000", 1000, 1023),
+])
+def test_byte_ranges(client, video, range_, start, end):
+    r = client.get(video[0], headers={"Range": range_})
+    assert r.status_code == 206
+    assert r.headers["content-range"] == f"bytes {start}-{end}/{len(BODY)}"
+    assert r.content == BODY[start:end + 1]
+
+
+@pytest.mark.parametrize("range_", ["bytes=5000-", "bytes=-0"])
+def test_unsatisfiable_range_is_416(client, video, range_):
+    r = client.get(video[0], headers={"Range": range_})
+    assert r.status_code == 416
+    assert r.headers["content-range"] == f"bytes */{len(BODY)}"
+
+
+@pytest.mark.parametrize("range_", ["bytes=0-1,5-6", "items=0-1", "bytes=200-100"])
+def test_unusable_range_sends_the_whole_file(client, video, range_):
+    r = client.get(video[0], headers={"Range": range_})
+    assert r.status_code == 200 and r.content == BODY
+
+
+def test_if_range_with_a_stale_etag_sends_the_whole_file(client, video):
+    url, etag = video
+    assert client.get(url, headers={"Range": "bytes=0-9", "If-Range": etag}).status_code == 206
+    r = client.get(url, headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+    assert r.status_code == 200 and r.content == BODY
+
+
+@pytest.mark.parametrize("name", ["missing.mp4", ".upload.part", "..%2Fconfig.py"])
+def test_unknown_files_are_404(client, video, name):
+    assert client.get(f"/api/complaints/media/{name}").status_code == 404
@@ -0,0 +1,63 @@
+"""Keyset pagination on the list endpoints: cursors, filters, projection."""
+
+import base64
+
+import pytest
+
+from app.paging import NEXT_CURSOR_HEADER, encode_cursor
+
+
+def pages(client, url: str, headers: dict, **params) -> list:
+    """Every page of ``url``, following ``X-Next-Cursor`` to the end."""
+    result = []
+    while True:
+        r = client.get(url, params=params, headers=headers)
+        assert r.status_code == 200
+        result.append(r.json())
+        if NEXT_CURSOR_HEADER not in r.headers:
+            return result
+        params["cursor"] = r.headers[NEXT_CURSOR_HEADER]
+
+
+def new_complaints(client, headers: dict, n: int):
+    for i in range(n):
+        r = client.post("/api/complaints/", headers=headers, json={
+            "location": "Supe Road", "description": f"Overflowing bin {i}", "latitude": 18.15, "longitude": 74.57})
+        assert r.status_code == 200, r.text
+
+
+def test_bins_page_in_id_order(client, headers):
+    admin = headers("admin")
+    everything = client.get("/api/bins/", headers=admin).json()
+    result = pages(client, "/api/bins/", admin, limit=4)
+    assert [len(p) for p in result] == [4, 4, 4, 3]
+    assert [b["id"] for p in result for b in p] == [b["id"] for b in everything] == list(range(1, 16))
+
+
+def test_complaints_page_newest_first_with_filters(client, headers):
+    citizen = headers("citizen")
+    new_complaints(client, citizen, 7)
+    everything = client.get("/api/complaints/", headers=citizen).json()
+    result = pages(client, "/api/complaints/", citizen, limit=3)
+    assert [c["id"] for p in result for c in p] == [c["id"] for c in everything]
+    assert [c["createdAt"] for c in everything] == sorted((c["createdAt"] for c in everything), reverse=True)
+
+    pending = pages(client, "/api/complaints/", citizen, limit=2, status="pending")
+    assert [c["id"] for p in pending for c in p] == [c["id"] for c in everything if c["status"] == "pending"]
+
+
+def test_fields_projection(client, headers):
+    bins = client.get("/api/bins/", params={"limit": 2, "fields": "id,fillLevel"}, headers=headers("admin")).json()
+    assert [set(b) for b in bins] == [{"id", "fillLevel"}] * 2
+
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor!",
+    base64.urlsafe_b64encode(b'{"id": 1}').decode(),
+    encode_cursor((1, 2, 3)),
+    encode_cursor((1, 2)),  # a bins cursor handed to the complaints listing
+])
+def test_bad_cursor_is_400(client, headers, cursor):
+    r = client.get("/api/complaints/", params={"limit": 2, "cursor": cursor}, headers=headers("admin"))
+    assert r.status_code == 400
+    assert "Invalid cursor" in r.json()["detail"]
@@ -0,0 +1,54 @@
+"""Response cache: ETags, 304s, and invalidation when the data changes."""
+
+from app.data_store import store
+from app.paging import NEXT_CURSOR_HEADER
+
+
+def test_unchanged_data_revalidates_with_304(client, headers):
+    admin = headers("admin")
+    first = client.get("/api/bins/", headers=admin)
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "private, no-cache"
+    assert client.get("/api/bins/", headers=admin).headers["etag"] == etag
+
+    r = client.get("/api/bins/", headers={**admin, "If-None-Match": etag})
+    assert r.status_code == 304 and r.content == b""
+    # The gzipped 200 carries the weakened form of the same tag
+    assert r.headers["etag"].removeprefix("W/") == etag.removeprefix("W/")
+    strong = etag.removeprefix("W/")
+    assert client.get("/api/bins/", headers={**admin, "If-None-Match": strong}).status_code == 304
+
+
+def test_a_change_gives_a_new_body_and_etag(client, headers):
+    admin = headers("admin")
+    etag = client.get("/api/bins/", headers=admin).headers["etag"]
+    with store.write("bins"):
+        b = store.get_bin(1)
+        store.set_bin_fill(b, 100 - b["fillLevel"])
+        fill = b["fillLevel"]
+
+    r = client.get("/api/bins/", headers={**admin, "If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["etag"] != etag
+    assert r.json()[0]["fillLevel"] == fill
+
+
+def test_paging_headers_are_cached_with_the_body(client, headers):
+    admin = headers("admin")
+    first = client.get("/api/bins/", params={"limit": 4}, headers=admin)
+    again = client.get("/api/bins/", params={"limit": 4}, headers=admin)
+    assert again.headers["etag"] == first.headers["etag"]
+    assert again.headers[NEXT_CURSOR_HEADER] == first.headers[NEXT_CURSOR_HEADER]
+    # Each query string is its own entry
+    assert client.get("/api/bins/", params={"limit": 5}, headers=admin).headers["etag"] != first.headers["etag"]
+
+
+def test_stats_follow_new_complaints(client, headers):
+    admin = headers("admin")
+    before = client.get("/api/stats/", headers=admin)
+    r = client.post("/api/complaints/", headers=headers("citizen"), json={
+        "location": "Supe Road", "description": "Overflowing bin", "latitude": 18.15, "longitude": 74.57})
+    assert r.status_code == 200
+    after = client.get("/api/stats/", headers={**admin, "If-None-Match": before.headers["etag"]})
+    assert after.status_code == 200
+    assert after.json()["totalComplaints"] == before.json()["totalComplaints"] + 1
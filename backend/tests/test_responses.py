@@ -0,0 +1,65 @@
+"""CompressionMiddleware: large JSON is compressed, streams start right away."""
+
+import asyncio
+import gzip
+
+import orjson
+
+from app.responses import CompressionMiddleware
+
+SCOPE = {"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", b"gzip")]}
+
+
+def run(app, sent: list | None = None, minimum_size: int = 1024) -> list:
+    """Messages the client sees when ``app`` runs behind the middleware."""
+    sent = [] if sent is None else sent
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(CompressionMiddleware(app, minimum_size)(SCOPE, receive, send))
+    return sent
+
+
+def json_app(body: bytes, headers: list):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/json"), *headers]})
+        await send({"type": "http.response.body", "body": body})
+    return app
+
+
+def test_large_json_is_gzipped_and_etag_weakened():
+    body = orjson.dumps([{"id": i, "status": "pending"} for i in range(200)])
+    start, message = run(json_app(body, [(b"etag", b'"v1"')]))
+    headers = dict(start["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert headers[b"etag"] == b'W/"v1"'
+    assert int(headers[b"content-length"]) == len(message["body"])
+    assert gzip.decompress(message["body"]) == body
+
+
+def test_small_json_is_left_alone():
+    start, message = run(json_app(b'{"ok":true}', []))
+    assert b"content-encoding" not in dict(start["headers"])
+    assert message["body"] == b'{"ok":true}'
+
+
+def test_stream_headers_are_not_held_back():
+    sent, seen_before_body = [], []
+
+    async def sse_app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"text/event-stream")]})
+        # An idle stream sends nothing until its first event or heartbeat
+        seen_before_body.extend(m["type"] for m in sent)
+        await send({"type": "http.response.body", "body": b"data: {}\n\n", "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+    run(sse_app, sent)
+    assert seen_before_body == ["http.response.start"]
+    assert b"content-encoding" not in dict(sent[0]["headers"])
+    assert [m["type"] for m in sent] == ["http.response.start", "http.response.body", "http.response.body"]
@@ -0,0 +1,71 @@
+"""WebP variants: rendering, serving by ``?size=``, and the bounded queue."""
+
+import io
+import os
+
+import pytest
+from PIL import Image
+
+from app import media
+from app.media import CACHE_CONTROL, StatCache
+from app.thumbnails import SIZES, ThumbnailPipeline, render_variants, variant_name
+
+NAME = "ab" * 32 + ".png"
+
+
+class RecordingPipeline:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, filename: str) -> bool:
+        self.submitted.append(filename)
+        return True
+
+
+@pytest.fixture
+def photo(tmp_path, monkeypatch, client) -> tuple:
+    """``(directory, queue)``: a 2000×1000 upload served from a temp directory."""
+    Image.new("RGB", (2000, 1000), "green").save(os.path.join(tmp_path, NAME))
+    queue = RecordingPipeline()
+    monkeypatch.setattr(media, "stat_cache", StatCache(str(tmp_path)))
+    monkeypatch.setattr(media, "thumbnails", queue)
+    return str(tmp_path), queue
+
+
+def test_variants_fit_their_size(photo):
+    directory, _ = photo
+    assert render_variants(directory, NAME) == [variant_name(NAME, size) for size in SIZES]
+    for size, pixels in SIZES.items():
+        with Image.open(os.path.join(directory, variant_name(NAME, size))) as variant:
+            assert variant.format == "WEBP"
+            assert variant.size == (pixels, pixels // 2)
+    assert not [f for f in os.listdir(directory) if f.startswith(".")]
+
+
+def test_missing_variant_serves_the_original_and_requeues(client, photo):
+    _, queue = photo
+    r = client.get(f"/api/complaints/media/{NAME}", params={"size": "thumb"})
+    assert r.status_code == 200 and r.headers["content-type"] == "image/png"
+    assert r.headers["cache-control"] == "no-cache"
+    assert queue.submitted == [NAME]
+
+
+def test_rendered_variant_is_served(client, photo):
+    directory, queue = photo
+    render_variants(directory, NAME)
+    r = client.get(f"/api/complaints/media/{NAME}", params={"size": "thumb"})
+    assert r.status_code == 200 and r.headers["content-type"] == "image/webp"
+    assert r.headers["cache-control"] == CACHE_CONTROL
+    assert Image.open(io.BytesIO(r.content)).size == (SIZES["thumb"], SIZES["thumb"] // 2)
+    assert queue.submitted == []
+
+
+def test_unknown_size_is_400(client, photo):
+    assert client.get(f"/api/complaints/media/{NAME}", params={"size": "huge"}).status_code == 400
+
+
+def test_full_queue_drops_work(tmp_path):
+    pipeline = ThumbnailPipeline(str(tmp_path), workers=1, max_queue=0)
+    assert pipeline.submit(NAME) is False
+    assert pipeline.submit("clip.mp4") is False
+    assert (pipeline.metrics()["dropped"], pipeline.metrics()["submitted"]) == (1, 0)
@@ -0,0 +1,30 @@
+// Live updates — subscribe to the backend's Server-Sent Events change feed
+import { useEffect, useRef } from 'react';
+import api from './api';
+
+// handlers: { 'complaint.updated': (data) => ..., resync: () => ... }
+// `resync` also fires when the stream reconnects so pages can refetch.
+export const useLiveEvents = (handlers) => {
+  const handlersRef = useRef(handlers);
+  handlersRef.current = handlers;
+
+  useEffect(() => {
+    const token = localStorage.getItem('token');
+    if (!token) return undefined;
+
+    const source = new EventSource(`${api.defaults.baseURL}/api/events/stream?token=${encodeURIComponent(token)}`);
+    const types = Object.keys(handlersRef.current).filter((t) => t !== 'resync');
+    const onEvent = (e) => handlersRef.current[e.type]?.(JSON.parse(e.data));
+    const onResync = () => handlersRef.current.resync?.();
+
+    types.forEach((t) => source.addEventListener(t, onEvent));
+    source.addEventListener('resync', onResync);
+    // Reconnects may have missed events; the first open follows the page's own fetch
+    let opened = false;
+    source.addEventListener('open', () => {
+      if (opened) onResync();
+      opened = true;
+    });
+    return () => source.close();
+  }, []);
+};
@@ -391,7 +391,7 @@ const Assignments = () => {
                             className="w-28 h-28 rounded-xl overflow-hidden border-2 border-slate-700/50 hover:border-cyan-500/50 transition-colors bg-slate-800/60 group"
                           >
                             <img
-                              src={`http://localhost:8000${url}`}
+                              src={`http://localhost:8000${url}?size=thumb`}
                               alt={`completion-${i + 1}`}
                               className="w-full h-full object-cover group-hover:scale-105 transition-transform"
                             />
@@ -581,7 +581,7 @@ const Assignments = () => {
               </button>
             </div>
             <img
-              src={`http://localhost:8000${photoViewer.photos[photoViewer.index]}`}
+              src={`http://localhost:8000${photoViewer.photos[photoViewer.index]}?size=medium`}
               alt="Completion photo"
               className="w-full rounded-2xl border border-slate-700/60 shadow-2xl"
             />
@@ -593,7 +593,7 @@ const Assignments = () => {
                     onClick={() => setPhotoViewer(prev => ({ ...prev, index: i }))}
                     className={`w-14 h-14 rounded-lg overflow-hidden border-2 ${i === photoViewer.index ? 'border-cyan-500' : 'border-slate-700/50'}`}
                   >
-                    <img src={`http://localhost:8000${url}`} alt="" className="w-full h-full object-cover" />
+                    <img src={`http://localhost:8000${url}?size=thumb`} alt="" className="w-full h-full object-cover" />
                   </button>
                 ))}
               </div>
@@ -3,6 +3,7 @@ import { useState, useEffect } from 'react';
 import { FiCheckCircle, FiClock, FiMapPin, FiLoader, FiImage, FiUser, FiX, FiThumbsUp } from 'react-icons/fi';
 import StatusBadge from '../components/StatusBadge';
 import api from '../api';
+import { useLiveEvents } from '../live';
 
 const ComplaintStatus = () => {
   const [complaints, setComplaints] = useState([]);
@@ -11,10 +12,16 @@ const ComplaintStatus = () => {
 
   useEffect(() => {
     fetchComplaints();
-    const interval = setInterval(fetchComplaints, 10000); // refresh every 10s
-    return () => clearInterval(interval);
   }, []);
 
+  // Apply pushed complaint deltas instead of polling
+  useLiveEvents({
+    'complaint.created': (c) => setComplaints(prev => [{ ...c, linkedTask: null }, ...prev]),
+    'complaint.updated': (c) => setComplaints(prev => prev.map(p => (p.id === c.id ? { ...p, ...c } : p))),
+    'complaint.task': (c) => setComplaints(prev => prev.map(p => (p.id === c.id ? { ...p, linkedTask: c.linkedTask } : p))),
+    resync: fetchComplaints,
+  });
+
   const fetchComplaints = async () => {
     try {
       const res = await api.get('/api/complaints');
@@ -156,7 +163,7 @@ const ComplaintStatus = () => {
                       className="w-20 h-20 rounded-xl overflow-hidden border-2 border-emerald-500/20 hover:border-emerald-500/50 transition-colors bg-slate-800/60 group"
                     >
                       <img
-                        src={`http://localhost:8000${url}`}
+                        src={`http://localhost:8000${url}?size=thumb`}
                         alt={`work-${i + 1}`}
                         className="w-full h-full object-cover group-hover:scale-105 transition-transform"
                       />
@@ -201,7 +208,7 @@ const ComplaintStatus = () => {
               </button>
             </div>
             <img
-              src={`http://localhost:8000${photoViewer.photos[photoViewer.index]}`}
+              src={`http://localhost:8000${photoViewer.photos[photoViewer.index]}?size=medium`}
               alt="Work completion photo"
               className="w-full rounded-2xl border border-slate-700/60 shadow-2xl"
             />
@@ -213,7 +220,7 @@ const ComplaintStatus = () => {
                     onClick={() => setPhotoViewer(prev => ({ ...prev, index: i }))}
                     className={`w-14 h-14 rounded-lg overflow-hidden border-2 ${i === photoViewer.index ? 'border-emerald-500' : 'border-slate-700/50'}`}
                   >
-                    <img src={`http://localhost:8000${url}`} alt="" className="w-full h-full object-cover" />
+                    <img src={`http://localhost:8000${url}?size=thumb`} alt="" className="w-full h-full object-cover" />
                   </button>
                 ))}
               </div>
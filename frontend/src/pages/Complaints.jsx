@@ -362,7 +362,7 @@ const Complaints = () => {
                       {url.match(/\.(mp4|webm|mov)$/i) ? (
                         <FiVideo size={16} className="text-slate-400" />
                       ) : (
-                        <img src={`http://localhost:8000${url}`} alt="evidence" className="w-full h-full object-cover" />
+                        <img src={`http://localhost:8000${url}?size=thumb`} alt="evidence" className="w-full h-full object-cover" />
                       )}
                     </a>
                   ))}
@@ -1,30 +1,53 @@
 // Dashboard — interactive admin command center with live API data
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { FiAlertTriangle, FiMessageSquare, FiUsers, FiActivity, FiTrendingUp, FiMapPin, FiClock, FiCheckCircle, FiChevronRight, FiNavigation, FiImage, FiZap, FiClipboard } from 'react-icons/fi';
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer, PieChart, Pie, Cell } from 'recharts';
 import StatusBadge from '../components/StatusBadge';
 import api from '../api';
+import { useLiveEvents } from '../live';
 
 const Dashboard = () => {
   const [stats, setStats] = useState(null);
   const [loading, setLoading] = useState(true);
 
+  const refreshTimer = useRef(null);
+
+  const fetchStats = async () => {
+    try {
+      const res = await api.get('/api/stats');
+      setStats(res.data);
+    } catch (err) {
+      console.error('Failed to fetch stats', err);
+    } finally {
+      setLoading(false);
+    }
+  };
+
   useEffect(() => {
-    const fetchStats = async () => {
-      try {
-        const res = await api.get('/api/stats');
-        setStats(res.data);
-      } catch (err) {
-        console.error('Failed to fetch stats', err);
-      } finally {
-        setLoading(false);
-      }
-    };
     fetchStats();
-    const interval = setInterval(fetchStats, 10000);
-    return () => clearInterval(interval);
+    return () => clearTimeout(refreshTimer.current);
   }, []);
 
+  // Aggregates change with every pushed delta — refetch at most every 2s
+  const scheduleRefresh = () => {
+    if (refreshTimer.current) return;
+    refreshTimer.current = setTimeout(() => {
+      refreshTimer.current = null;
+      fetchStats();
+    }, 2000);
+  };
+
+  useLiveEvents({
+    'bins.fill': scheduleRefresh,
+    'alert.created': scheduleRefresh,
+    'alert.resolved': scheduleRefresh,
+    'complaint.created': scheduleRefresh,
+    'complaint.updated': scheduleRefresh,
+    'task.created': scheduleRefresh,
+    'task.updated': scheduleRefresh,
+    resync: scheduleRefresh,
+  });
+
   if (loading || !stats) {
     return (
       <div className="flex items-center justify-center h-64">
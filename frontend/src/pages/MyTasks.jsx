@@ -277,7 +277,7 @@ const MyTasks = () => {
                               className="w-20 h-20 rounded-xl overflow-hidden border-2 border-slate-700/50 hover:border-emerald-500/50 transition-colors bg-slate-800/60 group"
                             >
                               <img
-                                src={`http://localhost:8000${url}`}
+                                src={`http://localhost:8000${url}?size=thumb`}
                                 alt={`work-${i + 1}`}
                                 className="w-full h-full object-cover group-hover:scale-105 transition-transform"
                               />
@@ -359,7 +359,7 @@ const MyTasks = () => {
               </button>
             </div>
             <img
-              src={`http://localhost:8000${photoViewer.photos[photoViewer.index]}`}
+              src={`http://localhost:8000${photoViewer.photos[photoViewer.index]}?size=medium`}
               alt="Work photo"
               className="w-full rounded-2xl border border-slate-700/60 shadow-2xl"
             />
@@ -371,7 +371,7 @@ const MyTasks = () => {
                     onClick={() => setPhotoViewer(prev => ({ ...prev, index: i }))}
                     className={`w-14 h-14 rounded-lg overflow-hidden border-2 ${i === photoViewer.index ? 'border-emerald-500' : 'border-slate-700/50'}`}
                   >
-                    <img src={`http://localhost:8000${url}`} alt="" className="w-full h-full object-cover" />
+                    <img src={`http://localhost:8000${url}?size=thumb`} alt="" className="w-full h-full object-cover" />
                   </button>
                 ))}
               </div>
@@ -3,16 +3,26 @@ import { useState, useEffect } from 'react';
 import { FiInbox, FiClock, FiMapPin, FiCornerDownRight } from 'react-icons/fi';
 import StatusBadge from '../components/StatusBadge';
 import api from '../api';
+import { useLiveEvents } from '../live';
 
 const Responses = () => {
   const [complaints, setComplaints] = useState([]);
 
   useEffect(() => {
     fetchResponses();
-    const interval = setInterval(fetchResponses, 10000);
-    return () => clearInterval(interval);
   }, []);
 
+  // A complaint shows up here once the admin has responded to it
+  useLiveEvents({
+    'complaint.updated': (c) => {
+      if (!c.response) return;
+      setComplaints(prev => (prev.some(p => p.id === c.id)
+        ? prev.map(p => (p.id === c.id ? { ...p, ...c } : p))
+        : [c, ...prev]));
+    },
+    resync: fetchResponses,
+  });
+
   const fetchResponses = async () => {
     try {
       const res = await api.get('/api/complaints');
@@ -2,6 +2,7 @@
 import { useState, useEffect } from 'react';
 import { FiAward, FiStar, FiTrendingUp, FiGift, FiZap } from 'react-icons/fi';
 import api from '../api';
+import { useLiveEvents } from '../live';
 
 const levelColors = {
   Bronze: { bg: 'from-amber-900/40 to-amber-800/20', border: 'border-amber-600/30', text: 'text-amber-400', bar: 'bg-amber-500' },
@@ -21,22 +22,31 @@ const Rewards = () => {
   const [rewards, setRewards] = useState(null);
   const [loading, setLoading] = useState(true);
 
+  const fetchRewards = async () => {
+    try {
+      const res = await api.get('/api/complaints/rewards');
+      setRewards(res.data);
+    } catch {
+      setRewards({ points: 0, level: 'Bronze', history: [] });
+    } finally {
+      setLoading(false);
+    }
+  };
+
   useEffect(() => {
-    const fetchRewards = async () => {
-      try {
-        const res = await api.get('/api/complaints/rewards');
-        setRewards(res.data);
-      } catch {
-        setRewards({ points: 0, level: 'Bronze', history: [] });
-      } finally {
-        setLoading(false);
-      }
-    };
     fetchRewards();
-    const interval = setInterval(fetchRewards, 15000);
-    return () => clearInterval(interval);
   }, []);
 
+  useLiveEvents({
+    'reward.updated': ({ points, level, entry }) => setRewards(prev => ({
+      ...prev,
+      points,
+      level,
+      history: [entry, ...(prev?.history || [])],
+    })),
+    resync: fetchRewards,
+  });
+
   if (loading) {
     return (
       <div className="flex items-center justify-center h-64">